@@ -0,0 +1,204 @@
+import datetime
+import threading
+from collections import deque
+from typing import Callable, NamedTuple
+from config import (
+    CPU_THRESHOLD, RAM_THRESHOLD, GPU_THRESHOLD, DISK_SPACE_THRESHOLD, NET_TRAFFIC_THRESHOLD, UPTIME_THRESHOLD,
+    ALERT_HYSTERESIS, ALERT_MIN_DURATION, ALERT_COOLDOWN, ALERT_LOG_SIZE
+)
+from utilities import setup_logging
+
+# Рушій сповіщень
+class Alert(NamedTuple):
+    time: datetime.datetime
+    rule: str
+    subject: str
+    value: float
+    state: str
+    message: str
+    recommendation: str
+
+
+class AlertRule:
+    """A threshold on one or more values extracted from a snapshot.
+
+    ``value`` maps a snapshot to ``{subject: value}`` (e.g. one entry per GPU).
+    A subject enters the alert state after breaching ``enter`` for
+    ``min_duration`` seconds and leaves it only once it is back past ``exit``;
+    a new notification is sent at most once per ``cooldown`` seconds. An
+    incident that starts inside the cooldown is shown as active at once and
+    notified as soon as the cooldown has passed, if it is still going on.
+    """
+
+    def __init__(self, name: str, value: Callable, enter: float, exit: float = None, above: bool = True,
+                 message: str = "{subject}{value:.1f}", recommendation: str = "",
+                 min_duration: float = ALERT_MIN_DURATION, cooldown: float = ALERT_COOLDOWN):
+        self.name = name
+        self.value = value
+        self.enter = enter
+        margin = abs(enter) * ALERT_HYSTERESIS
+        self.exit = exit if exit is not None else (enter - margin if above else enter + margin)
+        self.above = above
+        self.message = message
+        self.recommendation = recommendation
+        self.min_duration = min_duration
+        self.cooldown = cooldown
+
+    def breached(self, value):
+        return value > self.enter if self.above else value < self.enter
+
+    def recovered(self, value):
+        return value <= self.exit if self.above else value >= self.exit
+
+
+class _RuleState:
+    __slots__ = ('active', 'notified', 'pending_since', 'last_notified')
+
+    def __init__(self):
+        self.active = False
+        self.notified = False
+        self.pending_since = None
+        self.last_notified = None
+
+
+class AlertEngine:
+    """Evaluates alert rules against monitor snapshots, outside the UI thread.
+
+    Register ``evaluate`` as a ``ResourceMonitor`` callback. Notifications go
+    to a bounded log and to listeners (called on the monitor thread); the GUI
+    polls ``state()`` instead of being interrupted.
+    """
+
+    def __init__(self, rules, log_size: int = ALERT_LOG_SIZE):
+        self.rules = list(rules)
+        self.log = deque(maxlen=log_size)
+        self.listeners: list[Callable[[Alert], None]] = []
+        self.version = 0
+        self._states = {}
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[Alert], None]):
+        self.listeners.append(listener)
+
+    def evaluate(self, snapshot: dict):
+        now = snapshot['monotonic']
+        alerts = []
+        for rule in self.rules:
+            try:
+                values = rule.value(snapshot)
+            except Exception as e:
+                setup_logging().error(f"Error in alert rule '{rule.name}': {e}")
+                continue
+            for subject, value in values.items():
+                if value is None or value != value:
+                    continue
+                alert = self._check(rule, subject, value, now)
+                if alert is not None:
+                    alerts.append(alert)
+        if not alerts:
+            return
+        with self._lock:
+            for alert in alerts:
+                # 'suppressed' і 'cleared' — тривоги під час cooldown: лише панель активних, без журналу
+                if alert.state in ('firing', 'resolved'):
+                    self.log.append(alert)
+                if alert.state in ('firing', 'suppressed'):
+                    self._active[(alert.rule, alert.subject)] = alert
+                else:
+                    self._active.pop((alert.rule, alert.subject), None)
+            self.version += 1
+        for alert in alerts:
+            if alert.state not in ('firing', 'resolved'):
+                continue
+            for listener in list(self.listeners):
+                try:
+                    listener(alert)
+                except Exception as e:
+                    setup_logging().error(f"Error in alert listener {listener!r}: {e}")
+
+    def _check(self, rule, subject, value, now):
+        state = self._states.get((rule.name, subject))
+        if state is None:
+            state = self._states[(rule.name, subject)] = _RuleState()
+        if state.active:
+            if rule.recovered(value):
+                state.active = False
+                state.pending_since = None
+                # Про відновлення повідомляємо лише якщо про тривогу було повідомлено (не під час cooldown)
+                if not state.notified:
+                    return self._alert(rule, subject, value, 'cleared')
+                state.notified = False
+                return self._alert(rule, subject, value, 'resolved')
+            # Тривога, що почалася під час cooldown, повідомляється, щойно він мине
+            if not state.notified and now - state.last_notified >= rule.cooldown:
+                return self._notify(state, rule, subject, value, now)
+            return None
+        if not rule.breached(value):
+            state.pending_since = None
+            return None
+        if state.pending_since is None:
+            state.pending_since = now
+        if now - state.pending_since < rule.min_duration:
+            return None
+        state.active = True
+        if state.last_notified is not None and now - state.last_notified < rule.cooldown:
+            return self._alert(rule, subject, value, 'suppressed')
+        return self._notify(state, rule, subject, value, now)
+
+    def _notify(self, state, rule, subject, value, now):
+        state.last_notified = now
+        state.notified = True
+        return self._alert(rule, subject, value, 'firing')
+
+    @staticmethod
+    def _alert(rule, subject, value, state):
+        message = rule.message.format(subject=f"{subject}: " if subject else "", value=value)
+        if state in ('resolved', 'cleared'):
+            message = f"Resolved: {message}"
+        return Alert(datetime.datetime.now(), rule.name, subject, value, state, message, rule.recommendation)
+
+    def state(self):
+        # Узгоджена копія для GUI: (версія, активні сповіщення, журнал)
+        with self._lock:
+            return self.version, tuple(self._active.values()), tuple(self.log)
+
+
+def _scalar(value):
+    return {'': value}
+
+
+def default_rules():
+    return [
+        AlertRule(
+            'cpu', lambda s: _scalar(s['cpu'][0]), CPU_THRESHOLD,
+            message=f"{{subject}}CPU usage exceeded {CPU_THRESHOLD}%: {{value:.1f}}%",
+            recommendation="Recommendation: Close high-CPU processes."
+        ),
+        AlertRule(
+            'ram', lambda s: _scalar(s['ram'].percent), RAM_THRESHOLD,
+            message=f"{{subject}}RAM usage exceeded {RAM_THRESHOLD}%: {{value:.1f}}%",
+            recommendation="Recommendation: Close high-memory processes."
+        ),
+        AlertRule(
+            'gpu_temp', lambda s: {f"GPU {gpu.index}": gpu.temperature for gpu in s['gpu'] or ()}, GPU_THRESHOLD,
+            message=f"{{subject}}GPU temperature exceeded {GPU_THRESHOLD}°C: {{value:.1f}}°C",
+            recommendation="Recommendation: Reduce GPU-intensive tasks."
+        ),
+        AlertRule(
+            'disk_space', lambda s: {fs.mountpoint: 100 - fs.percent for fs in s['filesystems']}, DISK_SPACE_THRESHOLD,
+            above=False, min_duration=0,
+            message=f"{{subject}}Free disk space is below {DISK_SPACE_THRESHOLD}%: {{value:.1f}}%",
+            recommendation="Recommendation: Free up disk space."
+        ),
+        AlertRule(
+            'network', lambda s: _scalar(max(s['network'])), NET_TRAFFIC_THRESHOLD,
+            message="{subject}Unusual network activity: {value:.1f} Mbps",
+            recommendation="Recommendation: Check network-intensive processes."
+        ),
+        AlertRule(
+            'uptime', lambda s: _scalar(s['uptime'][0] / 86400), UPTIME_THRESHOLD / 86400, min_duration=0,
+            message=f"{{subject}}System running for over {UPTIME_THRESHOLD // 86400} days: {{value:.1f}} days",
+            recommendation="Recommendation: Consider rebooting the system."
+        )
+    ]
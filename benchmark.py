@@ -0,0 +1,474 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+import numpy as np
+import psutil
+
+# Набір бенчмарків: працює без дисплея та реального обладнання, з фіксованим seed
+SEED = 1234
+PROCESS_TABLE_SIZES = (1000, 5000, 20000, 50000)
+HISTORY_SIZES = ((60, 8), (3600, 64), (86400, 256))  # (MAX_HISTORY, кількість ядер)
+CHART_LINES = 64  # Кількість ліній на графіку (як у графіку CPU на 64-ядерній машині)
+CHART_CORES = (16, 64, 256)  # Кількість ядер для порівняння ліній і теплової карти
+STARTUP_MODULES = ('monitor', 'gui', 'main')  # Модулі, час імпорту яких вимірюється в новому інтерпретаторі
+SYNTHETIC_USERS = ('root', 'www-data', 'postgres', 'user')  # Власники синтетичних процесів
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+class HeadlessTree:
+    """Stand-in for ``ttk.Treeview`` with the calls the process tables make; counts operations."""
+
+    def __init__(self, height=20):
+        self.height = height
+        self.rows = {}
+        self.order = []
+        self.selected = ()
+        self.operations = 0
+        self._next_id = 0
+
+    def cget(self, option):
+        return self.height
+
+    def bind(self, sequence, func, add=None):
+        pass
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, items):
+        self.selected = tuple(items)
+        self.operations += 1
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def insert(self, parent, index, values=(), tags=()):
+        self._next_id += 1
+        item = f"I{self._next_id}"
+        self.rows[item] = (values, tags)
+        self.order.append(item)
+        self.operations += 1
+        return item
+
+    def item(self, item, values=(), tags=()):
+        self.rows[item] = (values, tags)
+        self.operations += 1
+
+    def delete(self, *items):
+        for item in items:
+            del self.rows[item]
+        self.order = [item for item in self.order if item in self.rows]
+        self.operations += 1
+
+    def set_children(self, parent, *items):
+        self.order = list(items)
+        self.operations += 1
+
+    def get_children(self, item=""):
+        return tuple(self.order)
+
+    def tag_configure(self, tag, **options):
+        pass
+
+
+def measure(func, repeat, warmup):
+    for _ in range(warmup):
+        func()
+    gc.collect()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    # Пам'ять вимірюється окремим запуском: tracemalloc спотворює час
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    times = np.array(times) * 1000
+    return {
+        'p50_ms': float(np.percentile(times, 50)),
+        'p95_ms': float(np.percentile(times, 95)),
+        'p99_ms': float(np.percentile(times, 99)),
+        'max_ms': float(times.max()),
+        'mean_ms': float(times.mean()),
+        'peak_kb': peak / 1024,
+        'runs': repeat
+    }
+
+
+def synthetic_processes(count, rng):
+    from processes import ProcessInfo, NetProcessInfo
+    processes = {}
+    net_processes = {}
+    for pid in range(1, count + 1):
+        name = f"proc-{rng.randrange(count // 4 + 1)}"
+        processes[pid] = ProcessInfo(
+            pid, name, rng.random() * 2048, rng.random() * 10, rng.random() * 100,
+            rng.randrange(pid), rng.choice(SYNTHETIC_USERS), f"/usr/bin/{name}", f"{name} --worker {pid}"
+        )
+        if pid % 4 == 0:
+            net_processes[pid] = NetProcessInfo(pid, name, rng.random() * 1000, rng.random() * 500)
+    return processes, net_processes
+
+
+def churn(processes, rng, fraction=0.1):
+    # Наступний знімок: частина процесів змінюється, частина зникає і з'являється
+    changed = dict(processes)
+    pids = list(processes)
+    for pid in rng.sample(pids, int(len(pids) * fraction)):
+        info = changed[pid]
+        field = 'cpu_percent' if 'cpu_percent' in info._fields else 'upload_kbps'
+        changed[pid] = info._replace(**{field: rng.random() * 100})
+    for pid in rng.sample(pids, int(len(pids) * fraction / 10)):
+        del changed[pid]
+    top = max(pids)
+    for pid in range(top + 1, top + 1 + int(len(pids) * fraction / 10)):
+        changed[pid] = processes[pids[0]]._replace(pid=pid)
+    return changed
+
+
+def synthetic_gpus(count):
+    from gpu import GPUSample
+    return tuple(
+        GPUSample(i, f"GPU {i}", 50.0 + i, 4096.0, 8192.0, 50.0, 60.0 + i, 40.0, 80.0) for i in range(count)
+    )
+
+
+def collect_snapshot(monitor):
+    # Один повний такт: усі збирачі (крім SMART, що залежить від обладнання) і публікація знімка
+    snapshots = []
+    monitor.add_callback(snapshots.append)
+    for collector in monitor._create_collectors():
+        if collector.name != 'smart':
+            monitor._store_result(collector.name, collector.func())
+    monitor._publish_sample()
+    monitor.remove_callback(snapshots.append)
+    return snapshots[-1] if snapshots else None
+
+
+@benchmark('monitor_tick')
+def bench_monitor_tick(args):
+    from monitor import ResourceMonitor
+    monitor = ResourceMonitor()
+    collect_snapshot(monitor)
+    yield 'monitor_tick', lambda: collect_snapshot(monitor)
+    monitor.stop()
+
+
+@benchmark('history_update')
+def bench_history_update(args):
+    from history import RingBuffer
+    from monitor import ResourceMonitor
+    monitor = ResourceMonitor(persist=False)
+    ram = psutil.virtual_memory()
+    for capacity, cores in HISTORY_SIZES:
+        rng = np.random.default_rng(SEED)
+        cpu = rng.random(cores) * 100
+        gpus = synthetic_gpus(8)
+        disks = {f"sd{chr(97 + i)}": (1.0, 2.0) for i in range(16)}
+        nics = {f"eth{i}": (3.0, 4.0) for i in range(8)}
+        monitor.cpu_usage_history = RingBuffer(capacity, cores)
+        monitor.ram_usage_history = RingBuffer(capacity)
+        monitor.gpu_usage_history = RingBuffer(capacity, len(gpus))
+        monitor.gpu_memory_history = RingBuffer(capacity, len(gpus))
+        monitor.gpu_temp_history = RingBuffer(capacity, len(gpus))
+        monitor.disk_io_history = RingBuffer(capacity, 2)
+        monitor.net_history = RingBuffer(capacity, 2)
+        monitor.disk_device_history = {name: RingBuffer(capacity, 2) for name in disks}
+        monitor.nic_history = {name: RingBuffer(capacity, 2) for name in nics}
+
+        def update():
+            monitor._update_cpu_history(cpu)
+            monitor._update_ram_history(ram)
+            monitor._update_gpu_history(gpus)
+            monitor._update_disk_history(1.0, 2.0, disks)
+            monitor._update_network_history(3.0, 4.0, nics)
+            monitor.get_live_history()
+
+        yield f'history_update[{capacity}x{cores}]', update
+
+
+@benchmark('process_list')
+def bench_process_list(args):
+    import utilities
+    from processes import ProcessHistory
+    from tables import VirtualTable
+    for size in PROCESS_TABLE_SIZES:
+        rng = random.Random(SEED)
+        processes, net_processes = synthetic_processes(size, rng)
+        snapshots = [processes, churn(processes, rng)]
+        net_snapshots = [net_processes, churn(net_processes, rng)]
+        table = VirtualTable(HeadlessTree())
+        tick = iter(range(sys.maxsize))
+        # Повне вікно історії: кожен прохід пише стовпець і перераховує тренди всіх процесів
+        history = ProcessHistory()
+        pids = list(processes)
+        memory = np.array([info.memory_mb for info in processes.values()])
+        growth = np.random.default_rng(SEED).random((history.capacity, size))
+        for i in range(history.capacity):
+            history.record(i * 5.0, pids, memory + growth[i], growth[i])
+        yield f'process_history[{size}]', lambda i=tick: history.record(
+            history.capacity * 5.0 + next(i), pids, memory + growth[0], growth[0]
+        )
+        yield f'update_process_list[{size}]', lambda s=snapshots, i=tick: utilities.update_process_list(
+            table, snapshot=s[next(i) % 2], history=history
+        )
+        # Прокручування на довільну позицію (перетягування смуги прокрутки)
+        yield f'process_scroll[{size}]', lambda t=table: t.scroll_to(rng.randrange(len(t.records)))
+        # Зміна фільтра (повна перебудова індексу) і оновлення знімка при групуванні (інкрементне)
+        yield f'filter_process_list[{size}]', lambda i=tick: utilities.filter_process_list(table, f"proc-{next(i) % 10}")
+        utilities.filter_process_list(table, grouping='exe')
+        yield f'group_process_list[{size}]', lambda s=snapshots, i=tick: utilities.update_process_list(table, snapshot=s[next(i) % 2])
+        utilities.filter_process_list(table)
+        net_table = VirtualTable(HeadlessTree())
+        yield f'update_net_process_list[{size}]', lambda t=net_table, s=net_snapshots, i=tick: utilities.update_net_process_list(
+            t, snapshot=s[next(i) % 2]
+        )
+
+
+@benchmark('chart_render')
+def bench_chart_render(args):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from rendering import ChartRenderer
+    from config import MAX_HISTORY
+    rng = np.random.default_rng(SEED)
+
+    def chart(cores, heatmap):
+        figure = Figure(figsize=(8, 3))
+        canvas = FigureCanvasAgg(figure)
+        ax = figure.add_subplot()
+        if heatmap:
+            artists = [ax.imshow(
+                np.zeros((cores, MAX_HISTORY)), aspect='auto', origin='lower', interpolation='nearest',
+                vmin=0, vmax=100, extent=(-0.5, MAX_HISTORY - 0.5, -0.5, cores - 0.5)
+            )]
+        else:
+            ax.set_ylim(0, 100)
+            artists = [ax.plot(np.arange(MAX_HISTORY), np.zeros(MAX_HISTORY))[0] for _ in range(cores)]
+        renderer = ChartRenderer(None, max_fps=0)
+        renderer.add_chart('cpu', canvas, ax, artists, [])
+        canvas.draw()
+
+        def frame():
+            history = rng.random((cores, MAX_HISTORY)) * 100
+            if heatmap:
+                artists[0].set_data(history)
+            else:
+                for line, values in zip(artists, history):
+                    line.set_ydata(values)
+            renderer.invalidate('cpu')
+            renderer.flush()
+
+        def full_redraw():
+            renderer.reset()
+            frame()
+
+        return frame, full_redraw
+
+    frame, full_redraw = chart(CHART_LINES, heatmap=False)
+    yield f'chart_render[blit,{CHART_LINES} lines]', frame
+    yield f'chart_render[full,{CHART_LINES} lines]', full_redraw
+    # Лінії дорожчають з кожним ядром, теплова карта — ні
+    for cores in CHART_CORES:
+        if cores != CHART_LINES:
+            yield f'chart_render[blit,{cores} lines]', chart(cores, heatmap=False)[0]
+        frame, full_redraw = chart(cores, heatmap=True)
+        yield f'chart_render[heatmap,{cores} cores]', frame
+    yield f'chart_render[heatmap full,{CHART_CORES[-1]} cores]', full_redraw
+
+
+@benchmark('startup')
+def bench_startup(args):
+    # Кожен запуск — новий інтерпретатор, тож імпорти не кешуються між вимірюваннями
+    package = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (package, os.environ.get('PYTHONPATH')))))
+    for module in (None,) + STARTUP_MODULES:
+        code = f'import {module}' if module else 'pass'
+        yield (
+            f'startup[import {module}]' if module else 'startup[interpreter]',
+            lambda c=code: subprocess.run([sys.executable, '-c', c], env=env, check=True)
+        )
+    import tkinter as tk
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        print(f"  startup[first frame]: skipped, no display ({e}); run under xvfb-run to include it")
+        return
+    from gui import SystemMonitorGUI
+    from monitor import ResourceMonitor
+    monitor = ResourceMonitor(persist=False)
+    snapshot = collect_snapshot(monitor)
+
+    def first_frame():
+        # Від створення вікна до першого знімка на екрані
+        root = tk.Tk()
+        root.withdraw()
+        app = SystemMonitorGUI(root, monitor)
+        app.update_gui(snapshot)
+        root.update()
+        monitor.remove_callback(app.snapshot_queue.put)
+        monitor.remove_callback(app.alerts.evaluate)
+        app.process_sampler.stop()
+        app.renderer.cancel()
+        sys.stdout = app.original_stdout
+        app.devnull_file.close()
+        root.destroy()
+
+    yield 'startup[first frame]', first_frame
+
+
+@benchmark('update_gui')
+def bench_update_gui(args):
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"  update_gui: skipped, no display ({e}); run under xvfb-run to include it")
+        return
+    root.withdraw()
+    from gui import SystemMonitorGUI
+    from monitor import ResourceMonitor
+    monitor = ResourceMonitor(persist=False)
+    app = SystemMonitorGUI(root, monitor)
+    sys.stdout = app.original_stdout
+    app.renderer.min_interval = 0.0
+    # Вкладки будуються під час першого відкриття; для повного update_gui відкриваємо кожну
+    for tab in app.notebook.tabs():
+        app.notebook.select(tab)
+        app._on_tab_selected()
+    app.notebook.select(app.notebook.tabs()[0])
+    snapshot = collect_snapshot(monitor)
+
+    def update():
+        app.update_gui(snapshot)
+        root.update_idletasks()
+
+    yield 'update_gui', update
+    app.process_sampler.stop()
+    app.renderer.cancel()
+    root.destroy()
+
+
+@benchmark('export')
+def bench_export(args):
+    from alerts import AlertEngine, default_rules
+    from config import HISTORY_ROLLUPS
+    from monitor import ResourceMonitor
+    from storage import MultiResolutionStore
+    import utilities
+    monitor = ResourceMonitor(persist=False)
+    snapshot = collect_snapshot(monitor)
+    rng = np.random.default_rng(SEED)
+    rows = args.export_rows
+    monitor.history_store = MultiResolutionStore(
+        os.path.join('bench_history'), monitor.history_columns, 3600, rows // 3600 + 2, HISTORY_ROLLUPS
+    )
+    start = time.time() - rows
+    values = rng.random((rows, len(monitor.history_columns))) * 100
+    for i in range(rows):
+        monitor.history_store.append(start + i, values[i])
+    processes, net_processes = synthetic_processes(1000, random.Random(SEED))
+    gui = SimpleNamespace(
+        monitor=monitor, latest_snapshot=snapshot, reboot_history=[],
+        process_sampler=SimpleNamespace(snapshot=lambda: processes, net_snapshot=lambda: net_processes),
+        alerts=AlertEngine(default_rules())
+    )
+    minutes = rows // 60
+
+    def export(fmt):
+        for filename in utilities.export_data(gui, minutes, fmt).result():
+            os.remove(filename)
+
+    for fmt in ('csv', 'jsonl', 'npz'):
+        yield f'export[{fmt},{rows} rows]', lambda f=fmt: export(f)
+    monitor.history_store.close()
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            stats['vs_baseline'] = None
+            continue
+        ratio = stats['p50_ms'] / base['p50_ms'] if base['p50_ms'] else 1.0
+        stats['vs_baseline'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results):
+    print(f"{'Benchmark':<42} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'peak KB':>10} {'vs base':>8}")
+    for name, stats in results.items():
+        ratio = stats.get('vs_baseline')
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else "-"
+        print(
+            f"{name:<42} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} "
+            f"{stats['max_ms']:>9.3f} {stats['peak_kb']:>10.1f} {ratio_text:>8}"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="System monitor benchmark suite")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument('--repeat', type=int, default=50, help="timed runs per case (default: 50)")
+    parser.add_argument('--warmup', type=int, default=3, help="untimed runs per case (default: 3)")
+    parser.add_argument('--export-rows', type=int, default=21600, help="rows of synthetic history to export")
+    parser.add_argument('--save', metavar='FILE', help="save results as a baseline")
+    parser.add_argument('--baseline', metavar='FILE', help="compare p50 latency against a saved baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed p50 slowdown vs baseline (default: 0.25)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    save = os.path.abspath(args.save) if args.save else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    results = {}
+    # Сховище, журнал і файли експорту створюються в тимчасовому каталозі
+    with tempfile.TemporaryDirectory(prefix='monitor-bench-') as workdir:
+        os.chdir(workdir)
+        for name in args.only or BENCHMARKS:
+            print(f"Running {name}...")
+            for case, func in BENCHMARKS[name](args):
+                results[case] = measure(func, args.repeat, args.warmup)
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    regressions = compare(results, baseline, args.tolerance) if baseline else []
+    print_results(results)
+    if save:
+        with open(save, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(), 'platform': platform.platform(), 'cpu_count': psutil.cpu_count(),
+                'repeat': args.repeat, 'results': results
+            }, f, indent=2)
+        print(f"Baseline saved to {save}")
+    if regressions:
+        print(f"Regressions (> {args.tolerance:.0%} slower than baseline): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
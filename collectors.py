@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from utilities import setup_logging
+
+# Планувальник збирачів метрик
+def next_deadline(deadline: float, interval: float, now: float):
+    # Абсолютний розклад: наступний такт рахується від попереднього, а не від моменту запуску,
+    # тож тривалість ітерації не накопичується; пропущені такти не наздоганяються
+    missed = max(0.0, (now - deadline) // interval)
+    return deadline + (missed + 1) * interval
+
+
+class Collector:
+    """One metric source with its own interval and deadline.
+
+    ``func`` returns the collector's part of the snapshot. ``deadline`` is
+    how long a run may take before it is reported as overrunning; until it
+    finishes the collector is not started again.
+    """
+
+    def __init__(self, name: str, func: Callable, interval: float, deadline: float = None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.deadline = deadline or interval
+        self.next_run = 0.0
+        self.started = None
+        self.future = None
+        self.overdue = False
+        self.last_duration = None
+        self.runs = 0
+        self.overruns = 0
+        self.errors = 0
+
+
+class CollectorScheduler:
+    """Runs collectors on a thread pool so a slow source cannot stall the others.
+
+    ``dispatch`` is called from the monitor loop: it submits every collector
+    that is due and idle, flags runs past their deadline, and returns the
+    monotonic time of the next due collector. Results are delivered to
+    ``on_result(name, value)`` from the worker thread.
+    """
+
+    def __init__(self, collectors, on_result: Callable):
+        self.collectors = {collector.name: collector for collector in collectors}
+        self.on_result = on_result
+        self._pool = ThreadPoolExecutor(max_workers=len(self.collectors), thread_name_prefix='collector')
+
+    def dispatch(self, now: float):
+        next_due = now + 1.0
+        for collector in self.collectors.values():
+            if collector.future is not None:
+                if not collector.overdue and now - collector.started > collector.deadline:
+                    collector.overdue = True
+                    collector.overruns += 1
+                    setup_logging().warning(f"Collector '{collector.name}' exceeded its {collector.deadline}s deadline")
+                continue
+            if now >= collector.next_run:
+                collector.started = now
+                collector.next_run = next_deadline(collector.next_run, collector.interval, now)
+                collector.future = self._pool.submit(collector.func)
+                collector.future.add_done_callback(lambda future, c=collector: self._finished(c, future))
+            next_due = min(next_due, collector.next_run)
+        return next_due
+
+    def _finished(self, collector, future):
+        collector.last_duration = time.monotonic() - collector.started
+        collector.runs += 1
+        try:
+            self.on_result(collector.name, future.result())
+        except Exception as e:
+            collector.errors += 1
+            setup_logging().error(f"Error in collector '{collector.name}': {e}")
+        collector.overdue = False
+        collector.future = None
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
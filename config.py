@@ -1,5 +1,5 @@
 # Конфігураційні параметри
-UPDATE_INTERVAL = 5  # Інтервал оновлення (секунди)
+UPDATE_INTERVAL = 1  # Інтервал публікації знімків (секунди)
 MAX_HISTORY = 60  # Максимальна кількість точок у графіках
 CPU_THRESHOLD = 90  # Поріг для CPU (%)
 RAM_THRESHOLD = 90  # Поріг для RAM (%)
@@ -7,4 +7,48 @@ GPU_THRESHOLD = 85  # Поріг для GPU (°C)
 DISK_SPACE_THRESHOLD = 10  # Поріг вільного місця на диску (%)
 NET_TRAFFIC_THRESHOLD = 1100  # Поріг мережевого трафіку (Mbps)
 UPTIME_THRESHOLD = 7 * 24 * 3600  # Поріг часу роботи системи (секунди)
-AUTO_EXPORT_INTERVAL = 1000  # Інтервал автоекспорту (секунди)
\ No newline at end of file
+AUTO_EXPORT_INTERVAL = 1000  # Інтервал автоекспорту (секунди)
+AUTO_EXPORT_RANGE = 5  # Проміжок історії для автоекспорту (хвилини)
+EXPORT_FORMAT = 'csv'  # Формат експорту історії за замовчуванням: csv, jsonl або npz
+GUI_POLL_INTERVAL = 100  # Інтервал опитування черги знімків у GUI (мілісекунди)
+SNAPSHOT_QUEUE_SIZE = 4  # Максимальна кількість знімків у черзі до GUI
+MAX_FPS = 10  # Максимальна частота перемальовування графіків (кадрів/с)
+CPU_HEATMAP_THRESHOLD = 16  # Кількість ядер, понад яку графік CPU показується тепловою картою
+CPU_HEATMAP_BUSIEST = 5  # Кількість найзавантаженіших ядер у підписі теплової карти
+HISTORY_DIR = 'history'  # Каталог постійного сховища історії
+HISTORY_SEGMENT_ROWS = 3600  # Кількість записів в одному сегменті сховища
+HISTORY_MAX_SEGMENTS = 168  # Максимальна кількість сегментів (найстаріші видаляються)
+HISTORY_ROLLUPS = ((60, 1440, 90), (3600, 720, 60))  # Рівні агрегації: (інтервал с, записів у сегменті, сегментів)
+ALERT_HYSTERESIS = 0.05  # Частка порогу, на яку значення має повернутися, щоб сповіщення знялося
+ALERT_MIN_DURATION = 5  # Скільки секунд поріг має бути перевищений до сповіщення
+ALERT_COOLDOWN = 300  # Мінімальний інтервал між сповіщеннями одного правила (секунди)
+ALERT_LOG_SIZE = 200  # Максимальна кількість записів у журналі сповіщень
+METRICS_HOST = '127.0.0.1'  # Адреса HTTP-ендпоінта метрик OpenMetrics
+METRICS_PORT = 9110  # Порт HTTP-ендпоінта метрик OpenMetrics
+PROCESS_UPDATE_INTERVAL = 5  # Інтервал опитування таблиці процесів (секунди)
+SYSTEM_INFO_REFRESH_INTERVAL = 300  # Інтервал оновлення списку драйверів на вкладці System Info (секунди)
+VIRTUAL_TABLE_OVERSCAN = 5  # Рядки таблиці процесів, що створюються понад видимі
+PROCESS_FILTER_DELAY = 200  # Затримка застосування фільтра процесів після введення (мс)
+PROCESS_HISTORY_SIZE = 120  # Кількість зразків історії кожного процесу (10 хв при інтервалі 5 с)
+PROCESS_LEAK_SLOPE = 1.0  # Мінімальний стабільний приріст RSS для підозри на витік (МБ/хв)
+PROCESS_LEAK_CORRELATION = 0.9  # Мінімальна кореляція RSS з часом (ріст без спадів)
+PROCESS_LEAK_MIN_SAMPLES = 24  # Мінімум зразків історії перед оцінкою витоку
+PROCESS_SPARKLINE_WIDTH = 16  # Ширина міні-графіка RSS у таблиці процесів (символів)
+NVIDIA_SMI_PATH = None  # Шлях до nvidia-smi (None — пошук у PATH)
+COLLECTOR_INTERVALS = {  # Інтервали окремих збирачів метрик (секунди)
+    'cpu': 1,
+    'ram': 1,
+    'gpu': 2,
+    'disk': 1,
+    'filesystems': 10,
+    'smart': 600,
+    'network': 1,
+    'uptime': 1
+}
+COLLECTOR_DEADLINES = {  # Дедлайни збирачів (секунди); за замовчуванням — їхній інтервал
+    'smart': 30
+}
+SMART_DISCOVERY_INTERVAL = 3600  # Інтервал повторного пошуку накопичувачів для SMART (секунди)
+SMART_MAX_WORKERS = 4  # Кількість паралельних запитів smartctl
+DIAGNOSTICS_WINDOW = 120  # Кількість останніх вимірювань кожного етапу для самодіагностики
+PROFILE_TOP = 25  # Кількість функцій у текстовому звіті профілювання
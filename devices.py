@@ -0,0 +1,112 @@
+import os
+import platform
+from typing import NamedTuple
+import numpy as np
+import psutil
+
+# Лічильники та використання окремих дисків і мережевих інтерфейсів
+# Віртуальні пристрої, які не зберігаються в постійній історії
+VIRTUAL_DISKS = ('loop', 'ram', 'zram')
+VIRTUAL_NICS = ('lo',)
+
+
+# Переносимі замінники svmem і sdiskusage psutil (поля яких залежать від ОС) для файлів запису
+class MemoryUsage(NamedTuple):
+    total: int
+    available: int
+    percent: float
+    used: int
+    free: int
+
+
+class DiskUsage(NamedTuple):
+    total: int
+    used: int
+    free: int
+    percent: float
+
+
+class FilesystemUsage(NamedTuple):
+    mountpoint: str
+    device: str
+    fstype: str
+    total: int
+    used: int
+    free: int
+    percent: float
+
+
+class CounterRates:
+    """Per-second rates of per-device cumulative counters, computed for every device at once.
+
+    ``update`` takes psutil's ``{device: namedtuple}`` mapping with the
+    ``time.monotonic()`` at which it was read, and returns the device names
+    with an ``(n, len(fields))`` array of increments per second since the
+    previous call. psutil (``nowrap=True``) already compensates real counter
+    wraps, so a counter that went backwards was reset (interface re-plugged,
+    driver reloaded) and reports zero for that interval. Devices seen for
+    the first time, and the very first call, report zero.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.names = ()
+        self._last = np.empty((0, len(self.fields)), dtype=np.int64)
+        self._last_time = None
+
+    def update(self, counters, timestamp: float):
+        names = tuple(counters)
+        current = np.array(
+            [[getattr(counter, field) for field in self.fields] for counter in counters.values()], dtype=np.int64
+        ).reshape(len(names), len(self.fields))
+        previous = self._last if names == self.names else self._align(names, current)
+        # Скинутий лічильник не дає сплеску: приріст за інтервал невідомий
+        delta = np.maximum(current - previous, 0)
+        elapsed = timestamp - self._last_time if self._last_time is not None else 0.0
+        self.names = names
+        self._last = current
+        self._last_time = timestamp
+        if elapsed <= 0:
+            return names, np.zeros(delta.shape)
+        return names, delta / elapsed
+
+    def _align(self, names, current):
+        # Набір пристроїв змінився: нові пристрої починають з нуля
+        index = {name: i for i, name in enumerate(self.names)}
+        previous = current.copy()
+        for i, name in enumerate(names):
+            if name in index:
+                previous[i] = self._last[index[name]]
+        return previous
+
+
+def whole_disks(names):
+    """Mask of entries that are whole devices; on Linux psutil also lists every partition."""
+    if platform.system() != "Linux":
+        return np.ones(len(names), dtype=bool)
+    return np.array([os.path.exists(f"/sys/block/{name}") for name in names], dtype=bool)
+
+
+def physical_disks():
+    counters = psutil.disk_io_counters(perdisk=True) or {}
+    names = list(counters)
+    mask = whole_disks(names)
+    return [name for name, whole in zip(names, mask) if whole and not name.startswith(VIRTUAL_DISKS)]
+
+
+def physical_nics():
+    return [name for name in psutil.net_io_counters(pernic=True) if name not in VIRTUAL_NICS]
+
+
+def filesystem_usage():
+    filesystems = []
+    for partition in psutil.disk_partitions(all=False):
+        try:
+            usage = psutil.disk_usage(partition.mountpoint)
+        except OSError:
+            # Порожні приводи, недоступні або відмонтовані точки монтування
+            continue
+        filesystems.append(FilesystemUsage(
+            partition.mountpoint, partition.device, partition.fstype, usage.total, usage.used, usage.free, usage.percent
+        ))
+    return tuple(filesystems)
@@ -0,0 +1,171 @@
+import cProfile
+import io
+import math
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import psutil
+from config import DIAGNOSTICS_WINDOW, PROFILE_TOP
+
+# З Python 3.12 cProfile працює через sys.monitoring: один профайлер на інтерпретатор, що охоплює всі потоки
+PROCESS_WIDE_PROFILER = sys.version_info >= (3, 12)
+
+# Самоспостереження монітора: тривалість етапів, власні CPU та пам'ять, профілювання
+class Diagnostics:
+    """Timings of the monitor's own stages plus its CPU time and RSS.
+
+    Stages are recorded from any thread (collector workers, the monitor
+    loop, the Tk thread) under ``measure(stage)``; the last ``window``
+    durations of each stage are kept. While a profile capture is running,
+    every measured stage also runs under a per-thread ``cProfile.Profile``,
+    so the capture covers exactly the code the timings describe. Each thread
+    disables its own profile when its outermost stage ends and hands it to
+    the capture; stages still running when the capture stops are left out.
+    On Python 3.12+ only one profiler may be active per interpreter, so the
+    capture is a single process-wide profile instead.
+    """
+
+    def __init__(self, window: int = DIAGNOSTICS_WINDOW):
+        self.window = window
+        self._durations = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._process = psutil.Process(os.getpid())
+        self._process.cpu_percent()
+        self._local = threading.local()
+        self._profiles = None
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            durations = self._durations.get(stage)
+            if durations is None:
+                durations = self._durations[stage] = deque(maxlen=self.window)
+                self._counts[stage] = 0
+            durations.append(seconds)
+            self._counts[stage] += 1
+
+    @contextmanager
+    def measure(self, stage: str):
+        profile = self._enter_profile()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+            if profile is not None:
+                self._exit_profile(profile)
+
+    def timed(self, stage: str, func):
+        def wrapper(*args, **kwargs):
+            with self.measure(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def stages(self):
+        # {етап: (останнє, середнє, p95, максимум) у секундах і кількість вимірювань}
+        with self._lock:
+            durations = {stage: list(values) for stage, values in self._durations.items()}
+            counts = dict(self._counts)
+        stages = {}
+        for stage, values in sorted(durations.items()):
+            # Вікно коротке, тож сортування дешевше за np.percentile; p95 — за найближчим рангом
+            ordered = sorted(values)
+            stages[stage] = {
+                'last': values[-1],
+                'mean': sum(values) / len(values),
+                'p95': ordered[math.ceil(0.95 * len(ordered)) - 1],
+                'max': ordered[-1],
+                'count': counts[stage]
+            }
+        return stages
+
+    def overhead(self):
+        with self._process.oneshot():
+            cpu_times = self._process.cpu_times()
+            return {
+                'cpu_time': cpu_times.user + cpu_times.system,
+                'cpu_percent': self._process.cpu_percent(),
+                'rss': self._process.memory_info().rss,
+                'threads': self._process.num_threads()
+            }
+
+    def summary(self):
+        return {'stages': self.stages(), **self.overhead()}
+
+    # Профілювання на вимогу
+    @property
+    def profiling(self):
+        return self._profiles is not None
+
+    def start_profile(self):
+        """Begin a capture; returns False if another profiler (debugger, coverage) already holds the interpreter."""
+        with self._lock:
+            if self._profiles is not None:
+                return True
+            if not PROCESS_WIDE_PROFILER:
+                self._profiles = []
+                return True
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                return False
+            self._profiles = [profile]
+            return True
+
+    def stop_profile(self, path: str = None, top: int = PROFILE_TOP):
+        """End the capture; dump it to ``path`` (``.prof``, for snakeviz/pstats) and return the top entries as text."""
+        with self._lock:
+            profiles, self._profiles = self._profiles, None
+        if PROCESS_WIDE_PROFILER and profiles:
+            profiles[0].disable()
+        # Списки потоків містять лише вимкнені профілі; pstats.Stats не приймає порожній профіль
+        for profile in profiles or ():
+            profile.create_stats()
+        profiles = [profile for profile in profiles or () if profile.stats]
+        if not profiles:
+            return "No measured stages ran during the capture"
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        if path:
+            stats.dump_stats(path)
+        text = io.StringIO()
+        stats.stream = text
+        stats.sort_stats('cumulative').print_stats(top)
+        return text.getvalue()
+
+    def _enter_profile(self):
+        capture = self._profiles
+        if capture is None or PROCESS_WIDE_PROFILER:
+            return None
+        local = self._local
+        # Вкладені етапи (update_gui і його частини) використовують один профайлер потоку
+        if getattr(local, 'depth', 0):
+            local.depth += 1
+            return local.profile
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Профайлер уже зайнятий іншим інструментом: етап виконується без профілювання
+            return None
+        local.profile = profile
+        local.capture = capture
+        local.depth = 1
+        return profile
+
+    def _exit_profile(self, profile):
+        local = self._local
+        local.depth -= 1
+        if not local.depth:
+            profile.disable()
+            # Профіль передається лише тому захопленню, під час якого його створено, і лише якщо воно ще триває
+            with self._lock:
+                if self._profiles is local.capture:
+                    self._profiles.append(profile)
+            local.profile = local.capture = None
@@ -0,0 +1,150 @@
+import csv
+import datetime
+import json
+import math
+import platform
+import zipfile
+import numpy as np
+import psutil
+
+# Експорт звітів та історії з моделі даних монітора (без звертання до віджетів)
+EXPORT_FORMATS = ('csv', 'jsonl', 'npz')
+
+
+def _json_value(value):
+    # Значення зберігаються як float32: 7 значущих цифр без шуму подвійної точності
+    return 'null' if math.isnan(value) else f"{value:.7g}"
+
+
+def write_history(path: str, fmt: str, monitor, start: float, end: float, columns=None):
+    """Stream raw history rows in ``[start, end]`` to ``path`` segment by segment; returns the row count.
+
+    ``npz`` holds one float64 array per column plus ``t`` and is written
+    column by column straight into the archive, so memory stays bounded by
+    one segment whatever the range.
+    """
+    columns = list(columns or monitor.history_columns)
+    rows = 0
+    if fmt == 'csv':
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(['timestamp'] + columns)
+            row_format = ['%.3f'] + ['%.7g'] * len(columns)
+            for times, values in monitor.iter_history(start, end, columns):
+                np.savetxt(f, np.column_stack((times, values)), fmt=row_format, delimiter=',')
+                rows += len(times)
+    elif fmt == 'jsonl':
+        with open(path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            keys = [json.dumps(name) for name in columns]
+            for times, values in monitor.iter_history(start, end, columns):
+                for t, row in zip(times.tolist(), values.tolist()):
+                    fields = ','.join(f"{key}:{_json_value(value)}" for key, value in zip(keys, row))
+                    f.write(f'{{"timestamp":{t:.3f},{fields}}}\n')
+                rows += len(times)
+    elif fmt == 'npz':
+        rows = sum(len(times) for times, _ in monitor.iter_history(start, end, columns[:1]))
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for name in ['t'] + columns:
+                with archive.open(f"{name}.npy", 'w', force_zip64=True) as member:
+                    np.lib.format.write_array_header_1_0(
+                        member, {'descr': '<f8', 'fortran_order': False, 'shape': (rows,)}
+                    )
+                    for times, values in monitor.iter_history(start, end, None if name == 't' else [name]):
+                        column = times if name == 't' else values[:, 0]
+                        member.write(column.astype('<f8').tobytes())
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return rows
+
+
+def write_report(path: str, monitor, snapshot, processes, net_processes, alerts, reboot_history, time_range_minutes=None):
+    now = datetime.datetime.now()
+    averages = {}
+    if time_range_minutes:
+        end = now.timestamp()
+        averages = dict(zip(monitor.history_columns, monitor.average_history(end - time_range_minutes * 60, end)))
+
+    def average(column, unit, digits=1):
+        value = averages.get(column)
+        return f"{value:.{digits}f}{unit}" if value is not None and not math.isnan(value) else "N/A"
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("System Monitoring Report\n")
+        f.write(f"Date: {now.strftime('%Y-%m-%d_%H-%M-%S')}\n")
+        if time_range_minutes:
+            f.write(f"Time Range: Last {time_range_minutes} minutes\n")
+        f.write("\n")
+
+        # Системна інформація
+        gpus = ", ".join(f"{gpu.name} ({gpu.memory_total:.1f} MB)" for gpu in monitor.gpu.gpus) or "N/A"
+        f.write(f"CPU: {platform.processor() or 'N/A'}\n")
+        f.write(f"RAM: {psutil.virtual_memory().total / (1024**3):.2f} GB\n")
+        f.write(f"GPU: {gpus}\n")
+        f.write(f"OS: {platform.system()} {platform.release()} ({platform.architecture()[0]})\n")
+        f.write(f"Last Boot: {datetime.datetime.fromtimestamp(psutil.boot_time()).strftime('%Y-%m-%d %H:%M:%S')}\n")
+        if snapshot is None:
+            f.write("\nNo samples collected yet\n")
+        else:
+            _, days, hours, minutes = snapshot['uptime']
+            f.write(f"Uptime: {days}d {hours}h {minutes}m\n")
+            sampled = datetime.datetime.fromtimestamp(snapshot['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+            f.write(f"Sample Time: {sampled}\n")
+
+            total_cpu, _ = snapshot['cpu']
+            f.write(f"\nCPU Usage: {total_cpu:.1f}%\n")
+            if time_range_minutes:
+                f.write(f"Average CPU Usage (last {time_range_minutes} min): {average('cpu_total', '%')}\n")
+
+            ram = snapshot['ram']
+            f.write(f"RAM Usage: {ram.percent}% ({ram.used/(1024**3):.2f}/{ram.total/(1024**3):.2f} GB, Free: {ram.free/(1024**3):.2f} GB)\n")
+            if time_range_minutes:
+                f.write(f"Average RAM Usage (last {time_range_minutes} min): {average('ram', '%')}\n")
+
+            _, read_speed, write_speed, disk_temp, disk_health = snapshot['disk']
+            for fs in snapshot.get('filesystems', ()):
+                f.write(f"Disk Usage {fs.mountpoint}: {fs.percent:.1f}% ({fs.used/(1024**3):.2f}/{fs.total/(1024**3):.2f} GB, Free: {fs.free/(1024**3):.2f} GB)\n")
+            f.write(f"Disk I/O: Read {read_speed:.2f} MB/s | Write {write_speed:.2f} MB/s\n")
+            f.write(f"Disk Health: Temperature: {disk_temp} | Health: {disk_health}\n")
+            if time_range_minutes:
+                f.write(f"Average Disk Read (last {time_range_minutes} min): {average('disk_read', ' MB/s', 2)}\n")
+                f.write(f"Average Disk Write (last {time_range_minutes} min): {average('disk_write', ' MB/s', 2)}\n")
+
+            for gpu in snapshot['gpu'] or ():
+                f.write(
+                    f"GPU {gpu.index}: Usage {gpu.usage:.1f}% | Memory {gpu.memory_used:.0f}/{gpu.memory_total:.0f} MB "
+                    f"({gpu.memory_percent:.1f}%) | Temp {gpu.temperature:.1f}°C\n"
+                )
+            if snapshot['gpu'] and time_range_minutes:
+                f.write(f"Average GPU Usage (last {time_range_minutes} min): {average('gpu_usage', '%')}\n")
+
+            download_speed, upload_speed = snapshot['network']
+            f.write(f"Network: Download {download_speed:.1f} Mbps | Upload {upload_speed:.1f} Mbps\n")
+            if time_range_minutes:
+                f.write(f"Average Download (last {time_range_minutes} min): {average('net_download', ' Mbps', 2)}\n")
+                f.write(f"Average Upload (last {time_range_minutes} min): {average('net_upload', ' Mbps', 2)}\n")
+
+        # Процеси
+        f.write("\nRunning Processes:\n")
+        f.write("-" * 70 + "\n")
+        f.write(f"{'PID':<8} {'Memory (MB)':<12} {'Memory (%)':<12} {'CPU (%)':<12} {'Process Name':<30}\n")
+        for info in sorted(processes.values(), key=lambda info: info.memory_mb, reverse=True)[:10]:
+            f.write(f"{info.pid:<8} {info.memory_mb:<12.2f} {info.memory_percent:<12.2f} {info.cpu_percent:<12.2f} {info.name:<30}\n")
+        leaks = sorted((info for info in processes.values() if info.leak_suspect), key=lambda info: info.rss_slope, reverse=True)
+        if leaks:
+            f.write("\nSuspected Memory Leaks (steady RSS growth):\n")
+            f.write("-" * 70 + "\n")
+            f.write(f"{'PID':<8} {'Memory (MB)':<12} {'Growth (MB/min)':<16} {'Process Name':<30}\n")
+            for info in leaks[:10]:
+                f.write(f"{info.pid:<8} {info.memory_mb:<12.2f} {info.rss_slope:<+16.2f} {info.name:<30}\n")
+        f.write("\nNetwork-Using Processes:\n")
+        f.write("-" * 70 + "\n")
+        f.write(f"{'PID':<8} {'Download (KB/s)':<15} {'Upload (KB/s)':<15} {'Process Name':<30}\n")
+        for info in sorted(net_processes.values(), key=lambda info: info.download_kbps, reverse=True)[:10]:
+            f.write(f"{info.pid:<8} {info.download_kbps:<15.2f} {info.upload_kbps:<15.2f} {info.name:<30}\n")
+        f.write("\nReboot History:\n")
+        f.write("-" * 70 + "\n")
+        for reboot_time in reboot_history:
+            f.write(f"{reboot_time}\n")
+        f.write("\nAlert Log:\n")
+        f.write("-" * 70 + "\n")
+        for alert in alerts[-10:]:
+            f.write(f"{alert.time}: {alert.message}\n")
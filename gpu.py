@@ -0,0 +1,146 @@
+import math
+import os
+import platform
+import shutil
+import subprocess
+import threading
+import time
+from typing import NamedTuple
+from config import NVIDIA_SMI_PATH
+from utilities import setup_logging
+
+# Телеметрія GPU через постійний сеанс nvidia-smi
+class GPUInfo(NamedTuple):
+    index: int
+    name: str
+    memory_total: float
+
+
+class GPUSample(NamedTuple):
+    index: int
+    name: str
+    usage: float
+    memory_used: float
+    memory_total: float
+    memory_percent: float
+    temperature: float
+    temperature_min: float
+    temperature_max: float
+
+
+def find_nvidia_smi():
+    if NVIDIA_SMI_PATH:
+        return NVIDIA_SMI_PATH
+    path = shutil.which('nvidia-smi')
+    if path is None and platform.system() == "Windows":
+        default = os.path.join(os.environ.get('SystemRoot', r"C:\Windows"), 'System32', 'nvidia-smi.exe')
+        path = default if os.path.exists(default) else None
+    return path
+
+
+def _number(text):
+    # nvidia-smi повертає "[N/A]" або "[Not Supported]" для недоступних полів
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+class GPUCollector:
+    """Per-GPU usage, memory and temperature from one long-lived ``nvidia-smi`` process.
+
+    Static properties (name, total memory) are queried once at construction.
+    ``start`` launches ``nvidia-smi --query-gpu=... --loop-ms=<interval>``, whose
+    output a reader thread parses into the latest values per GPU, so a sample
+    costs no process spawn. ``executable`` may point to any program with the
+    same CSV output, e.g. a fake ``nvidia-smi`` in tests.
+    """
+
+    DYNAMIC_FIELDS = 'index,utilization.gpu,memory.used,temperature.gpu'
+    STATIC_FIELDS = 'index,name,memory.total'
+
+    def __init__(self, executable: str = None, interval: float = 2.0):
+        self.executable = executable or find_nvidia_smi()
+        self.interval = interval
+        self.gpus = self._query_static() if self.executable else ()
+        self.available = bool(self.gpus)
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._process = None
+        self._reader = None
+        self._last_start = 0.0
+        self._temperature_min = [math.inf] * len(self.gpus)
+        self._temperature_max = [-math.inf] * len(self.gpus)
+
+    def _query_static(self):
+        try:
+            result = subprocess.run(
+                [self.executable, f'--query-gpu={self.STATIC_FIELDS}', '--format=csv,noheader,nounits'],
+                capture_output=True, text=True, timeout=10
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            setup_logging().error(f"nvidia-smi is not usable: {e}")
+            return ()
+        gpus = []
+        for line in result.stdout.splitlines():
+            parts = [part.strip() for part in line.split(',')]
+            if len(parts) == 3 and parts[0].isdigit():
+                gpus.append(GPUInfo(int(parts[0]), parts[1], _number(parts[2])))
+        return tuple(gpus)
+
+    def start(self):
+        if not self.available:
+            return
+        self._last_start = time.monotonic()
+        try:
+            self._process = subprocess.Popen(
+                [self.executable, f'--query-gpu={self.DYNAMIC_FIELDS}', '--format=csv,noheader,nounits',
+                 f'--loop-ms={int(self.interval * 1000)}'],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1
+            )
+        except OSError as e:
+            # Наприклад, драйвер видалено під час роботи; наступна спроба — через 30 с
+            setup_logging().error(f"Failed to start nvidia-smi: {e}")
+            self._process = None
+            return
+        self._reader = threading.Thread(target=self._read, args=(self._process,), daemon=True)
+        self._reader.start()
+
+    def _read(self, process):
+        with process.stdout:
+            for line in process.stdout:
+                parts = [part.strip() for part in line.split(',')]
+                if len(parts) != 4 or not parts[0].isdigit():
+                    continue
+                with self._lock:
+                    self._latest[int(parts[0])] = (_number(parts[1]), _number(parts[2]), _number(parts[3]))
+        # Сеанс завершився: останні значення більше не актуальні
+        with self._lock:
+            if self._process is process or self._process is None:
+                self._latest.clear()
+
+    def sample(self):
+        if not self.available:
+            return ()
+        # Перезапуск сеансу, якщо nvidia-smi завершився (не частіше ніж раз на 30 с)
+        if (self._process is None or self._process.poll() is not None) and time.monotonic() - self._last_start > 30:
+            self.start()
+        with self._lock:
+            latest = dict(self._latest)
+        samples = []
+        for position, info in enumerate(self.gpus):
+            usage, memory_used, temperature = latest.get(info.index, (math.nan, math.nan, math.nan))
+            if not math.isnan(temperature):
+                self._temperature_min[position] = min(self._temperature_min[position], temperature)
+                self._temperature_max[position] = max(self._temperature_max[position], temperature)
+            memory_percent = memory_used / info.memory_total * 100 if info.memory_total else math.nan
+            samples.append(GPUSample(
+                info.index, info.name, usage, memory_used, info.memory_total, memory_percent, temperature,
+                self._temperature_min[position], self._temperature_max[position]
+            ))
+        return tuple(samples)
+
+    def stop(self):
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+        self._process = None
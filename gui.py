@@ -1,32 +1,38 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib
-import subprocess
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 import psutil
 import platform
+import re
 import datetime
-import pyperclip
-import wmi
 import os
 import sys
-from config import MAX_HISTORY, CPU_THRESHOLD, RAM_THRESHOLD, GPU_THRESHOLD, DISK_SPACE_THRESHOLD, NET_TRAFFIC_THRESHOLD, UPTIME_THRESHOLD, AUTO_EXPORT_INTERVAL
-from utilities import create_plot, update_process_list, update_net_process_list, kill_process, setup_logging
+import time
+from config import MAX_HISTORY, CPU_THRESHOLD, RAM_THRESHOLD, GPU_THRESHOLD, DISK_SPACE_THRESHOLD, NET_TRAFFIC_THRESHOLD, AUTO_EXPORT_INTERVAL, AUTO_EXPORT_RANGE, EXPORT_FORMAT, GUI_POLL_INTERVAL, SNAPSHOT_QUEUE_SIZE, MAX_FPS, PROCESS_FILTER_DELAY, CPU_HEATMAP_THRESHOLD, CPU_HEATMAP_BUSIEST, SYSTEM_INFO_REFRESH_INTERVAL
+from utilities import load_drivers, create_plot, update_process_list, filter_process_list, process_index, update_net_process_list, kill_process, setup_logging, export_data
+from snapshots import SnapshotQueue
+from rendering import ChartRenderer
+from tables import VirtualTable
+from processes import ProcessSampler
+from netstats import NET_ACCOUNTING_AVAILABLE
+from alerts import AlertEngine, default_rules
+from export import EXPORT_FORMATS
 
-try:
-    import GPUtil
-    GPU_AVAILABLE = True
-except ImportError:
-    GPU_AVAILABLE = False
+# Вікна перегляду історії на графіках (секунди; None — живі дані)
+HISTORY_WINDOWS = {
+    "Live": None,
+    "15 min": 15 * 60,
+    "1 hour": 3600,
+    "6 hours": 6 * 3600,
+    "24 hours": 24 * 3600
+}
 
-try:
-    from pySMART import Device
-    SMART_AVAILABLE = True
-except ImportError:
-    SMART_AVAILABLE = False
+# Групування таблиці процесів
+PROCESS_GROUPINGS = {
+    "None": None,
+    "Executable": 'exe',
+    "Parent": 'parent'
+}
 
 class SystemMonitorGUI:
     def __init__(self, root: tk.Tk, monitor):
@@ -37,15 +43,27 @@ class SystemMonitorGUI:
         self.root.minsize(800, 600)
         self.after_ids = []
         self.reboot_history = [datetime.datetime.fromtimestamp(psutil.boot_time()).strftime("%Y-%m-%d %H:%M:%S")]
-        self.alert_log = []
+        # Сповіщення оцінюються в потоці монітора; GUI лише показує їх без модальних вікон
+        self.alerts = AlertEngine(default_rules())
+        self._alerts_version = None
         
         # Перенаправлення stdout у /dev/null
         self.original_stdout = sys.stdout
         self.devnull_file = open(os.devnull, 'w')
         sys.stdout = self.devnull_file
 
+        # Знімки з потоку монітора рендеряться лише в головному циклі Tk
+        self.snapshot_queue = SnapshotQueue(SNAPSHOT_QUEUE_SIZE)
+        self.poll_after_id = None
+        self._system_info_after_id = None
+        # Таблиця процесів опитується окремим потоком; GUI лише рендерить знімки
+        self.process_sampler = ProcessSampler()
+
         self.setup_gui()
-        self.monitor.set_callback(self.update_gui)
+        self.monitor.add_callback(self.alerts.evaluate)
+        self.monitor.add_callback(self.snapshot_queue.put)
+        self.poll_after_id = self.root.after(GUI_POLL_INTERVAL, self.poll_snapshots)
+        self.process_sampler.start()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     def setup_gui(self):
@@ -58,171 +76,344 @@ class SystemMonitorGUI:
 
         self.notebook = ttk.Notebook(notebook_frame)
         self.notebook.pack(fill="both", expand=True)
+        self.renderer = ChartRenderer(self.root, MAX_FPS, self.monitor.diagnostics)
+
+        controls_frame = ttk.Frame(self.root)
+        controls_frame.pack(pady=5)
+        self.export_button = ttk.Button(controls_frame, text="Export Data", command=self.manual_export)
+        self.export_button.pack(side=tk.LEFT, padx=5)
+        self.export_format_var = tk.StringVar(value=EXPORT_FORMAT)
+        self.export_format_box = ttk.Combobox(
+            controls_frame, textvariable=self.export_format_var, values=EXPORT_FORMATS, state="readonly", width=6
+        )
+        self.export_format_box.pack(side=tk.LEFT)
+        self.pending_exports = []
+        self.latest_snapshot = None
+        ttk.Label(controls_frame, text="History:").pack(side=tk.LEFT, padx=(15, 5))
+        self.history_window_var = tk.StringVar(value="Live")
+        self.history_window_box = ttk.Combobox(
+            controls_frame, textvariable=self.history_window_var, values=list(HISTORY_WINDOWS), state="readonly", width=10
+        )
+        self.history_window_box.pack(side=tk.LEFT)
+        self.history_window_box.bind("<<ComboboxSelected>>", self.on_history_window_changed)
+        self._range_history = None
+        self._range_history_time = 0.0
+        self.active_alerts_frame = ttk.LabelFrame(self.root, text="Active Alerts")
+        self.active_alerts_frame.pack(fill="x", padx=10)
+        self.active_alerts_tree = ttk.Treeview(
+            self.active_alerts_frame, columns=("Since", "Message", "Recommendation"), show="headings", height=2
+        )
+        self.active_alerts_tree.pack(fill="x", padx=5, pady=2)
+        self.active_alerts_tree.heading("Since", text="Since")
+        self.active_alerts_tree.heading("Message", text="Message")
+        self.active_alerts_tree.heading("Recommendation", text="Recommendation")
+        self.active_alerts_tree.column("Since", width=150, anchor="center")
+        self.active_alerts_tree.column("Message", width=450)
+        self.active_alerts_tree.column("Recommendation", width=300)
+        self.active_alerts_tree.tag_configure('warning', background='#FF6347')
+        self.frames_label = ttk.Label(self.root, text="Frames: 0 rendered | 0 coalesced | 0 dropped", font=('Helvetica', 8))
+        self.frames_label.pack(anchor="e", padx=10)
+
+        # Вміст вкладки (віджети, графіки) будується під час її першого відкриття
+        self._tab_builders = {}
+        self._built_tabs = set()
+        for name, text in (
+            ('cpu', "CPU"), ('ram', "RAM"), ('gpu', "GPU"), ('disk', "Disk"), ('network', "Network"),
+            ('sysinfo', "System Info"), ('diagnostics', "Diagnostics")
+        ):
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=text)
+            setattr(self, f'{name}_frame', frame)
+            self._tab_builders[str(frame)] = (name, getattr(self, f'_build_{name}_tab'))
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_selected, add='+')
+        self.after_ids.append(self.root.after(1000, self.schedule_auto_export))
+        self._build_selected_tab()
+
+    def _build_selected_tab(self):
+        name, builder = self._tab_builders.get(self.notebook.select(), (None, None))
+        if name is None or name in self._built_tabs:
+            return False
+        self._built_tabs.add(name)
+        with self.monitor.diagnostics.measure(f'build.{name}'):
+            builder()
+        return True
+
+    def _on_tab_selected(self, event=None):
+        # Нова вкладка одразу показує останній знімок, не чекаючи наступного
+        if self._build_selected_tab() and self.latest_snapshot is not None:
+            self.update_gui(self.latest_snapshot)
 
-        self.export_button = ttk.Button(self.root, text="Export Data", command=self.manual_export)
-        self.export_button.pack(pady=5)
+    def _create_chart(self, master, **plot):
+        # matplotlib завантажується під час побудови першої вкладки з графіком
+        import matplotlib
+        matplotlib.use('TkAgg')
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        fig, ax = create_plot(**plot)
+        window = self.history_window_var.get()
+        if HISTORY_WINDOWS[window] is not None:
+            ax.set_xlabel(f"Time (last {window})")
+        canvas = FigureCanvasTkAgg(fig, master=master)
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
+        return fig, ax, canvas
 
-        # Вкладка CPU
-        self.cpu_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.cpu_frame, text="CPU")
+    def _build_cpu_tab(self):
         self.cpu_label = ttk.Label(self.cpu_frame, text="Total CPU Usage: 0%", font=('Helvetica', 12))
         self.cpu_label.pack(pady=5)
+        # Понад CPU_HEATMAP_THRESHOLD ядер — теплова карта замість ліній, легенди і сітки підписів
+        self.cpu_heatmap = self.monitor.cpu_count > CPU_HEATMAP_THRESHOLD
+        if self.cpu_heatmap:
+            self._build_cpu_heatmap()
+            return
         self.cores_frame = ttk.LabelFrame(self.cpu_frame, text="CPU Usage per Core (%)")
         self.cores_frame.pack(fill="x", pady=5)
         self.cpu_labels = []
-        for i in range(psutil.cpu_count()):
+        for i in range(self.monitor.cpu_count):
             label = ttk.Label(self.cores_frame, text=f"Core {i}: 0.0%", width=15)
             label.grid(row=0, column=i % 8, padx=5, pady=5)
             self.cpu_labels.append(label)
-        self.cpu_fig, self.cpu_ax = create_plot(
-            title="CPU Usage per Core", xlabel="Time (s)", ylabel="Usage (%)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
+        self.cpu_fig, self.cpu_ax, self.cpu_canvas = self._create_chart(
+            self.cpu_frame, title="CPU Usage per Core", xlabel="Time (s)", ylabel="Usage (%)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
         )
-        self.cpu_canvas = FigureCanvasTkAgg(self.cpu_fig, master=self.cpu_frame)
-        self.cpu_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
         self.cpu_lines = []
-        colors = plt.cm.tab20(np.linspace(0, 1, psutil.cpu_count()))
-        for i in range(psutil.cpu_count()):
+        from matplotlib import colormaps
+        colors = colormaps['tab20'](np.linspace(0, 1, self.monitor.cpu_count))
+        for i in range(self.monitor.cpu_count):
             line, = self.cpu_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label=f"Core {i}", color=colors[i])
             self.cpu_lines.append(line)
         self.cpu_ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
         self.cpu_fig.tight_layout()
+        self.renderer.add_chart('cpu', self.cpu_canvas, self.cpu_ax, self.cpu_lines, [(self.notebook, self.cpu_frame)])
 
-        # Вкладка RAM
-        self.ram_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.ram_frame, text="RAM")
+    def _build_cpu_heatmap(self):
+        cores = self.monitor.cpu_count
+        self.cores_label = ttk.Label(self.cpu_frame, text="", font=('Helvetica', 10))
+        self.cores_label.pack(pady=5)
+        self.cpu_fig, self.cpu_ax, self.cpu_canvas = self._create_chart(
+            self.cpu_frame, title=f"CPU Usage per Core ({cores} cores)", xlabel="Time (s)", ylabel="Core",
+            ylim=(-0.5, cores - 0.5), xlim=(-0.5, MAX_HISTORY - 0.5)
+        )
+        self.cpu_ax.grid(False)
+        # Одне зображення ядра × час: вартість кадру визначається розміром осей, а не кількістю ядер
+        self.cpu_image = self.cpu_ax.imshow(
+            np.zeros((cores, MAX_HISTORY)), aspect='auto', origin='lower', interpolation='nearest',
+            cmap='inferno', vmin=0, vmax=100, extent=(-0.5, MAX_HISTORY - 0.5, -0.5, cores - 0.5)
+        )
+        self.cpu_fig.colorbar(self.cpu_image, ax=self.cpu_ax, label="Usage (%)")
+        self.cpu_fig.tight_layout()
+        self.renderer.add_chart('cpu', self.cpu_canvas, self.cpu_ax, [self.cpu_image], [(self.notebook, self.cpu_frame)])
+
+    @staticmethod
+    def _cpu_summary(cpu_percent):
+        usage = np.asarray(cpu_percent, dtype=float)
+        top = min(CPU_HEATMAP_BUSIEST, len(usage))
+        busiest = np.argpartition(usage, -top)[-top:]
+        busiest = busiest[np.argsort(usage[busiest])[::-1]]
+        cores = ", ".join(f"{i} ({usage[i]:.0f}%)" for i in busiest.tolist())
+        return (
+            f"Min {usage.min():.1f}% | Avg {usage.mean():.1f}% | Max {usage.max():.1f}% | "
+            f"Cores >90%: {int((usage > 90).sum())} | Busiest: {cores}"
+        )
+
+    def _build_ram_tab(self):
         self.ram_label = ttk.Label(self.ram_frame, text="RAM Usage: 0%", font=('Helvetica', 12))
         self.ram_label.pack(pady=5)
-        self.ram_fig, self.ram_ax = create_plot(
-            title="RAM Usage Over Time", xlabel="Time (s)", ylabel="Usage (%)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
+        self.ram_fig, self.ram_ax, self.ram_canvas = self._create_chart(
+            self.ram_frame, title="RAM Usage Over Time", xlabel="Time (s)", ylabel="Usage (%)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
         )
-        self.ram_canvas = FigureCanvasTkAgg(self.ram_fig, master=self.ram_frame)
-        self.ram_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
         self.ram_line, = self.ram_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label="RAM Usage", color='blue')
         self.ram_ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
         self.ram_fig.tight_layout()
+        self.renderer.add_chart('ram', self.ram_canvas, self.ram_ax, [self.ram_line], [(self.notebook, self.ram_frame)])
         self.process_frame = ttk.LabelFrame(self.ram_frame, text="Running Processes")
         self.process_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        # Пошук по імені та командному рядку, фільтр за користувачем і групування
+        filter_frame = ttk.Frame(self.process_frame)
+        filter_frame.pack(fill="x", side=tk.TOP, pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT, padx=(0, 5))
+        self.process_filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(filter_frame, textvariable=self.process_filter_var, width=30)
+        filter_entry.pack(side=tk.LEFT)
+        filter_entry.bind("<KeyRelease>", self.on_process_filter_changed)
+        self.process_regex_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame, text="Regex", variable=self.process_regex_var, command=self.apply_process_filter).pack(side=tk.LEFT, padx=5)
+        ttk.Label(filter_frame, text="User:").pack(side=tk.LEFT, padx=(10, 5))
+        self.process_user_var = tk.StringVar(value="All")
+        self.process_user_box = ttk.Combobox(filter_frame, textvariable=self.process_user_var, values=("All",), state="readonly", width=15)
+        self.process_user_box.pack(side=tk.LEFT)
+        self.process_user_box.bind("<<ComboboxSelected>>", self.apply_process_filter)
+        ttk.Label(filter_frame, text="Group by:").pack(side=tk.LEFT, padx=(10, 5))
+        self.process_group_var = tk.StringVar(value="None")
+        group_box = ttk.Combobox(filter_frame, textvariable=self.process_group_var, values=list(PROCESS_GROUPINGS), state="readonly", width=12)
+        group_box.pack(side=tk.LEFT)
+        group_box.bind("<<ComboboxSelected>>", self.apply_process_filter)
+        self.process_filter_status = ttk.Label(filter_frame, text="")
+        self.process_filter_status.pack(side=tk.LEFT, padx=10)
+        self._process_filter_after_id = None
+        self._process_filter_error = None
         self.process_tree = ttk.Treeview(
-            self.process_frame, columns=("PID", "Name", "Memory_MB", "Memory_Percent", "CPU_Percent"), show="headings", height=5
+            self.process_frame, columns=("PID", "Name", "Memory_MB", "Memory_Percent", "CPU_Percent", "RSS_Slope", "RSS_History"),
+            show="headings", height=5
         )
         self.process_tree.pack(fill="both", expand=True, side=tk.LEFT)
-        self.process_tree.heading("PID", text="PID", command=lambda: update_process_list(self.process_tree, "PID"))
-        self.process_tree.heading("Name", text="Process Name", command=lambda: update_process_list(self.process_tree, "Name"))
-        self.process_tree.heading("Memory_MB", text="Memory (MB)", command=lambda: update_process_list(self.process_tree, "Memory_MB"))
-        self.process_tree.heading("Memory_Percent", text="Memory (%)", command=lambda: update_process_list(self.process_tree, "Memory_Percent"))
-        self.process_tree.heading("CPU_Percent", text="CPU (%)", command=lambda: update_process_list(self.process_tree, "CPU_Percent"))
+        self.process_tree.heading("PID", text="PID", command=lambda: update_process_list(self.process_table, "PID"))
+        self.process_tree.heading("Name", text="Process Name", command=lambda: update_process_list(self.process_table, "Name"))
+        self.process_tree.heading("Memory_MB", text="Memory (MB)", command=lambda: update_process_list(self.process_table, "Memory_MB"))
+        self.process_tree.heading("Memory_Percent", text="Memory (%)", command=lambda: update_process_list(self.process_table, "Memory_Percent"))
+        self.process_tree.heading("CPU_Percent", text="CPU (%)", command=lambda: update_process_list(self.process_table, "CPU_Percent"))
+        self.process_tree.heading("RSS_Slope", text="RSS Trend (MB/min)", command=lambda: update_process_list(self.process_table, "RSS_Slope"))
+        self.process_tree.heading("RSS_History", text="RSS History", command=lambda: update_process_list(self.process_table, "RSS_History"))
         self.process_tree.column("PID", width=80, anchor="center")
-        self.process_tree.column("Name", width=300)
+        self.process_tree.column("Name", width=220)
         self.process_tree.column("Memory_MB", width=100, anchor="center")
         self.process_tree.column("Memory_Percent", width=100, anchor="center")
         self.process_tree.column("CPU_Percent", width=100, anchor="center")
-        scrollbar = ttk.Scrollbar(self.process_frame, orient="vertical", command=self.process_tree.yview)
+        self.process_tree.column("RSS_Slope", width=120, anchor="center")
+        self.process_tree.column("RSS_History", width=140, anchor="center")
+        # Прокручування віртуальне: смуга керує вікном таблиці, а не самим Treeview
+        scrollbar = ttk.Scrollbar(self.process_frame, orient="vertical")
         scrollbar.pack(side=tk.RIGHT, fill="y")
-        self.process_tree.configure(yscrollcommand=scrollbar.set)
+        self.process_table = VirtualTable(self.process_tree, scrollbar)
         self.kill_button = ttk.Button(self.ram_frame, text="Kill Selected Process", command=lambda: kill_process(self))
         self.kill_button.pack(pady=5)
 
-        # Вкладка GPU
-        self.gpu_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.gpu_frame, text="GPU")
-        if GPU_AVAILABLE:
+    def _build_gpu_tab(self):
+        if self.monitor.gpu.available:
+            gpu_labels = [f"GPU {gpu.index}" for gpu in self.monitor.gpu.gpus]
             self.gpu_notebook = ttk.Notebook(self.gpu_frame)
             self.gpu_notebook.pack(fill="both", expand=True, padx=10, pady=5)
             self.gpu_usage_frame = ttk.Frame(self.gpu_notebook)
             self.gpu_notebook.add(self.gpu_usage_frame, text="GPU Usage")
             self.gpu_usage_label = ttk.Label(self.gpu_usage_frame, text="Current: N/A", font=('Helvetica', 12))
             self.gpu_usage_label.pack(pady=5)
-            self.gpu_usage_fig, self.gpu_usage_ax = create_plot(
-                title="GPU Usage", xlabel="Time (s)", ylabel="Usage (%)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
+            self.gpu_usage_fig, self.gpu_usage_ax, self.gpu_usage_canvas = self._create_chart(
+                self.gpu_usage_frame, title="GPU Usage", xlabel="Time (s)", ylabel="Usage (%)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
             )
-            self.gpu_usage_canvas = FigureCanvasTkAgg(self.gpu_usage_fig, master=self.gpu_usage_frame)
-            self.gpu_usage_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
-            self.gpu_usage_line, = self.gpu_usage_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label="GPU Usage", color='green')
+            self.gpu_usage_lines = [
+                self.gpu_usage_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label=label)[0] for label in gpu_labels
+            ]
             self.gpu_usage_ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
             self.gpu_usage_fig.tight_layout()
+            self.renderer.add_chart(
+                'gpu_usage', self.gpu_usage_canvas, self.gpu_usage_ax, self.gpu_usage_lines,
+                [(self.notebook, self.gpu_frame), (self.gpu_notebook, self.gpu_usage_frame)]
+            )
             self.gpu_memory_frame = ttk.Frame(self.gpu_notebook)
             self.gpu_notebook.add(self.gpu_memory_frame, text="GPU Memory")
             self.gpu_memory_label = ttk.Label(self.gpu_memory_frame, text="Used: N/A MB | Total: N/A MB | Percent: N/A%", font=('Helvetica', 12))
             self.gpu_memory_label.pack(pady=5)
-            self.gpu_memory_fig, self.gpu_memory_ax = create_plot(
-                title="GPU Memory Usage", xlabel="Time (s)", ylabel="Usage (%)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
+            self.gpu_memory_fig, self.gpu_memory_ax, self.gpu_memory_canvas = self._create_chart(
+                self.gpu_memory_frame, title="GPU Memory Usage", xlabel="Time (s)", ylabel="Usage (%)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
             )
-            self.gpu_memory_canvas = FigureCanvasTkAgg(self.gpu_memory_fig, master=self.gpu_memory_frame)
-            self.gpu_memory_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
-            self.gpu_memory_line, = self.gpu_memory_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label="GPU Memory (%)", color='purple')
+            self.gpu_memory_lines = [
+                self.gpu_memory_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label=label)[0] for label in gpu_labels
+            ]
             self.gpu_memory_ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
             self.gpu_memory_fig.tight_layout()
+            self.renderer.add_chart(
+                'gpu_memory', self.gpu_memory_canvas, self.gpu_memory_ax, self.gpu_memory_lines,
+                [(self.notebook, self.gpu_frame), (self.gpu_notebook, self.gpu_memory_frame)]
+            )
             self.gpu_temp_frame = ttk.Frame(self.gpu_notebook)
             self.gpu_notebook.add(self.gpu_temp_frame, text="GPU Temperature")
             self.gpu_temp_label = ttk.Label(self.gpu_temp_frame, text="Current: N/A | Min: N/A | Max: N/A", font=('Helvetica', 12))
             self.gpu_temp_label.pack(pady=5)
-            self.gpu_temp_fig, self.gpu_temp_ax = create_plot(
-                title="GPU Temperature", xlabel="Time (s)", ylabel="Temp (°C)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
+            self.gpu_temp_fig, self.gpu_temp_ax, self.gpu_temp_canvas = self._create_chart(
+                self.gpu_temp_frame, title="GPU Temperature", xlabel="Time (s)", ylabel="Temp (°C)", ylim=(0, 100), xlim=(0, MAX_HISTORY - 1)
             )
-            self.gpu_temp_canvas = FigureCanvasTkAgg(self.gpu_temp_fig, master=self.gpu_temp_frame)
-            self.gpu_temp_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
-            self.gpu_temp_line, = self.gpu_temp_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label="GPU Temp", color='red')
+            self.gpu_temp_lines = [
+                self.gpu_temp_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label=label)[0] for label in gpu_labels
+            ]
             self.gpu_temp_ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
             self.gpu_temp_fig.tight_layout()
+            self.renderer.add_chart(
+                'gpu_temp', self.gpu_temp_canvas, self.gpu_temp_ax, self.gpu_temp_lines,
+                [(self.notebook, self.gpu_frame), (self.gpu_notebook, self.gpu_temp_frame)]
+            )
         else:
-            ttk.Label(self.gpu_frame, text="GPU monitoring unavailable (GPUtil not installed)", font=('Helvetica', 12)).pack(pady=20)
+            ttk.Label(self.gpu_frame, text="GPU monitoring unavailable (nvidia-smi not found)", font=('Helvetica', 12)).pack(pady=20)
 
-        # Вкладка Disk
-        self.disk_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.disk_frame, text="Disk")
+    def _build_disk_tab(self):
         self.space_frame = ttk.LabelFrame(self.disk_frame, text="Disk Space")
         self.space_frame.pack(fill="x", pady=5, padx=10)
         self.disk_label = ttk.Label(self.space_frame, text="Disk Usage: N/A", font=('Helvetica', 12))
         self.disk_label.pack(pady=5)
+        self.filesystems_tree = ttk.Treeview(
+            self.space_frame, columns=("Mount", "Device", "Type", "Total", "Used", "Free", "Percent"), show="headings", height=3
+        )
+        self.filesystems_tree.pack(fill="x", padx=5, pady=5)
+        for column, heading, width in (
+            ("Mount", "Mount Point", 200), ("Device", "Device", 150), ("Type", "Type", 70), ("Total", "Total (GB)", 90),
+            ("Used", "Used (GB)", 90), ("Free", "Free (GB)", 90), ("Percent", "Used (%)", 80)
+        ):
+            self.filesystems_tree.heading(column, text=heading)
+            self.filesystems_tree.column(column, width=width, anchor="w" if column in ("Mount", "Device") else "center")
+        self.filesystems_tree.tag_configure('warning', background='#FF6347')
+        self._filesystems = None
         self.smart_frame = ttk.LabelFrame(self.disk_frame, text="Disk Health (SMART)")
         self.smart_frame.pack(fill="x", pady=5, padx=10)
         self.smart_label = ttk.Label(self.smart_frame, text="Temperature: N/A | Health: N/A", font=('Helvetica', 12))
         self.smart_label.pack(pady=5)
-        self.disk_fig, self.disk_ax = create_plot(
-            title="Disk I/O (MB/s)", xlabel="Time (s)", ylabel="Speed (MB/s)", ylim=(0, 10), xlim=(0, MAX_HISTORY - 1)
+        self.smart_tree = ttk.Treeview(self.smart_frame, columns=("Device", "Model", "Temperature", "Health"), show="headings", height=3)
+        self.smart_tree.pack(fill="x", padx=5, pady=5)
+        self.smart_tree.heading("Device", text="Device")
+        self.smart_tree.heading("Model", text="Model")
+        self.smart_tree.heading("Temperature", text="Temperature")
+        self.smart_tree.heading("Health", text="Health")
+        self.smart_tree.column("Device", width=150)
+        self.smart_tree.column("Model", width=300)
+        self.smart_tree.column("Temperature", width=100, anchor="center")
+        self.smart_tree.column("Health", width=100, anchor="center")
+        self.smart_tree.tag_configure('warning', background='#FF6347')
+        self._smart_drives = None
+        self.disk_device_var, self.disk_device_box = self._create_device_selector(self.disk_frame, "Device:")
+        self.disk_fig, self.disk_ax, self.disk_canvas = self._create_chart(
+            self.disk_frame, title="Disk I/O (MB/s)", xlabel="Time (s)", ylabel="Speed (MB/s)", ylim=(0, 10), xlim=(0, MAX_HISTORY - 1)
         )
-        self.disk_canvas = FigureCanvasTkAgg(self.disk_fig, master=self.disk_frame)
-        self.disk_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
         self.disk_read_line, = self.disk_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label="Read", color='blue')
         self.disk_write_line, = self.disk_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label="Write", color='orange')
         self.disk_ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
         self.disk_fig.tight_layout()
+        self.renderer.add_chart(
+            'disk', self.disk_canvas, self.disk_ax, [self.disk_read_line, self.disk_write_line],
+            [(self.notebook, self.disk_frame)], autoscale=True
+        )
 
-        # Вкладка Network
-        self.network_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.network_frame, text="Network")
+    def _build_network_tab(self):
         self.network_label = ttk.Label(self.network_frame, text="Network: Download 0.0 Mbps | Upload 0.0 Mbps", font=('Helvetica', 12))
         self.network_label.pack(pady=5)
-        self.network_fig, self.network_ax = create_plot(
-            title="Network Activity (Mbps)", xlabel="Time (s)", ylabel="Speed (Mbps)", ylim=(0, 10), xlim=(0, MAX_HISTORY - 1)
+        self.nic_var, self.nic_box = self._create_device_selector(self.network_frame, "Interface:")
+        self.network_fig, self.network_ax, self.network_canvas = self._create_chart(
+            self.network_frame, title="Network Activity (Mbps)", xlabel="Time (s)", ylabel="Speed (Mbps)", ylim=(0, 10), xlim=(0, MAX_HISTORY - 1)
         )
-        self.network_canvas = FigureCanvasTkAgg(self.network_fig, master=self.network_frame)
-        self.network_canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
         self.network_download_line, = self.network_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label="Download", color='blue')
         self.network_upload_line, = self.network_ax.plot(np.arange(MAX_HISTORY), [0] * MAX_HISTORY, label="Upload", color='orange')
         self.network_ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
         self.network_fig.tight_layout()
-        self.net_process_frame = ttk.LabelFrame(self.network_frame, text="Network-Using Processes")
+        self.renderer.add_chart(
+            'network', self.network_canvas, self.network_ax, [self.network_download_line, self.network_upload_line],
+            [(self.notebook, self.network_frame)], autoscale=True
+        )
+        self.net_process_frame = ttk.LabelFrame(self.network_frame, text="Network-Using Processes (TCP)")
         self.net_process_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        if not NET_ACCOUNTING_AVAILABLE:
+            ttk.Label(self.net_process_frame, text="Per-process network accounting requires Linux", font=('Helvetica', 10)).pack(anchor="w")
         self.net_process_tree = ttk.Treeview(
-            self.net_process_frame, columns=("PID", "Name", "Download_MB", "Upload_MB"), show="headings", height=5
+            self.net_process_frame, columns=("PID", "Name", "Download_KBps", "Upload_KBps"), show="headings", height=5
         )
         self.net_process_tree.pack(fill="both", expand=True, side=tk.LEFT)
-        self.net_process_tree.heading("PID", text="PID", command=lambda: update_net_process_list(self.net_process_tree, "PID"))
-        self.net_process_tree.heading("Name", text="Process Name", command=lambda: update_net_process_list(self.net_process_tree, "Name"))
-        self.net_process_tree.heading("Download_MB", text="Download (MB)", command=lambda: update_net_process_list(self.net_process_tree, "Download_MB"))
-        self.net_process_tree.heading("Upload_MB", text="Upload (MB)", command=lambda: update_net_process_list(self.net_process_tree, "Upload_MB"))
+        self.net_process_tree.heading("PID", text="PID", command=lambda: update_net_process_list(self.net_process_table, "PID"))
+        self.net_process_tree.heading("Name", text="Process Name", command=lambda: update_net_process_list(self.net_process_table, "Name"))
+        self.net_process_tree.heading("Download_KBps", text="Download (KB/s)", command=lambda: update_net_process_list(self.net_process_table, "Download_KBps"))
+        self.net_process_tree.heading("Upload_KBps", text="Upload (KB/s)", command=lambda: update_net_process_list(self.net_process_table, "Upload_KBps"))
         self.net_process_tree.column("PID", width=80, anchor="center")
         self.net_process_tree.column("Name", width=300)
-        self.net_process_tree.column("Download_MB", width=100, anchor="center")
-        self.net_process_tree.column("Upload_MB", width=100, anchor="center")
-        net_scrollbar = ttk.Scrollbar(self.net_process_frame, orient="vertical", command=self.net_process_tree.yview)
+        self.net_process_tree.column("Download_KBps", width=100, anchor="center")
+        self.net_process_tree.column("Upload_KBps", width=100, anchor="center")
+        net_scrollbar = ttk.Scrollbar(self.net_process_frame, orient="vertical")
         net_scrollbar.pack(side=tk.RIGHT, fill="y")
-        self.net_process_tree.configure(yscrollcommand=net_scrollbar.set)
+        self.net_process_table = VirtualTable(self.net_process_tree, net_scrollbar)
 
-        # Вкладка System Info
-        self.sysinfo_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.sysinfo_frame, text="System Info")
+    def _build_sysinfo_tab(self):
         canvas = tk.Canvas(self.sysinfo_frame)
         scrollbar = ttk.Scrollbar(self.sysinfo_frame, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
@@ -289,185 +480,406 @@ class SystemMonitorGUI:
         self.alert_tree.configure(yscrollcommand=alert_scrollbar.set)
         self.copy_button = ttk.Button(scrollable_frame, text="Copy to Clipboard", command=self.copy_system_info)
         self.copy_button.pack(pady=5)
-
-        self.after_ids.append(self.root.after(1000, self.schedule_auto_export))
+        # Журнал сповіщень заповнюється при наступному update_alerts
+        self._alerts_version = None
+        self._drivers = None
+        self.load_system_info()
         self.update_system_info()
 
+    def _build_diagnostics_tab(self):
+        self.overhead_label = ttk.Label(self.diagnostics_frame, text="Monitor process: N/A", font=('Helvetica', 12))
+        self.overhead_label.pack(pady=5)
+        self.stages_tree = ttk.Treeview(
+            self.diagnostics_frame, columns=("Stage", "Last", "Mean", "P95", "Max", "Count"), show="headings", height=12
+        )
+        self.stages_tree.pack(fill="both", expand=True, padx=10, pady=5)
+        for column, heading, width in (
+            ("Stage", "Stage", 250), ("Last", "Last (ms)", 90), ("Mean", "Mean (ms)", 90), ("P95", "p95 (ms)", 90),
+            ("Max", "Max (ms)", 90), ("Count", "Count", 80)
+        ):
+            self.stages_tree.heading(column, text=heading)
+            self.stages_tree.column(column, width=width, anchor="w" if column == "Stage" else "center")
+        self._stages_tree_state = {'items': {}, 'order': []}
+        self.profile_button = ttk.Button(self.diagnostics_frame, text="Start Profiling", command=self.toggle_profiling)
+        self.profile_button.pack(pady=5)
+        self.profile_text = tk.Text(self.diagnostics_frame, height=12, wrap="none", font=('Courier', 9))
+        self.profile_text.pack(fill="both", expand=True, padx=10, pady=5)
+
     def update_gui(self, data):
+        self.latest_snapshot = data
+        # Оновлюються лише вже побудовані вкладки
+        built = self._built_tabs
         # CPU
-        total_cpu, cpu_percent = data['cpu']
-        self.cpu_label.config(text=f"Total CPU Usage: {total_cpu:.1f}%")
-        recommendation = "Recommendation: Close high-CPU processes."
-        if total_cpu > CPU_THRESHOLD:
-            self.cpu_label.config(foreground="red")
-            messagebox.showwarning("CPU Warning", f"CPU usage exceeded {CPU_THRESHOLD}%: {total_cpu:.1f}%\n{recommendation}")
-        else:
-            self.cpu_label.config(foreground="black")
-        for i, percent in enumerate(cpu_percent):
-            color = "red" if percent > 90 else "orange" if percent > 70 else "black"
-            self.cpu_labels[i].config(text=f"Core {i}: {percent:.1f}%", foreground=color)
-        cpu_history = self.monitor.get_cpu_history()
-        for i, line in enumerate(self.cpu_lines):
-            cpu_data = cpu_history[i] + [0] * (MAX_HISTORY - len(cpu_history[i]))
-            line.set_ydata(cpu_data)
-        self.cpu_ax.relim()
-        self.cpu_ax.autoscale_view()
-        self.cpu_canvas.draw()
+        if 'cpu' in built:
+            total_cpu, cpu_percent = data['cpu']
+            self.cpu_label.config(text=f"Total CPU Usage: {total_cpu:.1f}%")
+            self.cpu_label.config(foreground="red" if total_cpu > CPU_THRESHOLD else "black")
+            if self.cpu_heatmap:
+                self.cores_label.config(text=self._cpu_summary(cpu_percent))
+            else:
+                for i, percent in enumerate(cpu_percent):
+                    color = "red" if percent > 90 else "orange" if percent > 70 else "black"
+                    self.cpu_labels[i].config(text=f"Core {i}: {percent:.1f}%", foreground=color)
 
         # RAM
-        ram = data['ram']
-        self.ram_label.config(
-            text=f"RAM Usage: {ram.percent:.1f}% ({ram.used/(1024**3):.2f}/{ram.total/(1024**3):.2f} GB, Free: {ram.free/(1024**3):.2f} GB)"
-        )
-        recommendation = "Recommendation: Close high-memory processes."
-        if ram.percent > RAM_THRESHOLD:
-            self.ram_label.config(foreground="red")
-            messagebox.showwarning("RAM Warning", f"RAM usage exceeded {RAM_THRESHOLD}%: {ram.percent:.1f}%\n{recommendation}")
-        else:
-            self.ram_label.config(foreground="black")
-        ram_history = self.monitor.get_ram_history()
-        ram_data = ram_history + [0] * (MAX_HISTORY - len(ram_history))
-        self.ram_line.set_ydata(ram_data)
-        self.ram_ax.relim()
-        self.ram_ax.autoscale_view()
-        self.ram_canvas.draw()
-        update_process_list(self.process_tree)
+        if 'ram' in built:
+            ram = data['ram']
+            self.ram_label.config(
+                text=f"RAM Usage: {ram.percent:.1f}% ({ram.used/(1024**3):.2f}/{ram.total/(1024**3):.2f} GB, Free: {ram.free/(1024**3):.2f} GB)"
+            )
+            self.ram_label.config(foreground="red" if ram.percent > RAM_THRESHOLD else "black")
+            with self.monitor.diagnostics.measure('render.process_list'):
+                update_process_list(self.process_table, snapshot=self.process_sampler.snapshot(), history=self.process_sampler.history)
+            self._update_device_choices(self.process_user_box, process_index().users())
+            self._update_process_filter_status()
 
         # GPU
-        if GPU_AVAILABLE and data['gpu']:
-            gpu_usage, gpu_memory_used, gpu_memory_total, gpu_memory_percent, gpu_temp, gpu_temp_min, gpu_temp_max = data['gpu']
-            recommendation = "Recommendation: Reduce GPU-intensive tasks."
-            self.gpu_usage_label.config(text=f"Current: {gpu_usage:.1f}%", foreground="red" if gpu_usage > 90 else "black")
-            gpu_usage_history = self.monitor.get_gpu_usage_history()
-            gpu_usage_data = gpu_usage_history + [0] * (MAX_HISTORY - len(gpu_usage_history))
-            self.gpu_usage_line.set_ydata(gpu_usage_data)
-            self.gpu_usage_ax.relim()
-            self.gpu_usage_ax.autoscale_view()
-            self.gpu_usage_canvas.draw()
+        if 'gpu' in built and self.monitor.gpu.available and data['gpu']:
+            gpus = data['gpu']
+            self.gpu_usage_label.config(
+                text=" | ".join(f"GPU {gpu.index}: {gpu.usage:.1f}%" for gpu in gpus),
+                foreground="red" if any(gpu.usage > 90 for gpu in gpus) else "black"
+            )
             self.gpu_memory_label.config(
-                text=f"Used: {gpu_memory_used:.1f} MB | Total: {gpu_memory_total:.1f} MB | Percent: {gpu_memory_percent:.1f}%",
-                foreground="red" if gpu_memory_percent > 90 else "black"
+                text=" | ".join(
+                    f"GPU {gpu.index}: {gpu.memory_used:.0f}/{gpu.memory_total:.0f} MB ({gpu.memory_percent:.1f}%)" for gpu in gpus
+                ),
+                foreground="red" if any(gpu.memory_percent > 90 for gpu in gpus) else "black"
             )
-            gpu_memory_history = self.monitor.get_gpu_memory_history()
-            gpu_memory_data = gpu_memory_history + [0] * (MAX_HISTORY - len(gpu_memory_history))
-            self.gpu_memory_line.set_ydata(gpu_memory_data)
-            self.gpu_memory_ax.relim()
-            self.gpu_memory_ax.autoscale_view()
-            self.gpu_memory_canvas.draw()
             self.gpu_temp_label.config(
-                text=f"Current: {gpu_temp:.1f} | Min: {gpu_temp_min:.1f} | Max: {gpu_temp_max:.1f}",
-                foreground="red" if gpu_temp > GPU_THRESHOLD else "black"
+                text=" | ".join(
+                    f"GPU {gpu.index}: {gpu.temperature:.1f} (Min: {gpu.temperature_min:.1f}, Max: {gpu.temperature_max:.1f})"
+                    for gpu in gpus
+                ),
+                foreground="red" if any(gpu.temperature > GPU_THRESHOLD for gpu in gpus) else "black"
             )
-            if gpu_temp > GPU_THRESHOLD:
-                messagebox.showwarning("GPU Warning", f"GPU temperature exceeded {GPU_THRESHOLD}°C: {gpu_temp:.1f}°C\n{recommendation}")
-            gpu_temp_history = self.monitor.get_gpu_temp_history()
-            gpu_temp_data = gpu_temp_history + [0] * (MAX_HISTORY - len(gpu_temp_history))
-            self.gpu_temp_line.set_ydata(gpu_temp_data)
-            self.gpu_temp_ax.relim()
-            self.gpu_temp_ax.autoscale_view()
-            self.gpu_temp_canvas.draw()
 
         # Disk
-        disk, read_speed, write_speed, disk_temp, disk_health = data['disk']
-        free_percent = 100 - disk.percent
-        self.disk_label.config(
-            text=f"Disk Usage: {disk.percent:.1f}% ({disk.used/(1024**3):.2f}/{disk.total/(1024**3):.2f} GB, Free: {disk.free/(1024**3):.2f} GB)",
-            foreground="red" if free_percent < DISK_SPACE_THRESHOLD else "black"
-        )
-        recommendation = "Recommendation: Free up disk space."
-        if free_percent < DISK_SPACE_THRESHOLD:
-            messagebox.showwarning("Disk Space Warning", f"Free disk space is below {DISK_SPACE_THRESHOLD}%: {free_percent:.1f}%\n{recommendation}")
-        self.smart_label.config(text=f"Temperature: {disk_temp} | Health: {disk_health}")
-        disk_read_history, disk_write_history = self.monitor.get_disk_io_history()
-        disk_read_data = disk_read_history + [0] * (MAX_HISTORY - len(disk_read_history))
-        disk_write_data = disk_write_history + [0] * (MAX_HISTORY - len(disk_write_history))
-        self.disk_read_line.set_ydata(disk_read_data)
-        self.disk_write_line.set_ydata(disk_write_data)
-        self.disk_ax.relim()
-        self.disk_ax.autoscale_view()
-        self.disk_canvas.draw()
+        if 'disk' in built:
+            disk, read_speed, write_speed, disk_temp, disk_health = data['disk']
+            free_percent = 100 - disk.percent
+            self.disk_label.config(
+                text=f"Disk Usage: {disk.percent:.1f}% ({disk.used/(1024**3):.2f}/{disk.total/(1024**3):.2f} GB, Free: {disk.free/(1024**3):.2f} GB)",
+                foreground="red" if free_percent < DISK_SPACE_THRESHOLD else "black"
+            )
+            filesystems = data.get('filesystems', ())
+            if filesystems != self._filesystems:
+                self._filesystems = filesystems
+                self.filesystems_tree.delete(*self.filesystems_tree.get_children())
+                for fs in filesystems:
+                    tags = ('warning',) if 100 - fs.percent < DISK_SPACE_THRESHOLD else ()
+                    self.filesystems_tree.insert("", "end", values=(
+                        fs.mountpoint, fs.device, fs.fstype, f"{fs.total/(1024**3):.2f}", f"{fs.used/(1024**3):.2f}",
+                        f"{fs.free/(1024**3):.2f}", f"{fs.percent:.1f}"
+                    ), tags=tags)
+            self._update_device_choices(self.disk_device_box, data['disks'])
+            self.smart_label.config(text=f"Temperature: {disk_temp} | Health: {disk_health}")
+            drives = data.get('smart', ())
+            if drives != self._smart_drives:
+                self._smart_drives = drives
+                self.smart_tree.delete(*self.smart_tree.get_children())
+                for drive in drives:
+                    tags = ('warning',) if drive.health not in ("OK", "N/A") else ()
+                    self.smart_tree.insert("", "end", values=(drive.device, drive.model, drive.temperature, drive.health), tags=tags)
 
         # Network
-        download_speed, upload_speed = data['network']
-        self.network_label.config(
-            text=f"Network: Download {download_speed:.1f} Mbps | Upload {upload_speed:.1f} Mbps",
-            foreground="red" if (download_speed > NET_TRAFFIC_THRESHOLD or upload_speed > NET_TRAFFIC_THRESHOLD) else "black"
-        )
-        recommendation = "Recommendation: Check network-intensive processes."
-        if download_speed > NET_TRAFFIC_THRESHOLD or upload_speed > NET_TRAFFIC_THRESHOLD:
-            messagebox.showwarning("Network Warning", f"Unusual network activity: Download {download_speed:.1f} Mbps, Upload {upload_speed:.1f} Mbps\n{recommendation}")
-        download_history, upload_history = self.monitor.get_network_history()
-        download_data = download_history + [0] * (MAX_HISTORY - len(download_history))
-        upload_data = upload_history + [0] * (MAX_HISTORY - len(upload_history))
-        self.network_download_line.set_ydata(download_data)
-        self.network_upload_line.set_ydata(upload_data)
-        self.network_ax.relim()
-        self.network_ax.autoscale_view()
-        self.network_canvas.draw()
-        update_net_process_list(self.net_process_tree)
+        if 'network' in built:
+            download_speed, upload_speed = data['network']
+            self.network_label.config(
+                text=f"Network: Download {download_speed:.1f} Mbps | Upload {upload_speed:.1f} Mbps",
+                foreground="red" if (download_speed > NET_TRAFFIC_THRESHOLD or upload_speed > NET_TRAFFIC_THRESHOLD) else "black"
+            )
+            self._update_device_choices(self.nic_box, data['nics'])
+            with self.monitor.diagnostics.measure('render.net_process_list'):
+                update_net_process_list(self.net_process_table, snapshot=self.process_sampler.net_snapshot())
 
         # System Info
-        uptime_seconds, days, hours, minutes = data['uptime']
-        self.uptime_label.config(text=f"Uptime: {days}d {hours}h {minutes}m")
-        recommendation = "Recommendation: Consider rebooting the system."
-        if uptime_seconds > UPTIME_THRESHOLD:
-            alert_msg = f"System running for over 7 days: {days}d {hours}h {minutes}m"
-            self.alert_log.append(f"{datetime.datetime.now()}: {alert_msg}")
-            messagebox.showwarning("Uptime Warning", f"{alert_msg}\n{recommendation}")
-        self.update_system_info()
+        diagnostics = self.monitor.diagnostics
+        with diagnostics.measure('render.alerts'):
+            self.update_alerts()
+        if 'sysinfo' in built:
+            uptime_seconds, days, hours, minutes = data['uptime']
+            self.uptime_label.config(text=f"Uptime: {days}d {hours}h {minutes}m")
+            with diagnostics.measure('render.system_info'):
+                self.update_system_info()
+        with diagnostics.measure('render.charts'):
+            self.update_charts()
+        if 'diagnostics' in data and self.notebook.select() == str(self.diagnostics_frame):
+            self.update_diagnostics(data['diagnostics'])
 
-    def update_system_info(self):
+    def update_charts(self):
+        built = self._built_tabs
+        if not built & {'cpu', 'ram', 'gpu', 'disk', 'network'}:
+            return
+        history = self._chart_history()
+        if 'cpu' in built:
+            if self.cpu_heatmap:
+                self.cpu_image.set_data(history['cpu'])
+            else:
+                for i, line in enumerate(self.cpu_lines):
+                    line.set_ydata(history['cpu'][i])
+            self.renderer.invalidate('cpu')
+        if 'ram' in built:
+            self.ram_line.set_ydata(history['ram'])
+            self.renderer.invalidate('ram')
+        if 'gpu' in built and self.monitor.gpu.available:
+            for name in ('gpu_usage', 'gpu_memory', 'gpu_temp'):
+                for i, line in enumerate(getattr(self, f'{name}_lines')):
+                    line.set_ydata(history[name][i])
+            self.renderer.invalidate('gpu_usage')
+            self.renderer.invalidate('gpu_memory')
+            self.renderer.invalidate('gpu_temp')
+        if 'disk' in built:
+            disk_read_history, disk_write_history = self._device_series(history['disk'], history['disks'], self.disk_device_var.get())
+            self.disk_read_line.set_ydata(disk_read_history)
+            self.disk_write_line.set_ydata(disk_write_history)
+            self.renderer.invalidate('disk')
+        if 'network' in built:
+            download_history, upload_history = self._device_series(history['network'], history['nics'], self.nic_var.get())
+            self.network_download_line.set_ydata(download_history)
+            self.network_upload_line.set_ydata(upload_history)
+            self.renderer.invalidate('network')
+        self.renderer.flush()
+
+    # Вибір окремого диска або мережевого інтерфейсу на графіку ("All" — сумарні значення)
+    def _create_device_selector(self, parent, label):
+        frame = ttk.Frame(parent)
+        frame.pack(anchor="w", padx=10)
+        ttk.Label(frame, text=label).pack(side=tk.LEFT, padx=(0, 5))
+        var = tk.StringVar(value="All")
+        box = ttk.Combobox(frame, textvariable=var, values=("All",), state="readonly", width=20)
+        box.pack(side=tk.LEFT)
+        box.bind("<<ComboboxSelected>>", self.on_device_changed)
+        return var, box
+
+    def _update_device_choices(self, box, devices):
+        values = ("All",) + tuple(sorted(devices))
+        if values != tuple(box.cget('values')):
+            box.config(values=values)
+
+    # Фільтр таблиці процесів застосовується після паузи у введенні, а не на кожну клавішу
+    def on_process_filter_changed(self, event=None):
+        if self._process_filter_after_id is not None:
+            self.root.after_cancel(self._process_filter_after_id)
+        self._process_filter_after_id = self.root.after(PROCESS_FILTER_DELAY, self.apply_process_filter)
+
+    def apply_process_filter(self, event=None):
+        self._process_filter_after_id = None
+        user = self.process_user_var.get()
+        try:
+            with self.monitor.diagnostics.measure('render.process_filter'):
+                filter_process_list(
+                    self.process_table,
+                    self.process_filter_var.get(),
+                    self.process_regex_var.get(),
+                    None if user == "All" else user,
+                    PROCESS_GROUPINGS[self.process_group_var.get()]
+                )
+        except re.error as e:
+            # Таблиця лишається з попереднім фільтром, доки вираз не виправлено
+            self._process_filter_error = f"Invalid regex: {e}"
+        else:
+            self._process_filter_error = None
+        self._update_process_filter_status()
+
+    def _update_process_filter_status(self):
+        if self._process_filter_error:
+            self.process_filter_status.config(text=self._process_filter_error, foreground="red")
+            return
+        index = process_index()
+        if index.grouping:
+            text = f"{len(index.groups)} groups, {len(index.matches)} of {len(index.records)} processes"
+        else:
+            text = f"{len(index.matches)} of {len(index.records)} processes"
+        self.process_filter_status.config(text=text, foreground="black")
+
+    @staticmethod
+    def _device_series(total, devices, selected):
+        if selected == "All":
+            return total
+        series = devices.get(selected)
+        if series is None:
+            # Пристрій відсутній у вибраному вікні історії
+            return np.full((2, MAX_HISTORY), np.nan)
+        return series
+
+    def on_device_changed(self, event=None):
+        if 'disk' in self._built_tabs:
+            disk = self.disk_device_var.get()
+            self.disk_ax.set_title("Disk I/O (MB/s)" if disk == "All" else f"Disk I/O: {disk} (MB/s)")
+        if 'network' in self._built_tabs:
+            nic = self.nic_var.get()
+            self.network_ax.set_title("Network Activity (Mbps)" if nic == "All" else f"Network Activity: {nic} (Mbps)")
+        self.renderer.reset()
+        self.update_charts()
+
+    def _chart_history(self):
+        # У режимі "Live" — кільцеві буфери, інакше — агреговані дані зі сховища
+        window = HISTORY_WINDOWS[self.history_window_var.get()]
+        if window is None:
+            return self.monitor.get_live_history()
+        now = time.time()
+        if self._range_history is None or now - self._range_history_time >= window / MAX_HISTORY:
+            self._range_history = self.monitor.get_range_history(window, MAX_HISTORY)
+            self._range_history_time = now
+        return self._range_history
+
+    def on_history_window_changed(self, event=None):
+        label = self.history_window_var.get()
+        xlabel = "Time (s)" if HISTORY_WINDOWS[label] is None else f"Time (last {label})"
+        for chart in self.renderer.charts.values():
+            chart.ax.set_xlabel(xlabel)
+        self.renderer.reset()
+        self._range_history = None
+        self.update_charts()
+
+    # Експорт виконується у фоновому потоці; результати перевіряються в головному циклі Tk
+    def _check_exports(self):
+        if not self.pending_exports:
+            return
+        pending = []
+        for future, manual in self.pending_exports:
+            if not future.done():
+                pending.append((future, manual))
+                continue
+            try:
+                filenames = future.result()
+            except Exception as e:
+                setup_logging().error(f"Error in export: {e}")
+                if manual:
+                    messagebox.showerror("Error", f"Export failed: {e}")
+                continue
+            if manual:
+                messagebox.showinfo("Success", f"Data exported to {', '.join(filenames)}")
+            else:
+                setup_logging().info(f"Auto-exported data to {', '.join(filenames)}")
+        self.pending_exports = pending
+
+    def poll_snapshots(self):
+        self._check_exports()
+        if 'sysinfo' in self._built_tabs:
+            self._check_drivers()
+        snapshot = self.snapshot_queue.take_latest()
+        if snapshot is not None:
+            try:
+                with self.monitor.diagnostics.measure('render.update_gui'):
+                    self.update_gui(snapshot)
+            except Exception as e:
+                setup_logging().error(f"Error in update_gui: {e}")
+            stats = self.snapshot_queue.stats()
+            self.frames_label.config(
+                text=f"Frames: {stats['rendered']} rendered | {stats['coalesced']} coalesced | {stats['dropped']} dropped"
+            )
+        self.poll_after_id = self.root.after(GUI_POLL_INTERVAL, self.poll_snapshots)
+
+    def load_system_info(self):
+        # Статичні дані читаються один раз; список драйверів (lsmod/WMI) — у фоні й оновлюється рідко
         cpu_model = platform.processor() or "N/A"
         self.cpu_info_label.config(text=f"CPU: {cpu_model}")
-        try:
-            cpu_freq = psutil.cpu_freq()
-            freq_text = f"{cpu_freq.current:.2f} MHz (Max: {cpu_freq.max:.2f} MHz)" if cpu_freq else "N/A"
-        except:
-            freq_text = "N/A"
-        self.cpu_freq_label.config(text=f"CPU Frequency: {freq_text}")
         ram_total = psutil.virtual_memory().total / (1024**3)
         self.ram_info_label.config(text=f"RAM: {ram_total:.2f} GB")
         gpu_info = "N/A"
-        if GPU_AVAILABLE:
-            try:
-                gpus = GPUtil.getGPUs()
-                if gpus:
-                    gpu_info = f"{gpus[0].name} ({gpus[0].memoryTotal:.1f} MB)"
-            except:
-                pass
+        if self.monitor.gpu.gpus:
+            gpu_info = ", ".join(f"{gpu.name} ({gpu.memory_total:.1f} MB)" for gpu in self.monitor.gpu.gpus)
         self.gpu_info_label.config(text=f"GPU: {gpu_info}")
         os_info = f"{platform.system()} {platform.release()} ({platform.architecture()[0]})"
         self.os_info_label.config(text=f"OS: {os_info}")
         self.reboot_tree.delete(*self.reboot_tree.get_children())
         for reboot_time in self.reboot_history:
             self.reboot_tree.insert("", "end", values=(reboot_time,))
-        self.drivers_tree.delete(*self.drivers_tree.get_children())
-        if platform.system() == "Windows" and wmi:
-            try:
-                c = wmi.WMI()
-                drivers = c.Win32_PnPSignedDriver()
-                for driver in drivers:
-                    name = driver.DeviceName or "Unknown"
-                    version = driver.DriverVersion or "N/A"
-                    status = driver.Status or "N/A"
-                    self.drivers_tree.insert("", "end", values=(name, version, status))
-            except Exception as e:
-                self.drivers_tree.insert("", "end", values=("Error retrieving drivers", str(e), "N/A"))
-        elif platform.system() == "Linux":
-            try:
-                result = subprocess.run(['lsmod'], capture_output=True, text=True)
-                modules = result.stdout.splitlines()[1:]
-                for module in modules:
-                    name = module.split()[0]
-                    self.drivers_tree.insert("", "end", values=(name, "N/A", "Loaded"))
-            except Exception as e:
-                self.drivers_tree.insert("", "end", values=("Error retrieving modules", str(e), "N/A"))
-        else:
-            self.drivers_tree.insert("", "end", values=("Driver info not fully supported", "N/A", "N/A"))
+        self._drivers_future = load_drivers()
+        # Один запланований виклик: id замінюється при кожному переплануванні, а не накопичується
+        self._system_info_after_id = self.root.after(SYSTEM_INFO_REFRESH_INTERVAL * 1000, self.load_system_info)
+
+    def _check_drivers(self):
+        if self._drivers_future is None or not self._drivers_future.done():
+            return
+        future, self._drivers_future = self._drivers_future, None
+        try:
+            drivers = future.result()
+        except Exception as e:
+            drivers = [("Error retrieving drivers", str(e), "N/A")]
+        if drivers != self._drivers:
+            self._drivers = drivers
+            self.drivers_tree.delete(*self.drivers_tree.get_children())
+            for row in drivers:
+                self.drivers_tree.insert("", "end", values=row)
+
+    def update_system_info(self):
+        # На кожному знімку — лише дешеві змінні поля
+        try:
+            cpu_freq = psutil.cpu_freq()
+            freq_text = f"{cpu_freq.current:.2f} MHz (Max: {cpu_freq.max:.2f} MHz)" if cpu_freq else "N/A"
+        except:
+            freq_text = "N/A"
+        self.cpu_freq_label.config(text=f"CPU Frequency: {freq_text}")
+
+    def update_diagnostics(self, diagnostics):
+        self.overhead_label.config(
+            text=f"Monitor process: CPU {diagnostics['cpu_percent']:.1f}% | CPU time {diagnostics['cpu_time']:.1f} s | "
+                 f"RSS {diagnostics['rss'] / (1024**2):.1f} MB | Threads {diagnostics['threads']}"
+        )
+        rows = [
+            (stage, (stage, *(f"{timings[stat] * 1000:.2f}" for stat in ('last', 'mean', 'p95', 'max')), timings['count']), ())
+            for stage, timings in diagnostics['stages'].items()
+        ]
+        self._sync_stages_tree(rows)
+
+    def _sync_stages_tree(self, rows):
+        # Оновлення лише змінених рядків, вставка/видалення різниці, перестановка — одним викликом
+        tree, state = self.stages_tree, self._stages_tree_state
+        items = state['items']
+        order = []
+        for stage, values, tags in rows:
+            entry = items.get(stage)
+            if entry is None:
+                entry = items[stage] = [tree.insert("", "end", values=values, tags=tags), values, tags]
+            elif entry[1] != values or entry[2] != tags:
+                tree.item(entry[0], values=values, tags=tags)
+                entry[1] = values
+                entry[2] = tags
+            order.append(entry[0])
+        if len(order) != len(items):
+            current = {stage for stage, _, _ in rows}
+            gone = [stage for stage in items if stage not in current]
+            tree.delete(*[items.pop(stage)[0] for stage in gone])
+        if order != state['order']:
+            tree.set_children("", *order)
+            state['order'] = order
+
+    def toggle_profiling(self):
+        diagnostics = self.monitor.diagnostics
+        if not diagnostics.profiling:
+            if diagnostics.start_profile():
+                self.profile_button.config(text="Stop Profiling")
+            else:
+                self.profile_text.delete("1.0", tk.END)
+                self.profile_text.insert(tk.END, "Profiling not started: another profiler is active")
+            return
+        filename = f"profile_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.prof"
+        report = diagnostics.stop_profile(filename)
+        self.profile_button.config(text="Start Profiling")
+        self.profile_text.delete("1.0", tk.END)
+        if os.path.exists(filename):
+            report = f"Saved to {filename}\n\n{report}"
+            setup_logging().info(f"Profile saved to {filename}")
+        self.profile_text.insert(tk.END, report)
+
+    def update_alerts(self):
+        version, active, log = self.alerts.state()
+        if version == self._alerts_version:
+            return
+        self._alerts_version = version
+        self.active_alerts_tree.delete(*self.active_alerts_tree.get_children())
+        for alert in active:
+            self.active_alerts_tree.insert(
+                "", "end", values=(alert.time.strftime("%Y-%m-%d %H:%M:%S"), alert.message, alert.recommendation), tags=('warning',)
+            )
+        if 'sysinfo' not in self._built_tabs:
+            return
         self.alert_tree.delete(*self.alert_tree.get_children())
-        for alert in self.alert_log[-10:]:
-            time_str, message = alert.split(": ", 1)
-            self.alert_tree.insert("", "end", values=(time_str, message))
+        for alert in reversed(log):
+            self.alert_tree.insert("", "end", values=(alert.time.strftime("%Y-%m-%d %H:%M:%S"), alert.message))
 
     def copy_system_info(self):
         info_text = (
@@ -487,27 +899,50 @@ class SystemMonitorGUI:
         for item in self.alert_tree.get_children():
             values = self.alert_tree.item(item, "values")
             info_text += f"{values[0]}: {values[1]}\n"
-        pyperclip.copy(info_text)
+        try:
+            import pyperclip
+            pyperclip.copy(info_text)
+        except Exception:
+            # Без pyperclip (або без системного буфера обміну для нього) — буфер обміну Tk
+            self.root.clipboard_clear()
+            self.root.clipboard_append(info_text)
         messagebox.showinfo("Success", "System information copied to clipboard!")
 
     def manual_export(self):
         from tkinter import simpledialog
-        time_range = simpledialog.askinteger("Export", "Enter time range (minutes, 0 for current data):", minvalue=0, maxvalue=60)
-        from utilities import export_data
-        filename = export_data(self, time_range if time_range else None)
-        messagebox.showinfo("Success", f"Data exported to {filename}")
+        time_range = simpledialog.askinteger("Export", "Enter time range (minutes, 0 for current data):", minvalue=0, maxvalue=7 * 24 * 60)
+        if time_range is None:
+            return
+        future = export_data(self, time_range or None, self.export_format_var.get())
+        self.pending_exports.append((future, True))
 
     def schedule_auto_export(self):
-        from utilities import export_data
-        try:
-            filename = export_data(self, time_range_minutes=5)
-            setup_logging().info(f"Auto-exported data to {filename}")
-        except Exception as e:
-            setup_logging().error(f"Error in auto_export: {e}")
+        future = export_data(self, AUTO_EXPORT_RANGE, self.export_format_var.get())
+        self.pending_exports.append((future, False))
         self.after_ids.append(self.root.after(AUTO_EXPORT_INTERVAL * 1000, self.schedule_auto_export))
 
     def on_closing(self):
         setup_logging().info("Initiating application shutdown")
+        self.monitor.remove_callback(self.snapshot_queue.put)
+        self.monitor.remove_callback(self.alerts.evaluate)
+        self.process_sampler.stop()
+        self.monitor.stop()
+        self.renderer.cancel()
+        if self.poll_after_id:
+            try:
+                self.root.after_cancel(self.poll_after_id)
+            except tk.TclError as e:
+                setup_logging().error(f"Error cancelling snapshot polling: {e}")
+            self.poll_after_id = None
+        if getattr(self, '_process_filter_after_id', None):
+            self.root.after_cancel(self._process_filter_after_id)
+            self._process_filter_after_id = None
+        if self._system_info_after_id is not None:
+            try:
+                self.root.after_cancel(self._system_info_after_id)
+            except tk.TclError as e:
+                setup_logging().error(f"Error cancelling system info refresh: {e}")
+            self._system_info_after_id = None
         for after_id in self.after_ids:
             try:
                 self.root.after_cancel(after_id)
@@ -0,0 +1,48 @@
+import numpy as np
+
+# Кільцевий буфер історії
+class RingBuffer:
+    """Fixed-capacity history of one or more series backed by a NumPy array.
+
+    Every sample is written twice (at ``head`` and ``head + capacity``) so the
+    last ``capacity`` points are always a contiguous slice; ``window()`` and
+    ``recent()`` therefore return views, never copies.
+    """
+
+    def __init__(self, capacity: int, width: int = None, dtype=np.float64):
+        self.capacity = capacity
+        self.width = width
+        shape = (2 * capacity,) if width is None else (width, 2 * capacity)
+        self._data = np.zeros(shape, dtype=dtype)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, values):
+        head = self._head
+        self._data[..., head] = values
+        self._data[..., head + self.capacity] = values
+        self._head = (head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def window(self):
+        # Усі capacity точок від найстарішої до найновішої, незаповнені — нулі
+        return self._data[..., self._head:self._head + self.capacity]
+
+    def recent(self, n: int):
+        n = min(n, self._count)
+        end = self._head + self.capacity
+        return self._data[..., end - n:end]
+
+    def latest(self):
+        if not self._count:
+            return None
+        return self._data[..., self._head + self.capacity - 1]
+
+    def clear(self):
+        self._data[...] = 0
+        self._head = 0
+        self._count = 0
@@ -1,15 +1,118 @@
-import tkinter as tk
-from gui import SystemMonitorGUI
+import argparse
+import datetime
+import signal
+from config import METRICS_HOST, METRICS_PORT
 from monitor import ResourceMonitor
 from utilities import setup_logging
 
-def main():
-    setup_logging()
+def parse_args():
+    parser = argparse.ArgumentParser(description="System resource monitor")
+    parser.add_argument('--headless', action='store_true', help="run the collector without the GUI")
+    parser.add_argument(
+        '--sink', action='append', default=[],
+        help="headless output: stdout, jsonl:<path> or store (repeatable; default: store); "
+             "every snapshot includes the monitor's own stage timings under 'diagnostics'. "
+             "Send SIGUSR1 to start and stop a cProfile capture"
+    )
+    parser.add_argument(
+        '--metrics', nargs='?', const=f'{METRICS_HOST}:{METRICS_PORT}', metavar='[HOST:]PORT',
+        help=f"serve OpenMetrics on /metrics (default address: {METRICS_HOST}:{METRICS_PORT})"
+    )
+    parser.add_argument('--record', metavar='PATH', help="record every snapshot to a trace file")
+    parser.add_argument('--replay', metavar='PATH', help="replay a recorded trace instead of monitoring this system")
+    parser.add_argument(
+        '--speed', type=float, default=1.0,
+        help="replay speed: 1 is real time, 10 is ten times faster, 0 is as fast as possible (default: 1)"
+    )
+    return parser.parse_args()
+
+def create_monitor(replay=None, speed=1.0, persist=True):
+    if not replay:
+        return ResourceMonitor(persist=persist)
+    from recording import ReplayMonitor
+    return ReplayMonitor(replay, speed)
+
+def start_recording(monitor, path):
+    if not path:
+        return None
+    from recording import TraceRecorder
+    recorder = TraceRecorder(path, monitor)
+    monitor.add_callback(recorder)
+    return recorder
+
+def start_metrics(monitor, address):
+    if not address:
+        return None
+    from metrics import MetricsExporter
+    host, _, port = address.rpartition(':')
+    exporter = MetricsExporter(host or METRICS_HOST, int(port))
+    exporter.start()
+    monitor.add_callback(exporter.update)
+    return exporter
+
+def toggle_profiling(monitor):
+    # SIGUSR1 у headless-режимі: перший сигнал починає профілювання, другий зберігає його у файл
+    diagnostics = monitor.diagnostics
+    if not diagnostics.profiling:
+        if diagnostics.start_profile():
+            setup_logging().info("Profiling started")
+        else:
+            setup_logging().error("Profiling not started: another profiler is active")
+        return
+    filename = f"profile_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.prof"
+    setup_logging().info(f"Profiling stopped, saved to {filename}\n{diagnostics.stop_profile(filename)}")
+
+def run_gui(metrics_address=None, record=None, replay=None, speed=1.0):
+    # Tk і matplotlib завантажуються лише для GUI
+    import tkinter as tk
+    from gui import SystemMonitorGUI
     root = tk.Tk()
-    monitor = ResourceMonitor()
+    monitor = create_monitor(replay, speed)
     app = SystemMonitorGUI(root, monitor)
+    exporter = start_metrics(monitor, metrics_address)
+    recorder = start_recording(monitor, record)
     monitor.start()
     app.run()
+    if exporter is not None:
+        exporter.stop()
+    if recorder is not None:
+        recorder.close()
+
+def run_headless(sink_specs, metrics_address=None, record=None, replay=None, speed=1.0):
+    from sinks import create_sink
+    from alerts import AlertEngine, default_rules
+    sink_specs = sink_specs or ['store']
+    monitor = create_monitor(replay, speed, persist='store' in sink_specs)
+    sinks = [create_sink(spec) for spec in sink_specs if spec != 'store']
+    for sink in sinks:
+        monitor.add_callback(sink)
+    alerts = AlertEngine(default_rules())
+    alerts.add_listener(lambda alert: setup_logging().warning(f"{alert.message}. {alert.recommendation}"))
+    monitor.add_callback(alerts.evaluate)
+    exporter = start_metrics(monitor, metrics_address)
+    recorder = start_recording(monitor, record)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: monitor.stop_event.set())
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, lambda *_: toggle_profiling(monitor))
+    monitor.start()
+    while not monitor.stop_event.wait(1):
+        pass
+    monitor.stop()
+    if exporter is not None:
+        exporter.stop()
+    if recorder is not None:
+        recorder.close()
+    for sink in sinks:
+        sink.close()
+
+def main():
+    args = parse_args()
+    setup_logging()
+    if args.headless:
+        run_headless(args.sink, args.metrics, args.record, args.replay, args.speed)
+    else:
+        run_gui(args.metrics, args.record, args.replay, args.speed)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,179 @@
+import gzip
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import METRICS_HOST, METRICS_PORT
+from utilities import setup_logging
+
+# Експорт метрик у форматі OpenMetrics (Prometheus)
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _number(value):
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+def _family(lines, name, help_text, samples):
+    lines.append(f"# TYPE {name} gauge")
+    lines.append(f"# HELP {name} {help_text}")
+    for labels, value in samples:
+        if value is None:
+            continue
+        if labels:
+            label_text = ','.join(f'{key}="{_escape(item)}"' for key, item in labels.items())
+            lines.append(f"{name}{{{label_text}}} {_number(value)}")
+        else:
+            lines.append(f"{name} {_number(value)}")
+
+
+def _celsius(text):
+    # SMART віддає температуру рядком "42°C" або "N/A"
+    return float(text[:-2]) if text.endswith("°C") else None
+
+
+def render_openmetrics(snapshot: dict):
+    lines = []
+    total_cpu, cpu_percent = snapshot['cpu']
+    _family(lines, 'sysmon_cpu_usage_percent', "CPU usage per core.",
+            [({'core': str(i)}, percent) for i, percent in enumerate(cpu_percent)])
+    _family(lines, 'sysmon_cpu_total_usage_percent', "Total CPU usage.", [({}, total_cpu)])
+
+    ram = snapshot['ram']
+    _family(lines, 'sysmon_memory_usage_percent', "RAM usage.", [({}, ram.percent)])
+    _family(lines, 'sysmon_memory_used_bytes', "Used RAM.", [({}, ram.used)])
+    _family(lines, 'sysmon_memory_total_bytes', "Total RAM.", [({}, ram.total)])
+
+    gpus = snapshot['gpu'] or ()
+    gpu_labels = [({'gpu': str(gpu.index), 'name': gpu.name}, gpu) for gpu in gpus]
+    _family(lines, 'sysmon_gpu_utilization_percent', "GPU utilization.", [(labels, gpu.usage) for labels, gpu in gpu_labels])
+    _family(lines, 'sysmon_gpu_memory_used_bytes', "Used GPU memory.",
+            [(labels, gpu.memory_used * 1024 * 1024) for labels, gpu in gpu_labels])
+    _family(lines, 'sysmon_gpu_memory_total_bytes', "Total GPU memory.",
+            [(labels, gpu.memory_total * 1024 * 1024) for labels, gpu in gpu_labels])
+    _family(lines, 'sysmon_gpu_temperature_celsius', "GPU temperature.", [(labels, gpu.temperature) for labels, gpu in gpu_labels])
+
+    _, read_speed, write_speed, _, _ = snapshot['disk']
+    disks = snapshot.get('disks', {})
+    _family(lines, 'sysmon_disk_read_bytes_per_second', "Disk read rate, all whole disks.", [({}, read_speed * 1024 * 1024)])
+    _family(lines, 'sysmon_disk_write_bytes_per_second', "Disk write rate, all whole disks.", [({}, write_speed * 1024 * 1024)])
+    _family(lines, 'sysmon_disk_device_read_bytes_per_second', "Disk read rate per device.",
+            [({'device': name}, rates[0] * 1024 * 1024) for name, rates in disks.items()])
+    _family(lines, 'sysmon_disk_device_write_bytes_per_second', "Disk write rate per device.",
+            [({'device': name}, rates[1] * 1024 * 1024) for name, rates in disks.items()])
+
+    filesystems = [
+        ({'mountpoint': fs.mountpoint, 'device': fs.device, 'fstype': fs.fstype}, fs) for fs in snapshot.get('filesystems', ())
+    ]
+    _family(lines, 'sysmon_filesystem_size_bytes', "Filesystem size.", [(labels, fs.total) for labels, fs in filesystems])
+    _family(lines, 'sysmon_filesystem_free_bytes', "Filesystem free space.", [(labels, fs.free) for labels, fs in filesystems])
+    _family(lines, 'sysmon_filesystem_usage_percent', "Filesystem usage.", [(labels, fs.percent) for labels, fs in filesystems])
+
+    drives = [({'device': drive.device, 'model': drive.model}, drive) for drive in snapshot.get('smart', ())]
+    _family(lines, 'sysmon_smart_temperature_celsius', "Drive temperature reported by SMART.",
+            [(labels, _celsius(drive.temperature)) for labels, drive in drives])
+    _family(lines, 'sysmon_smart_healthy', "1 if the SMART overall health check passed, 0 otherwise.",
+            [(labels, None if drive.health == "N/A" else int(drive.health == "OK")) for labels, drive in drives])
+
+    download_speed, upload_speed = snapshot['network']
+    nics = snapshot.get('nics', {})
+    _family(lines, 'sysmon_network_receive_bits_per_second', "Network receive rate, all interfaces.",
+            [({}, download_speed * 1024 * 1024)])
+    _family(lines, 'sysmon_network_transmit_bits_per_second', "Network transmit rate, all interfaces.",
+            [({}, upload_speed * 1024 * 1024)])
+    _family(lines, 'sysmon_network_interface_receive_bits_per_second', "Network receive rate per interface.",
+            [({'interface': name}, rates[0] * 1024 * 1024) for name, rates in nics.items()])
+    _family(lines, 'sysmon_network_interface_transmit_bits_per_second', "Network transmit rate per interface.",
+            [({'interface': name}, rates[1] * 1024 * 1024) for name, rates in nics.items()])
+
+    # Власні витрати монітора
+    diagnostics = snapshot.get('diagnostics')
+    if diagnostics:
+        _family(lines, 'sysmon_self_cpu_usage_percent', "CPU usage of the monitor process.", [({}, diagnostics['cpu_percent'])])
+        _family(lines, 'sysmon_self_resident_memory_bytes', "Resident memory of the monitor process.", [({}, diagnostics['rss'])])
+        _family(lines, 'sysmon_self_threads', "Threads of the monitor process.", [({}, diagnostics['threads'])])
+        _family(lines, 'sysmon_self_stage_duration_seconds', "Duration of the monitor's own stages over the recent window.",
+                [({'stage': stage, 'stat': stat}, timings[stat])
+                 for stage, timings in diagnostics['stages'].items() for stat in ('last', 'mean', 'p95', 'max')])
+
+    _family(lines, 'sysmon_uptime_seconds', "Time since boot.", [({}, snapshot['uptime'][0])])
+    _family(lines, 'sysmon_sample_timestamp_seconds', "Wall-clock time the sample was taken.", [({}, snapshot['timestamp'])])
+    lines.append("# EOF\n")
+    return '\n'.join(lines).encode('utf-8')
+
+
+class MetricsExporter:
+    """Serves the latest monitor snapshot over HTTP in OpenMetrics text format.
+
+    Register ``update`` as a ``ResourceMonitor`` callback: each snapshot is
+    rendered once, on the monitor thread, and every scrape until the next one
+    just writes the cached bytes (a gzip copy is made on the first request
+    that accepts it).
+    """
+
+    def __init__(self, host: str = METRICS_HOST, port: int = METRICS_PORT):
+        self.host = host
+        self.port = port
+        self._body = None
+        self._gzipped = None
+        self._lock = threading.Lock()
+        self._server = None
+
+    def update(self, snapshot: dict):
+        body = render_openmetrics(snapshot)
+        with self._lock:
+            self._body = body
+            self._gzipped = None
+
+    def payload(self, gzipped: bool = False):
+        with self._lock:
+            if not gzipped or self._body is None:
+                return self._body
+            if self._gzipped is None:
+                self._gzipped = gzip.compress(self._body, compresslevel=1)
+            return self._gzipped
+
+    def start(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+                body = exporter.payload(gzipped)
+                if body is None:
+                    self.send_error(503, "No sample collected yet")
+                    return
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+                if gzipped:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        setup_logging().info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -1,206 +1,375 @@
 import psutil
 import threading
 import time
-import os
-import sys
-import subprocess
-import platform
 from typing import Callable
-from config import UPDATE_INTERVAL, MAX_HISTORY
+import numpy as np
+from config import (
+    UPDATE_INTERVAL, MAX_HISTORY, HISTORY_DIR, HISTORY_SEGMENT_ROWS, HISTORY_MAX_SEGMENTS, HISTORY_ROLLUPS,
+    COLLECTOR_INTERVALS, COLLECTOR_DEADLINES
+)
+from collectors import Collector, CollectorScheduler, next_deadline
+from devices import CounterRates, whole_disks, physical_disks, physical_nics, filesystem_usage
+from diagnostics import Diagnostics
+from gpu import GPUCollector
+from history import RingBuffer
+from smart import SmartMonitor, summarize
+from storage import MultiResolutionStore, bin_mean
 from utilities import setup_logging
 
-try:
-    import GPUtil
-    GPU_AVAILABLE = True
-except ImportError:
-    GPU_AVAILABLE = False
-
-try:
-    from pySMART import Device
-    SMART_AVAILABLE = True
-except ImportError:
-    SMART_AVAILABLE = False
-
 class ResourceMonitor:
-    def __init__(self):
+    def __init__(self, persist: bool = True, gpu=None, cpu_count: int = None):
         self.update_interval = UPDATE_INTERVAL
         self.stop_event = threading.Event()
         self.max_history = MAX_HISTORY
-        self.cpu_usage_history = [[] for _ in range(psutil.cpu_count())]
-        self.ram_usage_history = []
-        self.gpu_usage_history = []
-        self.gpu_memory_history = []
-        self.gpu_temp_history = []
-        self.gpu_temp_min = float('inf') if GPU_AVAILABLE else None
-        self.gpu_temp_max = float('-inf') if GPU_AVAILABLE else None
-        self.disk_io_history_read = []
-        self.disk_io_history_write = []
-        self.net_download_history = []
-        self.net_upload_history = []
-        self.last_read_bytes = 0
-        self.last_write_bytes = 0
-        self.last_bytes_sent = 0
-        self.last_bytes_recv = 0
-        self.smartctl_path = self._get_smartctl_path()
-        self.callback: Callable[[dict], None] = None
-
-    def _get_smartctl_path(self):
-        if getattr(sys, 'frozen', False):
-            base_path = os.path.dirname(sys.executable)
-            return os.path.join(base_path, 'smartctl.exe')
-        return r"C:\Program Files\gsmartcontrol\smartctl.exe"
-
-    def set_callback(self, callback: Callable[[dict], None]):
-        self.callback = callback
+        # Для відтворення запису кількість ядер і GPU береться із запису, а не з поточної машини
+        self.cpu_count = cpu_count or psutil.cpu_count()
+        self.cpu_usage_history = RingBuffer(MAX_HISTORY, self.cpu_count)
+        self.ram_usage_history = RingBuffer(MAX_HISTORY)
+        self.gpu = gpu or GPUCollector(interval=COLLECTOR_INTERVALS['gpu'])
+        gpu_count = max(1, len(self.gpu.gpus))
+        self.gpu_usage_history = RingBuffer(MAX_HISTORY, gpu_count)
+        self.gpu_memory_history = RingBuffer(MAX_HISTORY, gpu_count)
+        self.gpu_temp_history = RingBuffer(MAX_HISTORY, gpu_count)
+        self.disk_io_history = RingBuffer(MAX_HISTORY, 2)
+        self.net_history = RingBuffer(MAX_HISTORY, 2)
+        # Історія кожного диска та мережевого інтерфейсу (створюється при першій появі пристрою)
+        self.disk_device_history: dict[str, RingBuffer] = {}
+        self.nic_history: dict[str, RingBuffer] = {}
+        self.disk_rates = CounterRates(('read_bytes', 'write_bytes'))
+        self.nic_rates = CounterRates(('bytes_recv', 'bytes_sent'))
+        self._whole_disks = ((), np.zeros(0, dtype=bool))
+        self.stored_disks = physical_disks()
+        self.stored_nics = physical_nics()
+        self.smart = SmartMonitor()
+        self.history_columns = (
+            ['cpu_total'] + [f'cpu_{i}' for i in range(self.cpu_count)] +
+            ['ram', 'gpu_usage', 'gpu_memory', 'gpu_temp'] +
+            [f'gpu{gpu.index}_{metric}' for gpu in self.gpu.gpus for metric in ('usage', 'memory', 'temp')] +
+            ['disk_read', 'disk_write', 'net_download', 'net_upload'] +
+            [f'disk_{name}_{metric}' for name in self.stored_disks for metric in ('read', 'write')] +
+            [f'net_{name}_{metric}' for name in self.stored_nics for metric in ('download', 'upload')]
+        )
+        self.history_store = self._open_history_store() if persist else None
+        self.callbacks: list[Callable[[dict], None]] = []
+        # Тривалість власних етапів монітора (збирачі, історія, слухачі) і рендерингу GUI
+        self.diagnostics = Diagnostics()
+        self.scheduler = None
+        self._latest = {}
+        self._latest_lock = threading.Lock()
+        self._thread = None
+
+    def _open_history_store(self):
+        try:
+            return MultiResolutionStore(
+                HISTORY_DIR, self.history_columns, HISTORY_SEGMENT_ROWS, HISTORY_MAX_SEGMENTS, HISTORY_ROLLUPS
+            )
+        except OSError as e:
+            setup_logging().error(f"History store disabled: {e}")
+            return None
+
+    def add_callback(self, callback: Callable[[dict], None]):
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[dict], None]):
+        if callback in self.callbacks:
+            self.callbacks.remove(callback)
+
+    def _publish(self, snapshot: dict):
+        for callback in list(self.callbacks):
+            try:
+                with self.diagnostics.measure(f"callback.{getattr(callback, '__qualname__', type(callback).__name__)}"):
+                    callback(snapshot)
+            except Exception as e:
+                setup_logging().error(f"Error in ResourceMonitor callback {callback!r}: {e}")
 
     def start(self):
-        threading.Thread(target=self._monitor, daemon=True).start()
+        self.gpu.start()
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+        self._thread.start()
+
+    def _create_collectors(self):
+        # Кожне джерело має власний інтервал і дедлайн (config.COLLECTOR_INTERVALS)
+        sources = {
+            'cpu': self._collect_cpu,
+            'ram': self._collect_ram,
+            'gpu': self._collect_gpu,
+            'disk': self._collect_disk,
+            'filesystems': self._collect_filesystems,
+            'smart': self._collect_smart,
+            'network': self._collect_network,
+            'uptime': self._collect_uptime
+        }
+        return [
+            Collector(name, self.diagnostics.timed(f'collect.{name}', func), COLLECTOR_INTERVALS[name], COLLECTOR_DEADLINES.get(name))
+            for name, func in sources.items()
+        ]
+
+    def _store_result(self, name, value):
+        with self._latest_lock:
+            self._latest[name] = value
 
     def _monitor(self):
+        self.scheduler = CollectorScheduler(self._create_collectors(), self._store_result)
+        next_publish = time.monotonic() + self.update_interval
         while not self.stop_event.is_set():
-            try:
-                # CPU
-                cpu_percent = psutil.cpu_percent(percpu=True)
-                total_cpu = psutil.cpu_percent()
-                self._update_cpu_history(cpu_percent)
-
-                # RAM
-                ram = psutil.virtual_memory()
-                self._update_ram_history(ram)
-
-                # GPU
-                gpu_data = None
-                if GPU_AVAILABLE:
-                    gpus = GPUtil.getGPUs()
-                    if gpus:
-                        gpu = gpus[0]
-                        gpu_usage = gpu.load * 100
-                        gpu_memory_used = gpu.memoryUsed
-                        gpu_memory_total = gpu.memoryTotal
-                        gpu_memory_percent = (gpu_memory_used / gpu_memory_total) * 100
-                        gpu_temp = gpu.temperature
-                        self.gpu_temp_min = min(self.gpu_temp_min, gpu_temp)
-                        self.gpu_temp_max = max(self.gpu_temp_max, gpu_temp)
-                        self._update_gpu_history(gpu_usage, gpu_memory_percent, gpu_temp)
-                        gpu_data = (gpu_usage, gpu_memory_used, gpu_memory_total, gpu_memory_percent, gpu_temp, self.gpu_temp_min, self.gpu_temp_max)
-
-                # Disk
-                disk = psutil.disk_usage('/')
-                io = psutil.disk_io_counters()
-                disk_temp, disk_health = self._get_smart_data()
-                read_speed = (io.read_bytes - self.last_read_bytes) / (1024 * 1024) if io else 0
-                write_speed = (io.write_bytes - self.last_write_bytes) / (1024 * 1024) if io else 0
-                self.last_read_bytes = io.read_bytes if io else 0
-                self.last_write_bytes = io.write_bytes if io else 0
-                self._update_disk_history(read_speed, write_speed)
-
-                # Network
-                net_io = psutil.net_io_counters()
-                download_speed = (net_io.bytes_recv - self.last_bytes_recv) * 8 / (1024 * 1024)
-                upload_speed = (net_io.bytes_sent - self.last_bytes_sent) * 8 / (1024 * 1024)
-                self.last_bytes_recv = net_io.bytes_recv
-                self.last_bytes_sent = net_io.bytes_sent
-                self._update_network_history(download_speed, upload_speed)
-
-                # Uptime
-                uptime_seconds = int(time.time() - psutil.boot_time())
-                days, remainder = divmod(uptime_seconds, 86400)
-                hours, remainder = divmod(remainder, 3600)
-                minutes, seconds = divmod(remainder, 60)
-
-                # Передача даних у GUI cetology
-                if self.callback:
-                    self.callback({
-                        'cpu': (total_cpu, cpu_percent),
-                        'ram': ram,
-                        'gpu': gpu_data,
-                        'disk': (disk, read_speed, write_speed, disk_temp, disk_health),
-                        'network': (download_speed, upload_speed),
-                        'uptime': (uptime_seconds, days, hours, minutes)
-                    })
-            except Exception as e:
-                setup_logging().error(f"Error in ResourceMonitor: {e}")
-            time.sleep(self.update_interval)
+            now = time.monotonic()
+            next_due = self.scheduler.dispatch(now)
+            if now >= next_publish:
+                next_publish = next_deadline(next_publish, self.update_interval, now)
+                try:
+                    self._publish_sample()
+                except Exception as e:
+                    setup_logging().error(f"Error in ResourceMonitor: {e}")
+            self.stop_event.wait(max(0.0, min(next_due, next_publish) - time.monotonic()))
+        self.scheduler.shutdown()
+        self.smart.shutdown()
+
+    def _publish_sample(self):
+        with self._latest_lock:
+            latest = dict(self._latest)
+        # Публікуємо лише коли кожне обов'язкове джерело вже дало хоча б один результат
+        if not all(name in latest for name in ('cpu', 'ram', 'gpu', 'disk', 'network', 'uptime')):
+            return
+        disk, read_speed, write_speed, disks = latest['disk']
+        drives = latest.get('smart', ())
+        disk_temp, disk_health = summarize(drives)
+        download_speed, upload_speed, nics = latest['network']
+        self._ingest({
+            'timestamp': time.time(),
+            'monotonic': time.monotonic(),
+            'cpu': latest['cpu'],
+            'ram': latest['ram'],
+            'gpu': latest['gpu'],
+            'disk': (disk, read_speed, write_speed, disk_temp, disk_health),
+            'disks': disks,
+            'filesystems': latest.get('filesystems', ()),
+            'smart': drives,
+            'network': (download_speed, upload_speed),
+            'nics': nics,
+            'uptime': latest['uptime']
+        })
+
+    def _ingest(self, snapshot: dict):
+        # Оновлення історії, запис у сховище та передача знімка слухачам (спільне для живих даних і відтворення)
+        total_cpu, cpu_percent = snapshot['cpu']
+        ram = snapshot['ram']
+        gpu_data = snapshot['gpu']
+        _, read_speed, write_speed, _, _ = snapshot['disk']
+        download_speed, upload_speed = snapshot['network']
+        disks, nics = snapshot['disks'], snapshot['nics']
+
+        with self.diagnostics.measure('publish.history'):
+            self._update_cpu_history(cpu_percent)
+            self._update_ram_history(ram)
+            if gpu_data:
+                self._update_gpu_history(gpu_data)
+            self._update_disk_history(read_speed, write_speed, disks)
+            self._update_network_history(download_speed, upload_speed, nics)
+            self._record_sample(
+                snapshot['timestamp'], total_cpu, cpu_percent, ram, gpu_data, read_speed, write_speed, download_speed, upload_speed,
+                disks, nics
+            )
+        # Власні витрати монітора (для відтворення — процесу, що відтворює запис)
+        with self.diagnostics.measure('publish.diagnostics'):
+            snapshot['diagnostics'] = self.diagnostics.summary()
+
+        # Передача даних у GUI cetology
+        self._publish(snapshot)
+
+    # CPU
+    def _collect_cpu(self):
+        cpu_percent = psutil.cpu_percent(percpu=True)
+        total_cpu = psutil.cpu_percent()
+        return total_cpu, cpu_percent
+
+    # RAM
+    def _collect_ram(self):
+        return psutil.virtual_memory()
+
+    # GPU
+    def _collect_gpu(self):
+        # Кортеж GPUSample для кожного GPU; порожній, якщо nvidia-smi недоступний
+        return self.gpu.sample()
+
+    # Disk
+    def _collect_disk(self):
+        disk = psutil.disk_usage('/')
+        names, rates = self.disk_rates.update(psutil.disk_io_counters(perdisk=True) or {}, time.monotonic())
+        if self._whole_disks[0] != names:
+            self._whole_disks = (names, whole_disks(names))
+        rates = rates / (1024 * 1024)
+        # Сумарні значення лише по цілих дисках, щоб розділи не враховувались двічі
+        read_speed, write_speed = rates[self._whole_disks[1]].sum(axis=0) if len(names) else (0.0, 0.0)
+        return disk, float(read_speed), float(write_speed), dict(zip(names, map(tuple, rates.tolist())))
+
+    def _collect_filesystems(self):
+        return filesystem_usage()
+
+    def _collect_smart(self):
+        return self.smart.refresh()
+
+    # Network
+    def _collect_network(self):
+        names, rates = self.nic_rates.update(psutil.net_io_counters(pernic=True), time.monotonic())
+        rates = rates * 8 / (1024 * 1024)
+        download_speed, upload_speed = rates.sum(axis=0) if len(names) else (0.0, 0.0)
+        return float(download_speed), float(upload_speed), dict(zip(names, map(tuple, rates.tolist())))
+
+    # Uptime
+    def _collect_uptime(self):
+        uptime_seconds = int(time.time() - psutil.boot_time())
+        days, remainder = divmod(uptime_seconds, 86400)
+        hours, remainder = divmod(remainder, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return uptime_seconds, days, hours, minutes
 
     def _update_cpu_history(self, cpu_percent):
-        for i, percent in enumerate(cpu_percent):
-            self.cpu_usage_history[i].append(percent)
-            if len(self.cpu_usage_history[i]) > self.max_history:
-                self.cpu_usage_history[i].pop(0)
+        self.cpu_usage_history.append(cpu_percent)
 
     def _update_ram_history(self, ram):
         self.ram_usage_history.append(ram.percent)
-        if len(self.ram_usage_history) > self.max_history:
-            self.ram_usage_history.pop(0)
-
-    def _update_gpu_history(self, gpu_usage, gpu_memory_percent, gpu_temp):
-        self.gpu_usage_history.append(gpu_usage)
-        self.gpu_memory_history.append(gpu_memory_percent)
-        self.gpu_temp_history.append(gpu_temp)
-        if len(self.gpu_usage_history) > self.max_history:
-            self.gpu_usage_history.pop(0)
-            self.gpu_memory_history.pop(0)
-            self.gpu_temp_history.pop(0)
-
-    def _update_disk_history(self, read_speed, write_speed):
-        self.disk_io_history_read.append(read_speed)
-        self.disk_io_history_write.append(write_speed)
-        if len(self.disk_io_history_read) > self.max_history:
-            self.disk_io_history_read.pop(0)
-            self.disk_io_history_write.pop(0)
-
-    def _update_network_history(self, download_speed, upload_speed):
-        self.net_download_history.append(download_speed)
-        self.net_upload_history.append(upload_speed)
-        if len(self.net_download_history) > self.max_history:
-            self.net_download_history.pop(0)
-            self.net_upload_history.pop(0)
-
-    def _get_smart_data(self):
-        disk_temp = disk_health = "N/A"
-        if platform.system() == "Windows":
-            try:
-                cmd = [self.smartctl_path, '-A', '-d', 'nvme', '/dev/sda']
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=5)
-                for line in result.stdout.splitlines():
-                    if "Temperature:" in line:
-                        temp_value = [word for word in line.split() if word.isdigit()]
-                        disk_temp = temp_value[0] + "°C" if temp_value else "N/A"
-                        break
-                cmd = [self.smartctl_path, '-H', '-d', 'nvme', '/dev/sda']
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=5)
-                disk_health = "OK" if "PASSED" in result.stdout else "Warning"
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                pass
-        elif platform.system() == "Linux" and SMART_AVAILABLE:
-            try:
-                disk_device = Device('/dev/sda')
-                disk_temp = str(disk_device.temperature) + "°C" if disk_device.temperature else "N/A"
-                disk_health = disk_device.health if disk_device.health else "N/A"
-            except Exception:
-                pass
-        return disk_temp, disk_health
+
+    def _update_gpu_history(self, gpu_data):
+        self.gpu_usage_history.append([gpu.usage for gpu in gpu_data])
+        self.gpu_memory_history.append([gpu.memory_percent for gpu in gpu_data])
+        self.gpu_temp_history.append([gpu.temperature for gpu in gpu_data])
+
+    def _update_disk_history(self, read_speed, write_speed, disks):
+        self.disk_io_history.append((read_speed, write_speed))
+        self._update_device_history(self.disk_device_history, disks)
+
+    def _update_network_history(self, download_speed, upload_speed, nics):
+        self.net_history.append((download_speed, upload_speed))
+        self._update_device_history(self.nic_history, nics)
+
+    def _update_device_history(self, histories, rates):
+        for name, values in rates.items():
+            history = histories.get(name)
+            if history is None:
+                history = histories[name] = RingBuffer(MAX_HISTORY, 2)
+            history.append(values)
+
+    def _record_sample(self, timestamp, total_cpu, cpu_percent, ram, gpu_data, read_speed, write_speed, download_speed, upload_speed,
+                       disks, nics):
+        if self.history_store is None:
+            return
+        # Зведені значення (середнє завантаження і пам'ять, максимальна температура) та окремо кожен GPU
+        if gpu_data:
+            usage = np.array([gpu.usage for gpu in gpu_data])
+            memory = np.array([gpu.memory_percent for gpu in gpu_data])
+            temperature = np.array([gpu.temperature for gpu in gpu_data])
+            gpu_values = [
+                np.nanmean(usage) if not np.isnan(usage).all() else np.nan,
+                np.nanmean(memory) if not np.isnan(memory).all() else np.nan,
+                np.nanmax(temperature) if not np.isnan(temperature).all() else np.nan
+            ] + [value for gpu in gpu_data for value in (gpu.usage, gpu.memory_percent, gpu.temperature)]
+        else:
+            gpu_values = [np.nan] * (3 + 3 * len(self.gpu.gpus))
+        missing = (np.nan, np.nan)
+        device_values = (
+            [value for name in self.stored_disks for value in disks.get(name, missing)] +
+            [value for name in self.stored_nics for value in nics.get(name, missing)]
+        )
+        self.history_store.append(timestamp, [
+            total_cpu, *cpu_percent, ram.percent, *gpu_values, read_speed, write_speed, download_speed, upload_speed,
+            *device_values
+        ])
 
     def stop(self):
         self.stop_event.set()
+        self.gpu.stop()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=10)
+        if self.history_store is not None:
+            self.history_store.close()
+
+    # Запити до постійного сховища за довільний проміжок часу
+    # points задає потрібну детальність: береться найгрубший рівень агрегації, що її забезпечує
+    def query_history(self, start: float, end: float, columns=None, points: int = None):
+        if self.history_store is None:
+            return np.empty(0), np.empty((0, len(columns or self.history_columns)))
+        return self.history_store.query(start, end, columns, points)
+
+    def iter_history(self, start: float, end: float, columns=None):
+        # Сирі записи посегментно, без завантаження всього проміжку в пам'ять
+        if self.history_store is None:
+            return iter(())
+        return self.history_store.iter_chunks(start, end, columns)
+
+    def average_history(self, start: float, end: float, columns=None, points: int = MAX_HISTORY):
+        if self.history_store is None:
+            return [None] * len(columns or self.history_columns)
+        return self.history_store.average(start, end, columns, points)
+
+    def get_range_history(self, seconds: float, points: int = MAX_HISTORY):
+        end = time.time()
+        start = end - seconds
+        times, values = self.query_history(start, end, points=points)
+        binned = bin_mean(times, values, start, seconds / points, points)
+        column = {name: i for i, name in enumerate(self.history_columns)}
+        cores = self.cpu_count
 
+        def per_gpu(metric):
+            # Рядок на кожен GPU, як у живій історії
+            if not self.gpu.gpus:
+                return binned[[column[f'gpu_{metric}']]]
+            return binned[[column[f'gpu{gpu.index}_{metric}'] for gpu in self.gpu.gpus]]
+
+        return {
+            'cpu': binned[column['cpu_0']:column['cpu_0'] + cores],
+            'ram': binned[column['ram']],
+            'gpu_usage': per_gpu('usage'),
+            'gpu_memory': per_gpu('memory'),
+            'gpu_temp': per_gpu('temp'),
+            'disk': (binned[column['disk_read']], binned[column['disk_write']]),
+            'network': (binned[column['net_download']], binned[column['net_upload']]),
+            'disks': {
+                name: binned[[column[f'disk_{name}_read'], column[f'disk_{name}_write']]] for name in self.stored_disks
+            },
+            'nics': {
+                name: binned[[column[f'net_{name}_download'], column[f'net_{name}_upload']]] for name in self.stored_nics
+            }
+        }
+
+    # Доступ до історії: упорядковані представлення без копіювання
     def get_cpu_history(self):
-        return self.cpu_usage_history
+        return self.cpu_usage_history.window()
 
     def get_ram_history(self):
-        return self.ram_usage_history
+        return self.ram_usage_history.window()
 
     def get_gpu_usage_history(self):
-        return self.gpu_usage_history
+        return self.gpu_usage_history.window()
 
     def get_gpu_memory_history(self):
-        return self.gpu_memory_history
+        return self.gpu_memory_history.window()
 
     def get_gpu_temp_history(self):
-        return self.gpu_temp_history
+        return self.gpu_temp_history.window()
 
     def get_disk_io_history(self):
-        return self.disk_io_history_read, self.disk_io_history_write
+        read, write = self.disk_io_history.window()
+        return read, write
 
     def get_network_history(self):
-        return self.net_download_history, self.net_upload_history
\ No newline at end of file
+        download, upload = self.net_history.window()
+        return download, upload
+
+    def get_disk_device_history(self):
+        return {name: history.window() for name, history in self.disk_device_history.items()}
+
+    def get_nic_history(self):
+        return {name: history.window() for name, history in self.nic_history.items()}
+
+    def get_live_history(self):
+        return {
+            'cpu': self.get_cpu_history(),
+            'ram': self.get_ram_history(),
+            'gpu_usage': self.get_gpu_usage_history(),
+            'gpu_memory': self.get_gpu_memory_history(),
+            'gpu_temp': self.get_gpu_temp_history(),
+            'disk': self.get_disk_io_history(),
+            'network': self.get_network_history(),
+            'disks': self.get_disk_device_history(),
+            'nics': self.get_nic_history()
+        }
@@ -0,0 +1,152 @@
+import os
+import socket
+import struct
+import sys
+import time
+
+# Облік мережевого трафіку процесів (Linux, sock_diag)
+NET_ACCOUNTING_AVAILABLE = sys.platform.startswith('linux')
+
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+INET_DIAG_INFO = 2
+_NLMSG_HEADER = struct.Struct('=IHHII')
+_RTATTR_HEADER = struct.Struct('=HH')
+# У struct inet_diag_msg поле idiag_inode має зсув 68, розмір структури — 72 байти
+_INET_DIAG_MSG_INODE = 68
+_INET_DIAG_MSG_SIZE = 72
+# struct tcp_info: tcpi_bytes_acked (зсув 120) і tcpi_bytes_received (зсув 128), ядро >= 4.2
+_TCP_INFO_BYTES = struct.Struct('=QQ')
+_TCP_INFO_BYTES_OFFSET = 120
+
+
+def _dump_tcp_counters(family, result):
+    request = struct.pack('=BBBBI', family, socket.IPPROTO_TCP, 1 << (INET_DIAG_INFO - 1), 0, 0xFFFFFFFF) + bytes(48)
+    header = _NLMSG_HEADER.pack(_NLMSG_HEADER.size + len(request), SOCK_DIAG_BY_FAMILY, NLM_F_REQUEST | NLM_F_DUMP, 1, 0)
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_SOCK_DIAG) as sock:
+        sock.send(header + request)
+        while True:
+            data = sock.recv(1 << 16)
+            offset = 0
+            while offset + _NLMSG_HEADER.size <= len(data):
+                length, msg_type, _, _, _ = _NLMSG_HEADER.unpack_from(data, offset)
+                if msg_type == NLMSG_DONE:
+                    return
+                if msg_type == NLMSG_ERROR or length < _NLMSG_HEADER.size:
+                    raise OSError("sock_diag dump failed")
+                body = offset + _NLMSG_HEADER.size
+                end = offset + length
+                inode, = struct.unpack_from('=I', data, body + _INET_DIAG_MSG_INODE)
+                attr = body + _INET_DIAG_MSG_SIZE
+                while inode and attr + _RTATTR_HEADER.size <= end:
+                    attr_len, attr_type = _RTATTR_HEADER.unpack_from(data, attr)
+                    if attr_len < _RTATTR_HEADER.size:
+                        break
+                    payload = attr_len - _RTATTR_HEADER.size
+                    if attr_type == INET_DIAG_INFO and payload >= _TCP_INFO_BYTES_OFFSET + _TCP_INFO_BYTES.size:
+                        acked, received = _TCP_INFO_BYTES.unpack_from(data, attr + _RTATTR_HEADER.size + _TCP_INFO_BYTES_OFFSET)
+                        result[inode] = (received, acked)
+                    attr += (attr_len + 3) & ~3
+                offset += (length + 3) & ~3
+
+
+def tcp_socket_counters():
+    """Return ``{socket inode: (bytes_received, bytes_acked)}`` for all TCP sockets."""
+    result = {}
+    for family in (socket.AF_INET, socket.AF_INET6):
+        _dump_tcp_counters(family, result)
+    return result
+
+
+class SocketIndex:
+    """Cached socket inode -> PID map built from ``/proc/<pid>/fd``.
+
+    New PIDs are scanned as they appear and exited PIDs are dropped. Known
+    PIDs are rescanned only when the kernel reports sockets the index
+    cannot attribute, and at most once per ``rescan_interval`` seconds.
+    """
+
+    def __init__(self, rescan_interval: float = 10.0):
+        self.rescan_interval = rescan_interval
+        self._owner = {}
+        self._inodes = {}
+        self._last_rescan = 0.0
+
+    def get(self, inode):
+        return self._owner.get(inode)
+
+    def update(self, pids, inodes):
+        pids = set(pids)
+        for pid in self._inodes.keys() - pids:
+            self._forget(pid)
+        for pid in pids - self._inodes.keys():
+            self._scan(pid)
+        unknown = any(inode not in self._owner for inode in inodes)
+        now = time.monotonic()
+        if unknown and now - self._last_rescan >= self.rescan_interval:
+            self._last_rescan = now
+            for pid in pids:
+                self._scan(pid)
+
+    def _forget(self, pid):
+        for inode in self._inodes.pop(pid, ()):
+            if self._owner.get(inode) == pid:
+                del self._owner[inode]
+
+    def _scan(self, pid):
+        self._forget(pid)
+        inodes = set()
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            for fd in os.listdir(fd_dir):
+                try:
+                    target = os.readlink(f"{fd_dir}/{fd}")
+                except OSError:
+                    continue
+                if target.startswith('socket:['):
+                    inodes.add(int(target[8:-1]))
+        except OSError:
+            pass
+        self._inodes[pid] = inodes
+        for inode in inodes:
+            self._owner[inode] = pid
+
+
+class ProcessNetAccounting:
+    """Per-process TCP throughput from kernel per-socket byte counters.
+
+    Each ``sample`` dumps ``tcp_info`` for every socket via ``sock_diag``,
+    attributes sockets to PIDs through ``SocketIndex`` and returns
+    ``{pid: (download_bytes_per_s, upload_bytes_per_s)}`` over the time
+    since the previous sample. Only processes owning TCP sockets appear.
+    """
+
+    def __init__(self):
+        self.index = SocketIndex()
+        self._last_counters = None
+        self._last_time = None
+
+    def sample(self, pids):
+        counters = tcp_socket_counters()
+        now = time.monotonic()
+        self.index.update(pids, counters.keys())
+        last, elapsed = self._last_counters, (now - self._last_time) if self._last_time else 0.0
+        self._last_counters, self._last_time = counters, now
+
+        rates = {}
+        for inode, (received, acked) in counters.items():
+            pid = self.index.get(inode)
+            if pid is None:
+                continue
+            rx, tx = rates.get(pid, (0.0, 0.0))
+            if last is not None and elapsed > 0:
+                # Нові сокети рахуються від нуля: їхній трафік з'явився за цей інтервал
+                prev_received, prev_acked = last.get(inode, (0, 0))
+                rx += max(received - prev_received, 0) / elapsed
+                tx += max(acked - prev_acked, 0) / elapsed
+            rates[pid] = (rx, tx)
+        return rates
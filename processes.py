@@ -0,0 +1,383 @@
+import re
+import threading
+import time
+from types import MappingProxyType
+from typing import NamedTuple
+import numpy as np
+import psutil
+from config import PROCESS_UPDATE_INTERVAL, PROCESS_HISTORY_SIZE, PROCESS_LEAK_SLOPE, PROCESS_LEAK_CORRELATION, PROCESS_LEAK_MIN_SAMPLES
+from netstats import NET_ACCOUNTING_AVAILABLE, ProcessNetAccounting
+from utilities import setup_logging
+
+# Знімки таблиці процесів
+class ProcessInfo(NamedTuple):
+    pid: int
+    name: str
+    memory_mb: float
+    memory_percent: float
+    cpu_percent: float
+    # Атрибути, що не змінюються за життя процесу (читаються один раз)
+    ppid: int = 0
+    username: str = ""
+    exe: str = ""
+    cmdline: str = ""
+    # Тренд RSS за вікном ProcessHistory (МБ/хв) і ознака ймовірного витоку пам'яті
+    rss_slope: float = 0.0
+    leak_suspect: bool = False
+
+
+class NetProcessInfo(NamedTuple):
+    pid: int
+    name: str
+    download_kbps: float
+    upload_kbps: float
+
+
+class ProcessGroup(NamedTuple):
+    key: object
+    name: str
+    count: int
+    memory_mb: float
+    memory_percent: float
+    cpu_percent: float
+    rss_slope: float
+
+
+class ProcessHistory:
+    """Bounded RSS and CPU history of every live process, kept in preallocated arrays.
+
+    Each PID owns a row of ``(rows, capacity)`` float32 arrays; all rows
+    share one ring of sample times, so a sampling pass writes one column.
+    RSS is stored relative to the first sample of the row, which keeps the
+    regression sums exact enough in float32. A row is released (and zeroed)
+    as soon as its process exits, and the arrays double only when every row
+    is taken. After each pass the least-squares RSS slope of every row over
+    the window is computed with a few matrix-vector products; steady growth
+    (slope and correlation above the thresholds, enough samples) marks a
+    likely leak.
+    """
+
+    def __init__(self, capacity: int = PROCESS_HISTORY_SIZE, rows: int = 256):
+        self.capacity = capacity
+        self.times = np.zeros(capacity)
+        self.rss = np.zeros((rows, capacity), dtype=np.float32)
+        self.cpu = np.zeros((rows, capacity), dtype=np.float32)
+        self.baseline = np.zeros(rows)
+        self.counts = np.zeros(rows, dtype=np.intp)
+        self.head = 0
+        self._rows = {}
+        self._free = list(range(rows - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def record(self, timestamp: float, pids, rss_mb, cpu_percent):
+        """Append one pass (PIDs absent from ``pids`` are evicted); returns ``(slopes, leaks)`` aligned with ``pids``."""
+        with self._lock:
+            rows = self._rows
+            gone = rows.keys() - set(pids)
+            if gone:
+                released = [rows.pop(pid) for pid in gone]
+                self.rss[released] = 0
+                self.cpu[released] = 0
+                self.counts[released] = 0
+                self._free.extend(released)
+            index = [rows.get(pid) for pid in pids]
+            if None in index:
+                for i, pid in enumerate(pids):
+                    if index[i] is None:
+                        if not self._free:
+                            self._grow()
+                        index[i] = rows[pid] = self._free.pop()
+            index = np.array(index, dtype=np.intp)
+            rss_mb = np.asarray(rss_mb, dtype=np.float64)
+            new = self.counts[index] == 0
+            self.baseline[index[new]] = rss_mb[new]
+            column = self.head
+            self.times[column] = timestamp
+            self.rss[index, column] = rss_mb - self.baseline[index]
+            self.cpu[index, column] = cpu_percent
+            self.counts[index] = np.minimum(self.counts[index] + 1, self.capacity)
+            self.head = (column + 1) % self.capacity
+            slopes, leaks = self._trends()
+            return slopes[index], leaks[index]
+
+    def series(self, pid: int):
+        """RSS (MB) and CPU (%) samples of ``pid``, oldest first; empty arrays if it is not tracked."""
+        with self._lock:
+            row = self._rows.get(pid)
+            if row is None:
+                return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+            order = (np.arange(-self.counts[row], 0) + self.head) % self.capacity
+            return self.rss[row, order] + self.baseline[row], self.cpu[row, order]
+
+    def _grow(self):
+        size = len(self.rss)
+        self.rss = np.vstack((self.rss, np.zeros_like(self.rss)))
+        self.cpu = np.vstack((self.cpu, np.zeros_like(self.cpu)))
+        self.baseline = np.concatenate((self.baseline, np.zeros(size)))
+        self.counts = np.concatenate((self.counts, np.zeros(size, dtype=np.intp)))
+        self._free.extend(range(2 * size - 1, size - 1, -1))
+
+    def _trends(self):
+        # Час (хв) відносно останнього зразка. Рядок має counts останніх зразків, а решта його
+        # комірок — нулі, тож суми по y — добутки матриці на вектор, а суми по t — префіксні суми
+        newest = (self.head - 1 - np.arange(self.capacity)) % self.capacity
+        t = ((self.times - self.times[newest[0]]) / 60).astype(np.float32)
+        cumulative_t = np.concatenate(([0.0], np.cumsum(t[newest], dtype=np.float64)))
+        cumulative_tt = np.concatenate(([0.0], np.cumsum(np.square(t[newest], dtype=np.float64))))
+        count = self.counts
+        n = count.astype(np.float64)
+        sum_t = cumulative_t[count]
+        sum_tt = cumulative_tt[count]
+        sum_y = (self.rss @ np.ones(self.capacity, dtype=np.float32)).astype(np.float64)
+        sum_ty = (self.rss @ t).astype(np.float64)
+        sum_yy = np.einsum('ij,ij->i', self.rss, self.rss).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stt = n * sum_tt - sum_t * sum_t
+            sty = n * sum_ty - sum_t * sum_y
+            syy = n * sum_yy - sum_y * sum_y
+            slopes = np.nan_to_num(sty / stt)
+            correlation = np.nan_to_num(sty / np.sqrt(stt * syy))
+        leaks = (count >= PROCESS_LEAK_MIN_SAMPLES) & (slopes >= PROCESS_LEAK_SLOPE) & (correlation >= PROCESS_LEAK_CORRELATION)
+        return slopes, leaks
+
+
+class ProcessSampler:
+    """Samples the process table in a worker thread and publishes immutable snapshots.
+
+    ``psutil.Process`` handles are kept per PID between passes, so
+    ``cpu_percent`` measures the interval since the previous pass instead of
+    returning 0.0, and all attributes of a process are read in one
+    ``oneshot()`` batch. Every pass is also appended to ``history``. The GUI
+    thread only reads ``snapshot()`` and ``history.series()``.
+    """
+
+    def __init__(self, interval: float = PROCESS_UPDATE_INTERVAL):
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self._wakeup = threading.Event()
+        self._handles = {}
+        self._static = {}
+        self.history = ProcessHistory()
+        self._snapshot = MappingProxyType({})
+        self._net_snapshot = MappingProxyType({})
+        self.net_accounting = ProcessNetAccounting() if NET_ACCOUNTING_AVAILABLE else None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self.stop_event.set()
+        self._wakeup.set()
+
+    def request_refresh(self):
+        self._wakeup.set()
+
+    def snapshot(self):
+        return self._snapshot
+
+    def net_snapshot(self):
+        return self._net_snapshot
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                setup_logging().error(f"Error in ProcessSampler: {e}")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def sample(self):
+        total_memory = psutil.virtual_memory().total
+        pids = psutil.pids()
+        handles = self._handles
+        for pid in handles.keys() - set(pids):
+            del handles[pid]
+            self._static.pop(pid, None)
+
+        rows = []
+        for pid in pids:
+            proc = handles.get(pid)
+            try:
+                if proc is None:
+                    proc = handles[pid] = psutil.Process(pid)
+                with proc.oneshot():
+                    name = proc.name()
+                    rss = proc.memory_info().rss
+                    cpu_percent = proc.cpu_percent()
+                    static = self._static.get(pid)
+                    if static is None:
+                        static = self._static[pid] = self._read_static(proc)
+            except psutil.NoSuchProcess:
+                handles.pop(pid, None)
+                self._static.pop(pid, None)
+                continue
+            except psutil.AccessDenied:
+                continue
+            rows.append((pid, name, rss / (1024 * 1024), rss / total_memory * 100, cpu_percent, *static))
+        slopes, leaks = self.history.record(
+            time.monotonic(), [row[0] for row in rows], [row[2] for row in rows], [row[4] for row in rows]
+        )
+        processes = {
+            row[0]: ProcessInfo(*row, slope, leak)
+            for row, slope, leak in zip(rows, slopes.tolist(), leaks.tolist())
+        }
+        self._snapshot = MappingProxyType(processes)
+        self._net_snapshot = MappingProxyType(self._sample_net(processes))
+
+    @staticmethod
+    def _read_static(proc):
+        # Для чужих процесів exe, cmdline і власник можуть бути недоступні — лишаються порожніми
+        info = proc.as_dict(['ppid', 'username', 'exe', 'cmdline'], ad_value=None)
+        return info['ppid'] or 0, info['username'] or "", info['exe'] or "", " ".join(info['cmdline'] or ())
+
+    def _sample_net(self, processes):
+        if self.net_accounting is None:
+            return {}
+        try:
+            rates = self.net_accounting.sample(processes.keys())
+        except OSError as e:
+            setup_logging().error(f"Per-process network accounting disabled: {e}")
+            self.net_accounting = None
+            return {}
+        return {
+            pid: NetProcessInfo(pid, processes[pid].name, download / 1024, upload / 1024)
+            for pid, (download, upload) in rates.items() if pid in processes
+        }
+
+
+class ProcessIndex:
+    """Filter and grouping index over ProcessSampler snapshots, maintained per PID.
+
+    ``update(snapshot)`` touches only PIDs that appeared, changed or exited:
+    their search text is rebuilt only when the name or command line changed,
+    and the match set and per-group totals are adjusted by the difference.
+    ``set_query`` and ``set_grouping`` rebuild the view once. The query is a
+    case-insensitive substring (or a regular expression) searched in the
+    name and command line, optionally restricted to one user; grouping is by
+    executable (``'exe'``) or parent process (``'parent'``).
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.matches = set()
+        self.groups = {}
+        self.text = ""
+        self.regex = False
+        self.user = None
+        self.grouping = None
+        self._search = {}
+        self._users = {}
+        self._match = None
+
+    def update(self, snapshot):
+        records = self.records
+        for pid in records.keys() - snapshot.keys():
+            info = records.pop(pid)
+            self._search.pop(pid, None)
+            self._remove_user(pid, info.username)
+            if pid in self.matches:
+                self.matches.discard(pid)
+                self._aggregate(info, -1)
+        for pid, info in snapshot.items():
+            old = records.get(pid)
+            if old == info:
+                continue
+            records[pid] = info
+            if old is None or old.name != info.name or old.cmdline != info.cmdline or old.username != info.username:
+                if old is not None:
+                    self._remove_user(pid, old.username)
+                self._users.setdefault(info.username, set()).add(pid)
+                self._search[pid] = f"{info.name}\n{info.cmdline}".lower()
+                matched = self._matches(pid, info)
+            else:
+                matched = pid in self.matches
+            if old is not None and pid in self.matches:
+                self._aggregate(old, -1)
+            if matched:
+                self.matches.add(pid)
+                self._aggregate(info, 1)
+            else:
+                self.matches.discard(pid)
+
+    def set_query(self, text: str = "", regex: bool = False, user: str = None):
+        # Некоректний регулярний вираз (re.error) не змінює поточний фільтр
+        text = text.strip()
+        if regex and text:
+            pattern = re.compile(text, re.IGNORECASE)
+            self._match = lambda search: pattern.search(search) is not None
+        elif text:
+            needle = text.lower()
+            self._match = lambda search: needle in search
+        else:
+            self._match = None
+        self.text, self.regex, self.user = text, regex, user
+        self._rebuild()
+
+    def set_grouping(self, grouping: str = None):
+        if grouping != self.grouping:
+            self.grouping = grouping
+            self._rebuild()
+
+    def users(self):
+        return [user for user in self._users if user]
+
+    def rows(self):
+        records = self.records
+        return [records[pid] for pid in self.matches]
+
+    def group_rows(self):
+        rows = []
+        for key, (count, memory_mb, memory_percent, cpu_percent, rss_slope) in self.groups.items():
+            if self.grouping == 'parent':
+                parent = self.records.get(key)
+                name = f"{parent.name} ({key})" if parent is not None else f"PID {key}"
+            else:
+                name = key
+            rows.append(ProcessGroup(key, name, count, memory_mb, memory_percent, cpu_percent, rss_slope))
+        return rows
+
+    def _matches(self, pid, info):
+        if self.user is not None and info.username != self.user:
+            return False
+        return self._match is None or self._match(self._search[pid])
+
+    def _rebuild(self):
+        self.matches = {pid for pid, info in self.records.items() if self._matches(pid, info)}
+        self.groups = {}
+        if self.grouping:
+            records = self.records
+            for pid in self.matches:
+                self._aggregate(records[pid], 1)
+
+    def _group_key(self, info):
+        if self.grouping == 'parent':
+            return info.ppid
+        return info.exe or info.name
+
+    def _aggregate(self, info, sign):
+        if not self.grouping:
+            return
+        key = self._group_key(info)
+        totals = self.groups.get(key)
+        if totals is None:
+            totals = self.groups[key] = [0, 0.0, 0.0, 0.0, 0.0]
+        totals[0] += sign
+        if not totals[0]:
+            # Остання копія вийшла з групи: не лишаємо залишкових похибок сум
+            del self.groups[key]
+            return
+        totals[1] += sign * info.memory_mb
+        totals[2] += sign * info.memory_percent
+        totals[3] += sign * info.cpu_percent
+        totals[4] += sign * info.rss_slope
+
+    def _remove_user(self, pid, username):
+        pids = self._users.get(username)
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                del self._users[username]
@@ -0,0 +1,173 @@
+import gzip
+import pickle
+import platform
+import threading
+import time
+import zlib
+from devices import DiskUsage, MemoryUsage
+from gpu import GPUInfo
+from monitor import ResourceMonitor
+from utilities import setup_logging
+
+# Запис потоку знімків у файл і його відтворення
+TRACE_VERSION = 1
+# Типи зі знімків, які дозволено відновлювати з файлу запису (крім іменованих кортежів psutil)
+TRACE_TYPES = {
+    ('gpu', 'GPUInfo'), ('gpu', 'GPUSample'), ('smart', 'DriveHealth'), ('devices', 'FilesystemUsage'),
+    ('devices', 'MemoryUsage'), ('devices', 'DiskUsage')
+}
+
+
+class TraceRecorder:
+    """Appends every monitor snapshot to a gzip-compressed stream of pickles.
+
+    Register the recorder itself as a ``ResourceMonitor`` callback. The first
+    record is a header (core count, GPUs, host); every later record is one
+    snapshot as published, with the psutil memory and disk tuples (whose
+    fields differ between platforms) replaced by ``MemoryUsage`` and
+    ``DiskUsage``. The compressor is sync-flushed every
+    ``flush_interval`` seconds, so a crash loses at most that much and the
+    file stays readable up to the last flush.
+    """
+
+    def __init__(self, path: str, monitor, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._file = gzip.open(path, 'wb', compresslevel=6)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._write({
+            'version': TRACE_VERSION,
+            'cpu_count': monitor.cpu_count,
+            'gpus': tuple(monitor.gpu.gpus),
+            'host': platform.node(),
+            'started': time.time()
+        })
+
+    def _write(self, record):
+        pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __call__(self, snapshot: dict):
+        with self._lock:
+            if self._file is None:
+                return
+            self._write(self._portable(snapshot))
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush(zlib.Z_SYNC_FLUSH)
+                self._last_flush = now
+
+    @staticmethod
+    def _portable(snapshot):
+        ram = snapshot['ram']
+        disk, *rest = snapshot['disk']
+        return {
+            **snapshot,
+            'ram': MemoryUsage(ram.total, ram.available, ram.percent, ram.used, ram.free),
+            'disk': (DiskUsage(disk.total, disk.used, disk.free, disk.percent), *rest)
+        }
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class _TraceUnpickler(pickle.Unpickler):
+    # Файл запису може прийти з іншої машини: дозволяємо лише типи, що трапляються у знімках
+    def find_class(self, module, name):
+        # Модуль імпортується лише після перевірки імені: довільний модуль із файлу не завантажується
+        if (module, name) in TRACE_TYPES:
+            return super().find_class(module, name)
+        if module.split('.')[0] == 'psutil':
+            cls = super().find_class(module, name)
+            if isinstance(cls, type) and issubclass(cls, tuple) and hasattr(cls, '_fields'):
+                return cls
+        raise pickle.UnpicklingError(f"Type not allowed in a trace: {module}.{name}")
+
+
+def read_trace(path: str):
+    """Yield the header and then every snapshot of a trace file.
+
+    A truncated tail (the recorder was killed mid-write) or a record that
+    cannot be loaded here (e.g. types from another psutil version) ends the
+    stream after the last good record.
+    """
+    with gzip.open(path, 'rb') as f:
+        # Кожен запис — окремий pickle зі своєю таблицею посилань
+        header = _TraceUnpickler(f).load()
+        if not isinstance(header, dict) or header.get('version') != TRACE_VERSION:
+            raise ValueError(f"{path} is not a trace file (version {TRACE_VERSION})")
+        yield header
+        while True:
+            try:
+                yield _TraceUnpickler(f).load()
+            except EOFError:
+                return
+            except (zlib.error, gzip.BadGzipFile, pickle.UnpicklingError) as e:
+                setup_logging().warning(f"Trace {path} ends with an incomplete record: {e}")
+                return
+            except Exception as e:
+                # Записи з іншої ОС чи версії psutil можуть посилатися на відсутні тут класи або поля
+                setup_logging().error(f"Trace {path} has a record that cannot be loaded, replay stops here: {e}")
+                return
+
+
+class TraceGPU:
+    # Замість GPUCollector: список GPU береться із запису, вибірки приходять зі знімків
+    def __init__(self, gpus):
+        self.gpus = [GPUInfo(*gpu) for gpu in gpus]
+        self.available = bool(self.gpus)
+
+    def start(self):
+        pass
+
+    def sample(self):
+        return ()
+
+    def stop(self):
+        pass
+
+
+class ReplayMonitor(ResourceMonitor):
+    """A ``ResourceMonitor`` fed from a trace file instead of the live system.
+
+    Snapshots go through the same history and callback path as live ones.
+    ``speed`` scales the recorded intervals (1 = real time, 10 = ten times
+    faster); 0 replays as fast as the consumers allow. ``stop_event`` is set
+    when the trace ends.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        self.path = path
+        self.speed = speed
+        self._records = read_trace(path)
+        self.header = next(self._records)
+        super().__init__(persist=False, gpu=TraceGPU(self.header['gpus']), cpu_count=self.header['cpu_count'])
+
+    def _monitor(self):
+        previous = None
+        count = 0
+        # Кінець відтворення сигналізується за будь-якого результату, інакше headless-режим чекає вічно
+        try:
+            for snapshot in self._records:
+                if self.stop_event.is_set():
+                    break
+                if previous is not None and self.speed > 0:
+                    delay = (snapshot['monotonic'] - previous) / self.speed
+                    if self.stop_event.wait(max(0.0, delay)):
+                        break
+                previous = snapshot['monotonic']
+                try:
+                    self._ingest(snapshot)
+                except Exception as e:
+                    setup_logging().error(f"Error in ReplayMonitor: {e}")
+                count += 1
+        except Exception as e:
+            setup_logging().error(f"Replay of {self.path} failed: {e}")
+        finally:
+            self._records.close()
+            self.smart.shutdown()
+            setup_logging().info(f"Replay of {self.path} finished after {count} snapshots")
+            self.stop_event.set()
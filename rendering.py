@@ -0,0 +1,126 @@
+import time
+from contextlib import nullcontext
+import numpy as np
+
+# Рендеринг графіків із блітингом
+class _Chart:
+    def __init__(self, name, canvas, ax, artists, tabs, autoscale):
+        self.name = name
+        self.canvas = canvas
+        self.ax = ax
+        self.artists = artists
+        self.tabs = tabs
+        self.autoscale = autoscale
+        self.ymin_top = ax.get_ylim()[1]
+        self.background = None
+        self.dirty = True
+
+
+class ChartRenderer:
+    """Redraws only the line artists of charts whose notebook tab is visible.
+
+    The static part of every figure (axes, ticks, legend) is rendered once and
+    cached via ``copy_from_bbox``; a frame then costs one ``restore_region``,
+    a ``draw_artist`` per line and a ``blit``. Hidden charts are only marked
+    dirty and repainted when their tab is selected. ``flush`` is throttled to
+    ``max_fps``. With ``diagnostics`` every repaint is timed as ``draw.<name>``.
+    """
+
+    def __init__(self, root, max_fps: float = 10, diagnostics=None):
+        self.root = root
+        self.diagnostics = diagnostics
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.charts = {}
+        self._notebooks = set()
+        self._last_flush = 0.0
+        self._after_id = None
+
+    def add_chart(self, name: str, canvas, ax, artists, tabs, autoscale: bool = False):
+        chart = _Chart(name, canvas, ax, list(artists), list(tabs), autoscale)
+        for artist in chart.artists:
+            artist.set_animated(True)
+        canvas.mpl_connect('draw_event', lambda event, c=chart: self._on_draw(c))
+        for notebook, _ in chart.tabs:
+            if notebook not in self._notebooks:
+                self._notebooks.add(notebook)
+                notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed, add='+')
+        self.charts[name] = chart
+
+    def invalidate(self, name: str):
+        chart = self.charts.get(name)
+        if chart:
+            chart.dirty = True
+
+    def reset(self):
+        # Змінився статичний фон (підписи, межі осей) — потрібне повне перемальовування
+        for chart in self.charts.values():
+            chart.background = None
+            chart.dirty = True
+
+    def flush(self):
+        now = time.monotonic()
+        wait = self.min_interval - (now - self._last_flush)
+        if wait > 0:
+            if self._after_id is None:
+                self._after_id = self.root.after(int(wait * 1000) + 1, self._deferred_flush)
+            return
+        self._last_flush = now
+        for chart in self.charts.values():
+            if chart.dirty and self._is_visible(chart):
+                self._render(chart)
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _deferred_flush(self):
+        self._after_id = None
+        self.flush()
+
+    def _on_tab_changed(self, event):
+        for chart in self.charts.values():
+            if chart.dirty and self._is_visible(chart):
+                self._render(chart)
+
+    def _is_visible(self, chart):
+        for notebook, frame in chart.tabs:
+            if notebook.select() != str(frame):
+                return False
+        return True
+
+    def _on_draw(self, chart):
+        # Повне перемальовування: кешуємо фон і домальовуємо лінії поверх нього
+        chart.background = chart.canvas.copy_from_bbox(chart.canvas.figure.bbox)
+        for artist in chart.artists:
+            chart.ax.draw_artist(artist)
+
+    def _render(self, chart):
+        with self.diagnostics.measure(f'draw.{chart.name}') if self.diagnostics else nullcontext():
+            self._draw(chart)
+
+    def _draw(self, chart):
+        chart.dirty = False
+        if chart.autoscale and self._rescale(chart):
+            chart.background = None
+        if chart.background is None:
+            chart.canvas.draw()
+            return
+        chart.canvas.restore_region(chart.background)
+        for artist in chart.artists:
+            chart.ax.draw_artist(artist)
+        chart.canvas.blit(chart.canvas.figure.bbox)
+
+    def _rescale(self, chart):
+        # Межу осі Y змінюємо лише коли дані виходять за неї або стали значно меншими
+        ymax = 0.0
+        for artist in chart.artists:
+            data = np.asarray(artist.get_ydata())
+            finite = data[np.isfinite(data)]
+            if finite.size:
+                ymax = max(ymax, float(finite.max()))
+        top = chart.ax.get_ylim()[1]
+        if ymax > top or (top > chart.ymin_top and ymax < top / 4):
+            chart.ax.set_ylim(0, max(chart.ymin_top, ymax * 1.2))
+            return True
+        return False
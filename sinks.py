@@ -0,0 +1,62 @@
+import json
+import sys
+import time
+
+# Приймачі знімків для headless-режиму
+def snapshot_to_record(value):
+    """Convert a monitor snapshot (psutil namedtuples, tuples, NumPy scalars) to JSON-ready data."""
+    if hasattr(value, '_asdict'):
+        return {key: snapshot_to_record(item) for key, item in value._asdict().items()}
+    if isinstance(value, dict):
+        return {str(key): snapshot_to_record(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [snapshot_to_record(item) for item in value]
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+class StreamSink:
+    """Writes one JSON line per snapshot; the stream is flushed at most every ``flush_interval`` seconds."""
+
+    def __init__(self, stream, flush_interval: float = 5.0):
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+
+    def __call__(self, snapshot: dict):
+        self.stream.write(json.dumps(snapshot_to_record(snapshot), separators=(',', ':')) + '\n')
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self.stream.flush()
+            self._last_flush = now
+
+    def close(self):
+        self.stream.flush()
+
+
+class StdoutSink(StreamSink):
+    def __init__(self):
+        super().__init__(sys.stdout, flush_interval=0)
+
+
+class JsonlSink(StreamSink):
+    def __init__(self, path: str, flush_interval: float = 5.0):
+        super().__init__(open(path, 'a', encoding='utf-8', buffering=1 << 16), flush_interval)
+
+    def close(self):
+        super().close()
+        self.stream.close()
+
+
+def create_sink(spec: str):
+    """Build a sink from a command-line spec: ``stdout`` or ``jsonl:<path>``.
+
+    ``store`` is not a callback sink: it enables the monitor's own history store.
+    """
+    kind, _, argument = spec.partition(':')
+    if kind == 'stdout':
+        return StdoutSink()
+    if kind == 'jsonl':
+        return JsonlSink(argument or 'monitor.jsonl')
+    raise ValueError(f"Unknown sink: {spec}")
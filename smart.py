@@ -0,0 +1,153 @@
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from config import SMART_DISCOVERY_INTERVAL, SMART_MAX_WORKERS
+from utilities import setup_logging
+
+try:
+    from pySMART import Device
+    SMART_AVAILABLE = True
+except ImportError:
+    SMART_AVAILABLE = False
+
+# Стан накопичувачів (SMART)
+class DriveHealth(NamedTuple):
+    device: str
+    model: str
+    temperature: str
+    health: str
+
+
+def find_smartctl():
+    if platform.system() == "Windows":
+        if getattr(sys, 'frozen', False):
+            return os.path.join(os.path.dirname(sys.executable), 'smartctl.exe')
+        default = r"C:\Program Files\gsmartcontrol\smartctl.exe"
+        return default if os.path.exists(default) else shutil.which('smartctl')
+    return shutil.which('smartctl')
+
+
+def summarize(drives):
+    """Collapse all drives into the single (temperature, health) pair shown in the Disk tab header."""
+    temperatures = [int(d.temperature[:-2]) for d in drives if d.temperature.endswith("°C")]
+    healths = [d.health for d in drives if d.health != "N/A"]
+    temperature = f"{max(temperatures)}°C" if temperatures else "N/A"
+    if not healths:
+        return temperature, "N/A"
+    bad = [h for h in healths if h != "OK"]
+    return temperature, bad[0] if bad else "OK"
+
+
+class SmartMonitor:
+    """Discovers every block device and queries their SMART data concurrently.
+
+    ``refresh`` runs one ``smartctl`` (or pySMART) query per drive on a small
+    worker pool and caches the results; ``drives`` returns the cached tuple.
+    The device list itself is cached and rediscovered every
+    ``discovery_interval`` seconds. Meant to be called from a background
+    collector, never from the GUI thread.
+    """
+
+    def __init__(self, smartctl_path: str = None, discovery_interval: float = SMART_DISCOVERY_INTERVAL,
+                 max_workers: int = SMART_MAX_WORKERS):
+        self.smartctl_path = smartctl_path or find_smartctl()
+        self.discovery_interval = discovery_interval
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='smart')
+        self._lock = threading.Lock()
+        self._devices = []
+        self._discovered = None
+        self._drives = ()
+
+    def drives(self):
+        return self._drives
+
+    def refresh(self):
+        now = time.monotonic()
+        if self._discovered is None or now - self._discovered >= self.discovery_interval:
+            self._devices = self.discover()
+            self._discovered = now
+        drives = tuple(self._pool.map(lambda device: self._query(*device), self._devices))
+        with self._lock:
+            self._drives = drives
+        return drives
+
+    def discover(self):
+        if self.smartctl_path:
+            try:
+                result = subprocess.run([self.smartctl_path, '--scan'], capture_output=True, text=True, timeout=10)
+                devices = []
+                for line in result.stdout.splitlines():
+                    parts = line.split('#')[0].split()
+                    if not parts:
+                        continue
+                    dev_type = parts[parts.index('-d') + 1] if '-d' in parts[:-1] else None
+                    devices.append((parts[0], dev_type))
+                if devices:
+                    return devices
+            except (OSError, subprocess.SubprocessError) as e:
+                setup_logging().error(f"smartctl --scan failed: {e}")
+        if platform.system() == "Linux":
+            skip = ('loop', 'ram', 'zram', 'dm-', 'md', 'sr', 'fd', 'nbd')
+            try:
+                return [(f"/dev/{name}", None) for name in sorted(os.listdir('/sys/block')) if not name.startswith(skip)]
+            except OSError:
+                return []
+        return []
+
+    def _query(self, device, dev_type):
+        if self.smartctl_path:
+            return self._query_smartctl(device, dev_type)
+        if SMART_AVAILABLE:
+            try:
+                disk_device = Device(device)
+                temperature = f"{disk_device.temperature}°C" if disk_device.temperature else "N/A"
+                return DriveHealth(device, disk_device.model or "N/A", temperature, disk_device.health or "N/A")
+            except Exception:
+                pass
+        return DriveHealth(device, "N/A", "N/A", "N/A")
+
+    def _query_smartctl(self, device, dev_type):
+        cmd = [self.smartctl_path, '-j', '-i', '-H', '-A']
+        if dev_type:
+            cmd += ['-d', dev_type]
+        cmd.append(device)
+        try:
+            # Код виходу smartctl — бітова маска попереджень, тому check=True не використовується
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            return DriveHealth(device, "N/A", "N/A", "N/A")
+        try:
+            data = json.loads(result.stdout)
+        except ValueError:
+            return self._parse_text(device, result.stdout)
+        temperature = data.get('temperature', {}).get('current')
+        passed = data.get('smart_status', {}).get('passed')
+        return DriveHealth(
+            device,
+            data.get('model_name') or data.get('model_family') or "N/A",
+            f"{temperature}°C" if temperature is not None else "N/A",
+            "N/A" if passed is None else "OK" if passed else "Warning"
+        )
+
+    @staticmethod
+    def _parse_text(device, output):
+        # smartctl без підтримки JSON (< 7.0)
+        temperature = health = "N/A"
+        for line in output.splitlines():
+            if temperature == "N/A" and ("Temperature:" in line or "Temperature_Celsius" in line):
+                values = [word for word in line.split() if word.isdigit()]
+                if values:
+                    temperature = (values[0] if "Temperature:" in line else values[-1]) + "°C"
+            if "overall-health" in line or "SMART Health Status" in line:
+                health = "OK" if ("PASSED" in line or "OK" in line) else "Warning"
+        return DriveHealth(device, "N/A", temperature, health)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
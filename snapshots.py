@@ -0,0 +1,50 @@
+import threading
+from collections import deque
+
+# Черга знімків між потоком збору даних і головним циклом Tk
+class SnapshotQueue:
+    """Bounded, coalescing hand-off of monitor snapshots to the UI thread.
+
+    The collector thread calls ``put`` and never blocks; when the queue is
+    full the oldest snapshot is dropped. The UI thread calls ``take_latest``,
+    which returns only the newest snapshot and counts the rest as coalesced.
+    """
+
+    def __init__(self, maxsize: int = 4):
+        self._items = deque(maxlen=maxsize)
+        self._lock = threading.Lock()
+        self.put_count = 0
+        self.dropped_count = 0
+        self.coalesced_count = 0
+        self.rendered_count = 0
+
+    def put(self, snapshot):
+        with self._lock:
+            if len(self._items) == self._items.maxlen:
+                self.dropped_count += 1
+            self._items.append(snapshot)
+            self.put_count += 1
+
+    def take_latest(self):
+        with self._lock:
+            if not self._items:
+                return None
+            snapshot = self._items.pop()
+            self.coalesced_count += len(self._items)
+            self._items.clear()
+            self.rendered_count += 1
+            return snapshot
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'received': self.put_count,
+                'rendered': self.rendered_count,
+                'dropped': self.dropped_count,
+                'coalesced': self.coalesced_count,
+                'pending': len(self._items)
+            }
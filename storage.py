@@ -0,0 +1,363 @@
+import json
+import os
+import struct
+import threading
+import numpy as np
+
+# Постійне сховище часових рядів
+MAGIC = b'RMTS0001'
+HEADER_ALIGN = 4096
+
+
+def _segment_dtype(width):
+    return np.dtype([('t', '<f8'), ('v', '<f4', (width,))])
+
+
+def _write_header(path, columns, rows):
+    meta = json.dumps({'columns': columns, 'rows': rows}).encode('utf-8')
+    offset = -(-(len(MAGIC) + 4 + len(meta)) // HEADER_ALIGN) * HEADER_ALIGN
+    with open(path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(meta)) + meta)
+        f.truncate(offset + rows * _segment_dtype(len(columns)).itemsize)
+    return offset
+
+
+def _read_header(path):
+    with open(path, 'rb') as f:
+        head = f.read(len(MAGIC) + 4)
+        if len(head) < len(MAGIC) + 4 or head[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a history segment: {path}")
+        size, = struct.unpack('<I', head[len(MAGIC):])
+        meta = json.loads(f.read(size).decode('utf-8'))
+    offset = -(-(len(MAGIC) + 4 + size) // HEADER_ALIGN) * HEADER_ALIGN
+    return meta['columns'], meta['rows'], offset
+
+
+class _Segment:
+    def __init__(self, path, columns, rows, offset, mode, count=None):
+        self.path = path
+        self.columns = columns
+        self.rows = rows
+        self.data = np.memmap(path, dtype=_segment_dtype(len(columns)), mode=mode, offset=offset, shape=(rows,))
+        # Незаписані рядки мають нульову мітку часу
+        self.count = int(np.count_nonzero(self.data['t'])) if count is None else count
+
+    @classmethod
+    def open(cls, path, mode='r', count=None):
+        columns, rows, offset = _read_header(path)
+        return cls(path, columns, rows, offset, mode, count)
+
+    @classmethod
+    def create(cls, path, columns, rows):
+        offset = _write_header(path, columns, rows)
+        return cls(path, columns, rows, offset, 'r+', 0)
+
+    def close(self):
+        if self.data is not None and self.data.mode == 'r+':
+            self.data.flush()
+        self.data = None
+
+
+class TimeSeriesStore:
+    """Append-only time series store made of fixed-size memory-mapped segments.
+
+    Each segment file holds a JSON header with its column names followed by
+    ``rows`` records of ``(timestamp, float32[columns])``. Only the active
+    segment is kept mapped for writing, so memory stays constant however long
+    the history is; the oldest segments are deleted beyond ``max_segments``.
+    A change of columns (e.g. a new GPU) simply starts a new segment.
+    """
+
+    def __init__(self, directory: str, columns, segment_rows: int = 3600, max_segments: int = 168):
+        self.directory = directory
+        self.columns = list(columns)
+        self.segment_rows = segment_rows
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._active = None
+        os.makedirs(directory, exist_ok=True)
+        self._paths = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.seg')
+        )
+        if self._paths:
+            try:
+                last = _Segment.open(self._paths[-1], 'r+')
+                if last.columns == self.columns and last.count < last.rows:
+                    self._active = last
+                else:
+                    self._counts[last.path] = last.count
+                    last.close()
+            except (OSError, ValueError):
+                pass
+
+    def append(self, timestamp: float, values):
+        with self._lock:
+            segment = self._active
+            if segment is None or segment.count >= segment.rows:
+                segment = self._rotate(timestamp)
+            row = segment.count
+            segment.data['v'][row] = values
+            segment.data['t'][row] = timestamp
+            segment.count = row + 1
+
+    def _rotate(self, timestamp):
+        if self._active is not None:
+            self._counts[self._active.path] = self._active.count
+            self._active.close()
+        path = os.path.join(self.directory, f"{int(timestamp * 1000):016d}.seg")
+        self._active = _Segment.create(path, self.columns, self.segment_rows)
+        self._paths.append(path)
+        while len(self._paths) > self.max_segments:
+            old = self._paths.pop(0)
+            self._counts.pop(old, None)
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        return self._active
+
+    @staticmethod
+    def _segment_start(path):
+        return int(os.path.basename(path).split('.')[0]) / 1000
+
+    def iter_chunks(self, start: float, end: float, columns=None):
+        """Yield ``(timestamps, values)`` per segment overlapping ``[start, end]``.
+
+        Values are float64 arrays of shape ``(n, len(columns))``; columns a
+        segment does not have are filled with NaN.
+        """
+        columns = list(columns or self.columns)
+        with self._lock:
+            paths = list(self._paths)
+            active = self._active.path if self._active else None
+            active_count = self._active.count if self._active else 0
+        for i, path in enumerate(paths):
+            if self._segment_start(path) > end:
+                break
+            if i + 1 < len(paths) and self._segment_start(paths[i + 1]) < start:
+                continue
+            try:
+                segment = _Segment.open(path, count=active_count if path == active else self._counts.get(path))
+            except (OSError, ValueError):
+                continue
+            if path != active:
+                self._counts.setdefault(path, segment.count)
+            times = segment.data['t'][:segment.count]
+            lo = np.searchsorted(times, start, side='left')
+            hi = np.searchsorted(times, end, side='right')
+            if hi > lo:
+                index = {name: j for j, name in enumerate(segment.columns)}
+                rows = segment.data['v'][lo:hi]
+                values = np.full((hi - lo, len(columns)), np.nan)
+                for j, name in enumerate(columns):
+                    if name in index:
+                        values[:, j] = rows[:, index[name]]
+                yield np.array(times[lo:hi]), values
+            segment.close()
+
+    def pop_last(self, timestamp: float):
+        """Remove and return the values of the last row if it is stamped ``timestamp`` and still writable, else ``None``."""
+        with self._lock:
+            segment = self._active
+            if segment is None or not segment.count or segment.data['t'][segment.count - 1] != timestamp:
+                return None
+            segment.count -= 1
+            values = np.array(segment.data['v'][segment.count], dtype=np.float64)
+            segment.data['t'][segment.count] = 0
+            return values
+
+    def query(self, start: float, end: float, columns=None):
+        columns = list(columns or self.columns)
+        chunks = list(self.iter_chunks(start, end, columns))
+        if not chunks:
+            return np.empty(0), np.empty((0, len(columns)))
+        return np.concatenate([t for t, _ in chunks]), np.concatenate([v for _, v in chunks])
+
+    def flush(self):
+        with self._lock:
+            if self._active is not None:
+                self._active.data.flush()
+
+    def close(self):
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._active = None
+
+
+# Багаторівневі агрегати (raw / 1 хв / 1 год)
+ROLLUP_STATS = ('min', 'max', 'avg', 'count')
+
+
+class RollupTier:
+    """Downsampled copy of a series: min/max/avg/count per column per bucket.
+
+    Samples are folded into the current bucket with vector min/max/sum
+    updates (O(1) per sample per column); the bucket is written to its own
+    ``TimeSeriesStore`` when a sample for a later bucket arrives, and the
+    partial bucket on ``close``. After a restart within the same bucket
+    that partial row is taken back and merged with the new samples. Counts
+    are kept per column, since a column may be NaN for part of a bucket.
+    """
+
+    def __init__(self, directory: str, columns, resolution: float, segment_rows: int, max_segments: int):
+        self.resolution = resolution
+        self.columns = list(columns)
+        self.store = TimeSeriesStore(
+            directory, [f"{name}.{stat}" for stat in ROLLUP_STATS for name in self.columns],
+            segment_rows, max_segments
+        )
+        width = len(self.columns)
+        self._bucket = None
+        self._min = np.full(width, np.inf)
+        self._max = np.full(width, -np.inf)
+        self._sum = np.zeros(width)
+        self._count = np.zeros(width, dtype=np.int64)
+        self._samples = 0
+
+    def add(self, timestamp: float, values):
+        bucket = timestamp // self.resolution * self.resolution
+        if self._bucket is None:
+            self._resume(bucket)
+        elif bucket != self._bucket:
+            self.store.append(self._bucket, self._row())
+            self._reset()
+        self._bucket = bucket
+        values = np.asarray(values, dtype=np.float64)
+        finite = np.isfinite(values)
+        np.fmin(self._min, values, out=self._min)
+        np.fmax(self._max, values, out=self._max)
+        self._sum += np.where(finite, values, 0)
+        self._count += finite
+        self._samples += 1
+
+    def _reset(self):
+        self._min.fill(np.inf)
+        self._max.fill(-np.inf)
+        self._sum.fill(0)
+        self._count.fill(0)
+        self._samples = 0
+
+    def _resume(self, bucket):
+        # Рядок, збережений при закритті посеред інтервалу, знову стає поточним інтервалом
+        row = self.store.pop_last(bucket)
+        if row is None:
+            return
+        width = len(self.columns)
+        low, high, avg, count = row[:width], row[width:2 * width], row[2 * width:3 * width], row[3 * width:]
+        present = np.isfinite(avg) & (count > 0)
+        self._min[:] = np.where(present, low, np.inf)
+        self._max[:] = np.where(present, high, -np.inf)
+        self._count[:] = np.where(present, count, 0)
+        self._sum[:] = np.where(present, avg, 0) * self._count
+        self._samples = int(self._count.max(initial=0))
+
+    def _row(self):
+        empty = self._count == 0
+        avg = np.divide(self._sum, self._count, out=np.full(len(self._sum), np.nan), where=~empty)
+        return np.concatenate([
+            np.where(empty, np.nan, self._min), np.where(empty, np.nan, self._max), avg, self._count
+        ])
+
+    def query(self, start: float, end: float, columns=None, stat: str = 'avg'):
+        columns = list(columns or self.columns)
+        names = [f"{name}.{stat}" for name in columns] + [f"{name}.count" for name in columns]
+        times, values = self.store.query(start, end, names)
+        # Незавершений поточний інтервал теж повертається
+        if self._bucket is not None and start <= self._bucket <= end:
+            index = {name: j for j, name in enumerate(self.store.columns)}
+            row = self._row()
+            times = np.append(times, self._bucket)
+            values = np.vstack([values, [[row[index[name]] if name in index else np.nan for name in names]]])
+        return times, values[:, :len(columns)], values[:, len(columns):]
+
+    def close(self):
+        if self._bucket is not None and self._samples:
+            self.store.append(self._bucket, self._row())
+            self._bucket = None
+            self._reset()
+        self.store.close()
+
+
+class MultiResolutionStore:
+    """Raw samples plus incremental rollup tiers, queried at the coarsest fitting tier."""
+
+    def __init__(self, directory: str, columns, segment_rows: int = 3600, max_segments: int = 168, rollups=()):
+        self.columns = list(columns)
+        self.raw = TimeSeriesStore(os.path.join(directory, 'raw'), self.columns, segment_rows, max_segments)
+        self.tiers = [
+            RollupTier(os.path.join(directory, f"{int(resolution)}s"), self.columns, resolution, rows, segments)
+            for resolution, rows, segments in sorted(rollups)
+        ]
+
+    def append(self, timestamp: float, values):
+        self.raw.append(timestamp, values)
+        for tier in self.tiers:
+            tier.add(timestamp, values)
+
+    def select_tier(self, start: float, end: float, points: int = None):
+        # Найгрубший рівень, що все ще дає щонайменше points точок на проміжку
+        if not points:
+            return None
+        chosen = None
+        for tier in self.tiers:
+            if tier.resolution * points <= end - start:
+                chosen = tier
+        return chosen
+
+    def query(self, start: float, end: float, columns=None, points: int = None, stat: str = 'avg'):
+        tier = self.select_tier(start, end, points)
+        if tier is None:
+            return self.raw.query(start, end, columns)
+        times, values, _ = tier.query(start, end, columns, stat)
+        return times, values
+
+    def average(self, start: float, end: float, columns=None, points: int = None):
+        """Per-column mean over ``[start, end]``; rollup rows are weighted by each column's sample count."""
+        tier = self.select_tier(start, end, points)
+        if tier is None:
+            _, values = self.raw.query(start, end, columns)
+            return column_means(values)
+        _, values, counts = tier.query(start, end, columns)
+        # Сегменти старого формату не мають стовпців name.count — їхні рядки пропускаються
+        finite = np.isfinite(values) & np.isfinite(counts)
+        weights = np.where(finite, counts, 0)
+        totals = weights.sum(axis=0)
+        sums = (np.where(finite, values, 0) * weights).sum(axis=0)
+        return [float(s / w) if w else None for s, w in zip(sums, totals)]
+
+    def iter_chunks(self, start: float, end: float, columns=None):
+        return self.raw.iter_chunks(start, end, columns)
+
+    def close(self):
+        self.raw.close()
+        for tier in self.tiers:
+            tier.close()
+
+
+def bin_mean(times, values, start: float, width: float, points: int):
+    """Average ``values`` (n x columns) into ``points`` bins of ``width`` seconds.
+
+    Returns a ``(columns, points)`` array; empty bins are NaN so charts show gaps.
+    """
+    columns = values.shape[1] if values.ndim == 2 else 0
+    result = np.full((columns, points), np.nan)
+    if not len(times):
+        return result
+    index = np.clip(((times - start) / width).astype(np.int64), 0, points - 1)
+    for j in range(columns):
+        column = values[:, j]
+        finite = np.isfinite(column)
+        counts = np.bincount(index[finite], minlength=points)
+        sums = np.bincount(index[finite], weights=column[finite], minlength=points)
+        np.divide(sums, counts, out=result[j], where=counts > 0)
+    return result
+
+
+def column_means(values):
+    """NaN-aware mean of every column; ``None`` for columns with no data."""
+    finite = np.isfinite(values)
+    counts = finite.sum(axis=0)
+    sums = np.where(finite, values, 0).sum(axis=0)
+    return [float(s / c) if c else None for s, c in zip(sums, counts)]
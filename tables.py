@@ -0,0 +1,142 @@
+from typing import Callable
+from config import VIRTUAL_TABLE_OVERSCAN
+
+# Віртуалізована таблиця поверх ttk.Treeview
+WHEEL_ROWS = 3  # Рядків на один крок коліщатка миші
+
+
+class VirtualTable:
+    """Shows a large sorted list in a ``ttk.Treeview`` that only holds the visible rows.
+
+    ``set_rows`` takes the full list of records and a ``format_row(record)``
+    returning ``(key, values, tags)``; only the records in the current window
+    (the visible rows plus ``overscan``) are formatted and written into a
+    fixed pool of tree items, so the cost of a refresh or a scroll step does
+    not depend on the number of records. Scrolling (scrollbar, wheel, arrow
+    and page keys) moves the window instead of the tree. The selection is
+    tracked by key, so it survives re-sorting and scrolling out of view.
+    """
+
+    def __init__(self, tree, scrollbar=None, overscan: int = VIRTUAL_TABLE_OVERSCAN):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.overscan = overscan
+        self.records = []
+        self.format_row: Callable = None
+        self.offset = 0
+        self.visible_rows = int(tree.cget('height'))
+        self._items = []
+        self._shown = []
+        self._selected_key = None
+        if scrollbar is not None:
+            scrollbar.configure(command=self.yview)
+        tree.bind('<MouseWheel>', self._on_wheel)
+        tree.bind('<Button-4>', lambda event: self.scroll(-WHEEL_ROWS))
+        tree.bind('<Button-5>', lambda event: self.scroll(WHEEL_ROWS))
+        tree.bind('<Up>', lambda event: self._move_selection(-1))
+        tree.bind('<Down>', lambda event: self._move_selection(1))
+        tree.bind('<Prior>', lambda event: self._move_selection(-self.visible_rows))
+        tree.bind('<Next>', lambda event: self._move_selection(self.visible_rows))
+        tree.bind('<Configure>', self._on_configure, add='+')
+        tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+
+    def set_rows(self, records, format_row: Callable):
+        self.records = records
+        self.format_row = format_row
+        self.render()
+
+    def selected_key(self):
+        return self._selected_key
+
+    # Прокручування
+    def yview(self, *args):
+        # Протокол команди ttk.Scrollbar: ("moveto", частка) або ("scroll", n, "units"/"pages")
+        if args[0] == 'moveto':
+            self.scroll_to(round(float(args[1]) * len(self.records)))
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self.visible_rows if args[2] == 'pages' else 1)
+            self.scroll(step)
+
+    def scroll(self, rows: int):
+        self.scroll_to(self.offset + rows)
+        return 'break'
+
+    def scroll_to(self, offset: int):
+        offset = max(0, min(offset, len(self.records) - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def render(self):
+        self.offset = max(0, min(self.offset, len(self.records) - self.visible_rows))
+        window = self.records[self.offset:self.offset + self.visible_rows + self.overscan]
+        rows = [self.format_row(record) for record in window] if self.format_row else []
+        tree = self.tree
+        # Пул елементів дерева лише росте або зменшується до розміру вікна; наявні елементи перезаписуються
+        while len(self._items) < len(rows):
+            self._items.append(tree.insert("", "end"))
+            self._shown.append(None)
+        if len(self._items) > len(rows):
+            tree.delete(*self._items[len(rows):])
+            del self._items[len(rows):]
+            del self._shown[len(rows):]
+        selected = ()
+        for i, row in enumerate(rows):
+            if row != self._shown[i]:
+                _, values, tags = row
+                tree.item(self._items[i], values=values, tags=tags)
+                self._shown[i] = row
+            if row[0] == self._selected_key:
+                selected = (self._items[i],)
+        if tuple(tree.selection()) != selected:
+            tree.selection_set(selected)
+        tree.yview_moveto(0)
+        if self.scrollbar is not None:
+            total = len(self.records)
+            if total:
+                self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible_rows) / total))
+            else:
+                self.scrollbar.set(0.0, 1.0)
+
+    def _on_wheel(self, event):
+        # Windows: кратне 120; macOS: невеликі цілі значення
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll(-delta * WHEEL_ROWS)
+
+    def _on_configure(self, event):
+        # Кількість видимих рядків залежить від висоти віджета (рядок заголовка не враховується)
+        rowheight = _row_height(self.tree)
+        visible = max(1, event.height // rowheight - 1)
+        if visible != self.visible_rows:
+            self.visible_rows = visible
+            self.render()
+
+    def _on_select(self, event=None):
+        # Порожнє виділення (рядок прокручено за межі вікна) не скидає вибраний ключ
+        selection = self.tree.selection()
+        if selection and selection[0] in self._items:
+            shown = self._shown[self._items.index(selection[0])]
+            if shown is not None:
+                self._selected_key = shown[0]
+
+    def _move_selection(self, step: int):
+        if not self.records:
+            return 'break'
+        keys = [row[0] for row in self._shown if row is not None]
+        if self._selected_key in keys:
+            index = self.offset + keys.index(self._selected_key) + step
+        else:
+            index = self.offset if step > 0 else self.offset + len(keys) - 1
+        index = max(0, min(index, len(self.records) - 1))
+        self._selected_key = self.format_row(self.records[index])[0]
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible_rows:
+            self.offset = index - self.visible_rows + 1
+        self.render()
+        return 'break'
+
+
+def _row_height(tree):
+    from tkinter import ttk
+    return int(ttk.Style(tree).lookup('Treeview', 'rowheight') or 20)
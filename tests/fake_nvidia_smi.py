@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""Stand-in for ``nvidia-smi`` with the CSV output GPUCollector reads.
+
+GPU 1 reports ``[N/A]`` for total memory and ``[Not Supported]`` for
+utilization, as consumer cards do. The ``--loop-ms`` session prints
+``FAKE_SMI_LOOPS`` rounds and then exits, like a crashed driver.
+"""
+import os
+import sys
+import time
+
+STATIC = ["0, Fake GPU 0, 8192", "1, Fake GPU 1, [N/A]"]
+DYNAMIC = ["0, 42, 2048, 65", "1, [Not Supported], 512, [N/A]"]
+
+args = sys.argv[1:]
+if any(arg.startswith('--query-gpu=index,name') for arg in args):
+    print("\n".join(STATIC))
+    sys.exit(0)
+loop = next((int(arg.split('=', 1)[1]) for arg in args if arg.startswith('--loop-ms=')), 0)
+for _ in range(int(os.environ.get('FAKE_SMI_LOOPS', '1'))):
+    print("\n".join(DYNAMIC), flush=True)
+    time.sleep(loop / 1000)
@@ -0,0 +1,42 @@
+from alerts import AlertEngine, AlertRule
+
+
+def make_engine():
+    rule = AlertRule('cpu', lambda s: {'': s['value']}, 90, min_duration=0, cooldown=300)
+    return AlertEngine([rule])
+
+
+def feed(engine, timeline):
+    # timeline: [(від, до, значення)] із кроком 10 с; повертає стан панелі активних тривог на кожному кроці
+    active = []
+    for start, end, value in timeline:
+        for now in range(start, end, 10):
+            engine.evaluate({'monotonic': float(now), 'value': value})
+            active.append((now, engine.state()[1]))
+    return active
+
+
+def test_incident_inside_cooldown_is_notified_once_cooldown_passes():
+    engine = make_engine()
+    active = dict(feed(engine, [(0, 10, 95.0), (10, 60, 50.0), (60, 3600, 95.0)]))
+    assert [alert.state for alert in engine.state()[2]] == ['firing', 'resolved', 'firing']
+    # Повторне сповіщення — щойно минув cooldown після першого (t=300), а не після відновлення
+    assert [alert.state for alert in active[290]] == ['suppressed']
+    assert [alert.state for alert in active[300]] == ['firing']
+    assert all(active[now] for now in active if now >= 60)
+
+
+def test_incident_inside_cooldown_is_shown_as_active_immediately():
+    engine = make_engine()
+    active = dict(feed(engine, [(0, 10, 95.0), (10, 60, 50.0), (60, 100, 95.0)]))
+    assert [alert.state for alert in engine.state()[2]] == ['firing', 'resolved']
+    assert [alert.state for alert in active[60]] == ['suppressed']
+
+
+def test_suppressed_incident_that_recovers_is_not_logged():
+    engine = make_engine()
+    notified = []
+    engine.add_listener(notified.append)
+    feed(engine, [(0, 10, 95.0), (10, 60, 50.0), (60, 100, 95.0), (100, 200, 50.0)])
+    assert [alert.state for alert in notified] == ['firing', 'resolved']
+    assert engine.state()[1] == ()
@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+
+from diagnostics import PROCESS_WIDE_PROFILER, Diagnostics
+
+
+def busy_stage():
+    return sum(i * i for i in range(2000))
+
+
+def unfinished_stage_part():
+    return sum(range(2000))
+
+
+@pytest.mark.skipif(PROCESS_WIDE_PROFILER, reason="per-thread profiles are used before Python 3.12")
+def test_stop_profile_merges_only_finished_stages():
+    diagnostics = Diagnostics()
+    entered, release = threading.Event(), threading.Event()
+
+    def worker():
+        with diagnostics.measure('slow'):
+            unfinished_stage_part()
+            entered.set()
+            release.wait(10)
+
+    assert diagnostics.start_profile()
+    with diagnostics.measure('fast'):
+        busy_stage()
+    thread = threading.Thread(target=worker)
+    thread.start()
+    entered.wait(10)
+    # Етап іншого потоку ще виконується: його профіль не потрапляє до звіту
+    report = diagnostics.stop_profile()
+    assert 'busy_stage' in report
+    assert 'unfinished_stage_part' not in report
+
+    assert diagnostics.start_profile()
+    release.set()
+    thread.join(10)
+    assert diagnostics.stop_profile() == "No measured stages ran during the capture"
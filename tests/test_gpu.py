@@ -0,0 +1,75 @@
+import math
+import os
+import shutil
+import sys
+import time
+
+import pytest
+
+from gpu import GPUCollector
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="the fake nvidia-smi is a shebang script")
+
+
+@pytest.fixture
+def fake_smi(tmp_path, monkeypatch):
+    # Копія фейкового nvidia-smi з shebang на поточний інтерпретатор
+    source = os.path.join(os.path.dirname(__file__), 'fake_nvidia_smi.py')
+    with open(source) as f:
+        body = f.read().split('\n', 1)[1]
+    path = tmp_path / 'nvidia-smi'
+    path.write_text(f"#!{sys.executable}\n{body}")
+    path.chmod(0o755)
+    monkeypatch.setenv('FAKE_SMI_LOOPS', '1')
+    return str(path)
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_static_query_parses_names_and_missing_memory(fake_smi):
+    collector = GPUCollector(fake_smi, interval=0.05)
+    assert collector.available
+    assert [gpu.name for gpu in collector.gpus] == ['Fake GPU 0', 'Fake GPU 1']
+    assert collector.gpus[0].memory_total == 8192
+    assert math.isnan(collector.gpus[1].memory_total)
+
+
+def test_session_values_and_unavailable_fields(fake_smi, monkeypatch):
+    monkeypatch.setenv('FAKE_SMI_LOOPS', '1000')
+    collector = GPUCollector(fake_smi, interval=0.05)
+    collector.start()
+    try:
+        assert wait_for(lambda: not math.isnan(collector.sample()[1].memory_used))
+        first, second = collector.sample()
+        assert (first.usage, first.memory_used, first.temperature) == (42, 2048, 65)
+        assert first.memory_percent == 25
+        assert (first.temperature_min, first.temperature_max) == (65, 65)
+        assert math.isnan(second.usage) and math.isnan(second.temperature)
+        assert second.memory_used == 512 and math.isnan(second.memory_percent)
+    finally:
+        collector.stop()
+
+
+def test_session_death_clears_values_and_failed_restart_keeps_gpu_available(fake_smi):
+    collector = GPUCollector(fake_smi, interval=0.05)
+    collector.start()
+    collector._process.wait(10)
+    collector._reader.join(10)
+    assert not collector._reader.is_alive()
+    # Після завершення nvidia-smi значення не «застигають» на останньому рядку
+    assert all(math.isnan(gpu.usage) and math.isnan(gpu.memory_used) for gpu in collector.sample())
+
+    # Перезапуск неможливий: start() не кидає виняток і не вимикає GPU назавжди
+    os.remove(fake_smi)
+    collector._last_start = 0.0
+    samples = collector.sample()
+    assert collector.available
+    assert collector._process is None
+    assert all(math.isnan(gpu.usage) for gpu in samples)
@@ -0,0 +1,31 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET = 5.0  # секунд; із запасом для повільних CI-машин (локально ~0.15 с)
+GUI_MODULES = ('tkinter', 'matplotlib')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{'seconds': time.perf_counter() - start, 'loaded': [m for m in {gui} if m in sys.modules]}}))
+"""
+
+
+@pytest.mark.parametrize('module', ['main', 'monitor', 'utilities'])
+def test_import_does_not_load_gui_dependencies(module):
+    # Новий інтерпретатор: модулі, вже імпортовані pytest чи іншими тестами, не впливають на результат
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module, gui=GUI_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    assert probe['loaded'] == []
+    assert probe['seconds'] < IMPORT_BUDGET
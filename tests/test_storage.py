@@ -0,0 +1,26 @@
+import math
+
+import numpy as np
+
+from storage import MultiResolutionStore
+
+
+def test_rollup_weights_each_column_by_its_own_count_across_restarts(tmp_path):
+    # Стовпець 'gpu' має значення лише в кожному четвертому зразку
+    start = 1_700_000_040.0  # початок хвилинного інтервалу; нульова мітка означає незаписаний рядок
+    rows = [(start + t, [float(t % 7), float(t) if t % 4 == 0 else math.nan]) for t in range(50)]
+    for session in (rows[:13], rows[13:31], rows[31:]):
+        store = MultiResolutionStore(str(tmp_path), ['cpu', 'gpu'], rollups=[(60, 100, 10)])
+        for timestamp, values in session:
+            store.append(timestamp, values)
+        store.close()
+
+    store = MultiResolutionStore(str(tmp_path), ['cpu', 'gpu'], rollups=[(60, 100, 10)])
+    _, raw = store.raw.query(start, start + 100)
+    _, _, counts = store.tiers[0].query(start, start + 100)
+    assert counts.tolist() == [[50, 13]]
+    cpu, gpu = store.average(start, start + 1000, points=2)
+    expected = np.nanmean(raw, axis=0)
+    assert math.isclose(cpu, expected[0], rel_tol=1e-6)
+    assert math.isclose(gpu, expected[1], rel_tol=1e-6)
+    store.close()
@@ -1,11 +1,15 @@
 import logging
+import numpy as np
 import psutil
-import tkinter as tk
-from tkinter import ttk, messagebox
 import time
 import datetime
-from config import AUTO_EXPORT_INTERVAL
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING
+from config import EXPORT_FORMAT, PROCESS_SPARKLINE_WIDTH
+
+# Tk і matplotlib імпортуються лише у функціях GUI, щоб headless-режим їх не завантажував
+if TYPE_CHECKING:
+    from tkinter import ttk
+    from tables import VirtualTable
 
 # Логування
 def setup_logging():
@@ -18,6 +22,7 @@ def setup_logging():
 
 # Побудова графіків
 def create_plot(title: str, xlabel: str, ylabel: str, ylim: tuple, xlim: tuple):
+    import matplotlib.pyplot as plt
     fig, ax = plt.subplots(figsize=(8, 3))
     ax.set_title(title)
     ax.set_xlabel(xlabel)
@@ -29,198 +34,204 @@ def create_plot(title: str, xlabel: str, ylabel: str, ylim: tuple, xlim: tuple):
 
 # Управління процесами
 _process_data = {}
+_process_previous = {}
 _net_process_data = {}
+_net_process_previous = {}
 _sort_column = "Memory_MB"
-_net_sort_column = "Download_MB"
+_net_sort_column = "Download_KBps"
 _sort_reverse = True
 _net_sort_reverse = True
-_process_limit_warning_shown = False
-
-def update_process_list(tree: ttk.Treeview, column: str = None):
-    global _sort_column, _sort_reverse, _process_data, _process_limit_warning_shown
+_process_index = None
+_process_history = None
+SPARKLINE_CHARS = "▁▂▃▄▅▆▇█"
+
+def process_index():
+    # Індекс створюється при першому зверненні: processes імпортує utilities
+    global _process_index
+    if _process_index is None:
+        from processes import ProcessIndex
+        _process_index = ProcessIndex()
+    return _process_index
+
+def update_process_list(table: 'VirtualTable', column: str = None, snapshot=None, history=None):
+    # Лише рендер готового знімка від ProcessSampler; без snapshot — повторний рендер останнього
+    global _sort_column, _sort_reverse, _process_data, _process_previous, _process_history
+    if history is not None:
+        _process_history = history
     if column:
         if _sort_column == column:
             _sort_reverse = not _sort_reverse
         else:
             _sort_column = column
             _sort_reverse = False
-
-    selected = tree.selection()
-    selected_pid = None
-    if selected:
-        selected_pid = tree.item(selected[0])['values'][0]
-
-    new_process_data = {}
-    try:
-        process_list = list(psutil.process_iter(['pid', 'name', 'memory_percent', 'memory_info', 'cpu_percent']))
-        if len(process_list) > 3000 and not _process_limit_warning_shown:
-            _process_limit_warning_shown = True
-            messagebox.showwarning("Warning", "Too many processes detected. Displaying top 3000 processes to optimize performance.")
-
-        for proc in process_list[:3000]:
-            try:
-                pid = proc.info['pid']
-                new_process_data[pid] = {
-                    'name': proc.info['name'],
-                    'memory_mb': proc.info['memory_info'].rss / (1024 * 1024),
-                    'memory_percent': proc.info['memory_percent'],
-                    'cpu_percent': proc.info['cpu_percent']
-                }
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-    except Exception as e:
-        setup_logging().error(f"Error in update_process_list: {e}")
+    if snapshot is not None and snapshot is not _process_data:
+        _process_previous, _process_data = _process_data, snapshot
+        process_index().update(snapshot)
+    elif not column:
         return
-
-    current_pids = set(_process_data.keys())
-    new_pids = set(new_process_data.keys())
-
-    for pid in current_pids - new_pids:
-        for item in tree.get_children():
-            if int(tree.item(item)['values'][0]) == pid:
-                tree.delete(item)
-                break
-
-    sorted_processes = sorted(
-        new_process_data.items(),
-        key=lambda x: _get_sort_key(x[1], x[0]),
-        reverse=_sort_reverse
-    )
-
-    tree.delete(*tree.get_children())
-    for pid, data in sorted_processes:
-        values = (
-            pid,
-            data['name'],
-            f"{data['memory_mb']:.2f}",
-            f"{data['memory_percent']:.2f}",
-            f"{data['cpu_percent']:.2f}"
+    _render_process_list(table)
+
+def filter_process_list(table: 'VirtualTable', text: str = "", regex: bool = False, user: str = None, grouping: str = None):
+    # Некоректний регулярний вираз пробрасується (re.error), щоб GUI показав помилку; set_query
+    # перевіряє вираз до будь-яких змін, тож індекс і таблиця лишаються з попередніми фільтром і групуванням
+    index = process_index()
+    index.set_query(text, regex, user)
+    index.set_grouping(grouping)
+    _render_process_list(table)
+
+def _render_process_list(table: 'VirtualTable'):
+    index = process_index()
+    previous = _process_previous
+    if index.grouping:
+        rows = sorted(index.group_rows(), key=_get_group_sort_key, reverse=_sort_reverse)
+        format_row = _format_group_row
+    else:
+        # Без фільтра індекс не потрібен — сортується весь знімок
+        filtered = index.text or index.user is not None
+        rows = sorted(
+            index.rows() if filtered else _process_data.values(),
+            key=_get_sort_key,
+            reverse=_sort_reverse
         )
-        item = tree.insert("", "end", values=values)
-        if data['cpu_percent'] > 90 or data['memory_percent'] > 90:
-            tree.item(item, tags=('high_load',))
-        if pid not in _process_data:
-            tree.item(item, tags=('new',))
-        elif _process_data.get(pid) != data:
-            tree.item(item, tags=('updated',))
 
+        def format_row(data):
+            # Міні-графік будується лише для видимих рядків
+            rss = _process_history.series(data.pid)[0] if _process_history is not None else ()
+            values = (
+                data.pid,
+                data.name,
+                f"{data.memory_mb:.2f}",
+                f"{data.memory_percent:.2f}",
+                f"{data.cpu_percent:.2f}",
+                f"{data.rss_slope:+.2f}",
+                _sparkline(rss)
+            )
+            if data.pid not in previous:
+                tags = ('new',)
+            elif previous[data.pid] != data:
+                tags = ('updated',)
+            elif data.cpu_percent > 90 or data.memory_percent > 90:
+                tags = ('high_load',)
+            else:
+                tags = ()
+            if data.leak_suspect:
+                tags += ('leak',)
+            return data.pid, values, tags
+
+    tree = table.tree
     tree.tag_configure('new', background='#90EE90')
     tree.tag_configure('updated', background='#FFFFE0')
     tree.tag_configure('high_load', background='#FF6347')
-
-    if selected_pid:
-        for item in tree.get_children():
-            if int(tree.item(item)['values'][0]) == selected_pid:
-                tree.selection_set(item)
-                break
-
-    _process_data = new_process_data
-
-def update_net_process_list(tree: ttk.Treeview, column: str = None):
-    global _net_sort_column, _net_sort_reverse, _net_process_data
+    # Налаштований останнім тег має пріоритет над 'new'/'updated'
+    tree.tag_configure('leak', background='#FFA500')
+    # Таблиця тримає весь відсортований список, а форматує й показує лише видимі рядки
+    table.set_rows(rows, format_row)
+
+def _format_group_row(group):
+    # У стовпці PID групи показується кількість процесів
+    values = (
+        group.count,
+        group.name,
+        f"{group.memory_mb:.2f}",
+        f"{group.memory_percent:.2f}",
+        f"{group.cpu_percent:.2f}",
+        f"{group.rss_slope:+.2f}",
+        ""
+    )
+    return ('group', group.key), values, ()
+
+def _sparkline(values, width: int = PROCESS_SPARKLINE_WIDTH):
+    # Історія стискається до width символів середніми значеннями відрізків
+    if len(values) < 2:
+        return ""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) > width:
+        bounds = np.linspace(0, len(values), width + 1).astype(int)
+        values = np.add.reduceat(values, bounds[:-1]) / np.diff(bounds)
+    low, high = values.min(), values.max()
+    if high - low < 0.01:
+        return SPARKLINE_CHARS[0] * len(values)
+    levels = np.rint((values - low) * ((len(SPARKLINE_CHARS) - 1) / (high - low))).astype(int)
+    return "".join(SPARKLINE_CHARS[level] for level in levels.tolist())
+
+def update_net_process_list(table: 'VirtualTable', column: str = None, snapshot=None):
+    global _net_sort_column, _net_sort_reverse, _net_process_data, _net_process_previous
     if column:
         if _net_sort_column == column:
             _net_sort_reverse = not _net_sort_reverse
         else:
             _net_sort_column = column
             _net_sort_reverse = False
-
-    selected = tree.selection()
-    selected_pid = None
-    if selected:
-        selected_pid = tree.item(selected[0])['values'][0]
-
-    new_net_process_data = {}
-    try:
-        for proc in list(psutil.process_iter(['pid', 'name']))[:50]:
-            try:
-                pid = proc.info['pid']
-                net_connections = proc.net_connections()
-                if net_connections:
-                    download_mb = sum(conn.bytes_recv for conn in net_connections if hasattr(conn, 'bytes_recv')) / (1024 * 1024)
-                    upload_mb = sum(conn.bytes_sent for conn in net_connections if hasattr(conn, 'bytes_sent')) / (1024 * 1024)
-                    new_net_process_data[pid] = {
-                        'name': proc.info['name'],
-                        'download_mb': download_mb,
-                        'upload_mb': upload_mb
-                    }
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-    except Exception as e:
-        setup_logging().error(f"Error in update_net_process_list: {e}")
+    if snapshot is not None and snapshot is not _net_process_data:
+        _net_process_previous, _net_process_data = _net_process_data, snapshot
+    elif not column:
         return
-
-    current_pids = set(_net_process_data.keys())
-    new_pids = set(new_net_process_data.keys())
-
-    for pid in current_pids - new_pids:
-        for item in tree.get_children():
-            if int(tree.item(item)['values'][0]) == pid:
-                tree.delete(item)
-                break
+    previous = _net_process_previous
 
     sorted_net_processes = sorted(
-        new_net_process_data.items(),
-        key=lambda x: _get_net_sort_key(x[1], x[0]),
+        _net_process_data.values(),
+        key=_get_net_sort_key,
         reverse=_net_sort_reverse
     )
 
-    tree.delete(*tree.get_children())
-    for pid, data in sorted_net_processes:
+    def format_row(data):
         values = (
-            pid,
-            data['name'],
-            f"{data['download_mb']:.2f}",
-            f"{data['upload_mb']:.2f}"
+            data.pid,
+            data.name,
+            f"{data.download_kbps:.2f}",
+            f"{data.upload_kbps:.2f}"
         )
-        item = tree.insert("", "end", values=values)
-        if pid not in _net_process_data:
-            tree.item(item, tags=('new',))
-        elif _net_process_data.get(pid) != data:
-            tree.item(item, tags=('updated',))
+        if data.pid not in previous:
+            tags = ('new',)
+        elif previous[data.pid] != data:
+            tags = ('updated',)
+        else:
+            tags = ()
+        return data.pid, values, tags
 
+    tree = table.tree
     tree.tag_configure('new', background='#90EE90')
     tree.tag_configure('updated', background='#FFFFE0')
+    table.set_rows(sorted_net_processes, format_row)
 
-    if selected_pid:
-        for item in tree.get_children():
-            if int(tree.item(item)['values'][0]) == selected_pid:
-                tree.selection_set(item)
-                break
-
-    _net_process_data = new_net_process_data
-
-def _get_sort_key(data, pid):
+def _get_sort_key(data):
     if _sort_column == "PID":
-        return pid
+        return data.pid
     elif _sort_column == "Name":
-        return data['name'].lower()
+        return data.name.lower()
     elif _sort_column == "Memory_MB":
-        return data['memory_mb']
+        return data.memory_mb
     elif _sort_column == "Memory_Percent":
-        return data['memory_percent']
+        return data.memory_percent
     elif _sort_column == "CPU_Percent":
-        return data['cpu_percent']
+        return data.cpu_percent
+    elif _sort_column in ("RSS_Slope", "RSS_History"):
+        return data.rss_slope
     return 0
 
-def _get_net_sort_key(data, pid):
+def _get_group_sort_key(group):
+    if _sort_column == "PID":
+        return group.count
+    return _get_sort_key(group)
+
+def _get_net_sort_key(data):
     if _net_sort_column == "PID":
-        return pid
+        return data.pid
     elif _net_sort_column == "Name":
-        return data['name'].lower()
-    elif _net_sort_column == "Download_MB":
-        return data['download_mb']
-    elif _net_sort_column == "Upload_MB":
-        return data['upload_mb']
+        return data.name.lower()
+    elif _net_sort_column == "Download_KBps":
+        return data.download_kbps
+    elif _net_sort_column == "Upload_KBps":
+        return data.upload_kbps
     return 0
 
 def kill_process(gui):
-    selected = gui.process_tree.selection()
-    if not selected:
+    from tkinter import messagebox
+    pid = gui.process_table.selected_key()
+    if pid is None or isinstance(pid, tuple):
         messagebox.showwarning("Warning", "Please select a process to terminate")
         return
 
-    pid = int(gui.process_tree.item(selected[0])['values'][0])
     if messagebox.askyesno("Confirm", f"Are you sure you want to terminate process PID {pid}?"):
         try:
             process = psutil.Process(pid)
@@ -229,106 +240,77 @@ def kill_process(gui):
             if process.is_running():
                 process.kill()
             messagebox.showinfo("Success", f"Process {pid} terminated")
-            update_process_list(gui.process_tree)
+            gui.process_sampler.request_refresh()
         except psutil.NoSuchProcess:
             messagebox.showerror("Error", "Process no longer exists")
-            update_process_list(gui.process_tree)
+            gui.process_sampler.request_refresh()
         except psutil.AccessDenied:
             messagebox.showerror("Error", "Access denied to terminate this process")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to terminate process: {str(e)}")
-            update_process_list(gui.process_tree)
-
-# Експорт даних
-def export_data(gui, time_range_minutes=None):
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = f"system_report_{timestamp}.txt"
-
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write("System Monitoring Report\n")
-        f.write(f"Date: {timestamp}\n")
-        if time_range_minutes:
-            f.write(f"Time Range: Last {time_range_minutes} minutes\n")
-        f.write("\n")
-
-        # Системна інформація
-        f.write(f"CPU: {gui.cpu_info_label['text'].split(': ')[1]}\n")
-        f.write(f"RAM: {gui.ram_info_label['text'].split(': ')[1]}\n")
-        f.write(f"GPU: {gui.gpu_info_label['text'].split(': ')[1]}\n")
-        f.write(f"OS: {gui.os_info_label['text'].split(': ')[1]}\n")
-        f.write(f"Uptime: {gui.uptime_label['text'].split(': ')[1]}\n")
-        f.write(f"Last Boot: {gui.last_boot_label['text'].split(': ')[1]}\n")
+            gui.process_sampler.request_refresh()
 
-        # CPU
-        f.write(f"\nCPU Usage: {psutil.cpu_percent()}%\n")
-        if time_range_minutes:
-            history_points = min(len(gui.monitor.get_cpu_history()[0]), int(time_range_minutes * 60 / 3))
-            avg_cpu = [sum(core[i] for core in gui.monitor.get_cpu_history()) / len(gui.monitor.get_cpu_history())
-                       for i in range(-history_points, 0)] if gui.monitor.get_cpu_history() else []
-            f.write(f"Average CPU Usage (last {time_range_minutes} min): {sum(avg_cpu)/len(avg_cpu):.1f}%\n" if avg_cpu else "N/A\n")
+# Список драйверів (WMI/lsmod) повільний, тому читається у фоновому потоці
+_drivers_pool = None
 
-        # RAM
-        ram = psutil.virtual_memory()
-        f.write(f"RAM Usage: {ram.percent}% ({ram.used/(1024**3):.2f}/{ram.total/(1024**3):.2f} GB, Free: {ram.free/(1024**3):.2f} GB)\n")
-        if time_range_minutes:
-            history_points = min(len(gui.monitor.get_ram_history()), int(time_range_minutes * 60 / 3))
-            avg_ram = gui.monitor.get_ram_history()[-history_points:] if gui.monitor.get_ram_history() else []
-            f.write(f"Average RAM Usage (last {time_range_minutes} min): {sum(avg_ram)/len(avg_ram):.1f}%\n" if avg_ram else "N/A\n")
-
-        # Disk
-        f.write(f"Disk Usage: {gui.disk_label['text']}\n")
-        f.write(f"Disk Health: {gui.smart_label['text']}\n")
-        if time_range_minutes:
-            history_points = min(len(gui.monitor.get_disk_io_history()[0]), int(time_range_minutes * 60 / 3))
-            avg_read = gui.monitor.get_disk_io_history()[0][-history_points:] if gui.monitor.get_disk_io_history()[0] else []
-            avg_write = gui.monitor.get_disk_io_history()[1][-history_points:] if gui.monitor.get_disk_io_history()[1] else []
-            f.write(f"Average Disk Read (last {time_range_minutes} min): {sum(avg_read)/len(avg_read):.2f} MB/s\n" if avg_read else "N/A\n")
-            f.write(f"Average Disk Write (last {time_range_minutes} min): {sum(avg_write)/len(avg_write):.2f} MB/s\n" if avg_write else "N/A\n")
-
-        # GPU
+def list_drivers():
+    import platform
+    drivers = []
+    if platform.system() == "Windows":
         try:
-            import GPUtil
-            GPU_AVAILABLE = True
-        except ImportError:
-            GPU_AVAILABLE = False
-        if GPU_AVAILABLE:
-            f.write(f"GPU Usage: {gui.gpu_usage_label['text']}\n")
-            f.write(f"GPU Memory: {gui.gpu_memory_label['text']}\n")
-            f.write(f"GPU Temp: {gui.gpu_temp_label['text']}\n")
-            if time_range_minutes:
-                history_points = min(len(gui.monitor.get_gpu_usage_history()), int(time_range_minutes * 60 / 3))
-                avg_gpu = gui.monitor.get_gpu_usage_history()[-history_points:] if gui.monitor.get_gpu_usage_history() else []
-                f.write(f"Average GPU Usage (last {time_range_minutes} min): {sum(avg_gpu)/len(avg_gpu):.1f}%\n" if avg_gpu else "N/A\n")
-
-        # Network
-        f.write(f"Network: {gui.network_label['text']}\n")
-        if time_range_minutes:
-            history_points = min(len(gui.monitor.get_network_history()[0]), int(time_range_minutes * 60 / 3))
-            avg_download = gui.monitor.get_network_history()[0][-history_points:] if gui.monitor.get_network_history()[0] else []
-            avg_upload = gui.monitor.get_network_history()[1][-history_points:] if gui.monitor.get_network_history()[1] else []
-            f.write(f"Average Download (last {time_range_minutes} min): {sum(avg_download)/len(avg_download):.2f} Mbps\n" if avg_download else "N/A\n")
-            f.write(f"Average Upload (last {time_range_minutes} min): {sum(avg_upload)/len(avg_upload):.2f} Mbps\n" if avg_upload else "N/A\n")
+            # wmi є лише на Windows і потрібен тільки для списку драйверів
+            import wmi
+            c = wmi.WMI()
+            for driver in c.Win32_PnPSignedDriver():
+                drivers.append((driver.DeviceName or "Unknown", driver.DriverVersion or "N/A", driver.Status or "N/A"))
+        except Exception as e:
+            drivers.append(("Error retrieving drivers", str(e), "N/A"))
+    elif platform.system() == "Linux":
+        try:
+            import subprocess
+            result = subprocess.run(['lsmod'], capture_output=True, text=True)
+            for module in result.stdout.splitlines()[1:]:
+                drivers.append((module.split()[0], "N/A", "Loaded"))
+        except Exception as e:
+            drivers.append(("Error retrieving modules", str(e), "N/A"))
+    else:
+        drivers.append(("Driver info not fully supported", "N/A", "N/A"))
+    return drivers
+
+def load_drivers():
+    from concurrent.futures import ThreadPoolExecutor
+    global _drivers_pool
+    if _drivers_pool is None:
+        _drivers_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='drivers')
+    return _drivers_pool.submit(list_drivers)
 
-        # Процеси
-        f.write("\nRunning Processes:\n")
-        f.write("-" * 70 + "\n")
-        f.write(f"{'PID':<8} {'Memory (MB)':<12} {'Memory (%)':<12} {'CPU (%)':<12} {'Process Name':<30}\n")
-        for item in gui.process_tree.get_children()[:10]:
-            values = gui.process_tree.item(item, "values")
-            f.write(f"{values[0]:<8} {values[2]:<12} {values[3]:<12} {values[4]:<12} {values[1]:<30}\n")
-        f.write("\nNetwork-Using Processes:\n")
-        f.write("-" * 70 + "\n")
-        f.write(f"{'PID':<8} {'Download (MB)':<15} {'Upload (MB)':<15} {'Process Name':<30}\n")
-        for item in gui.net_process_tree.get_children()[:10]:
-            values = gui.net_process_tree.item(item, "values")
-            f.write(f"{values[0]:<8} {values[2]:<15} {values[3]:<15} {values[1]:<30}\n")
-        f.write("\nReboot History:\n")
-        f.write("-" * 70 + "\n")
-        for reboot_time in gui.reboot_history:
-            f.write(f"{reboot_time}\n")
-        f.write("\nAlert Log:\n")
-        f.write("-" * 70 + "\n")
-        for alert in gui.alert_log[-10:]:
-            f.write(f"{alert}\n")
+# Експорт даних
+_export_pool = None
+
+def export_data(gui, time_range_minutes=None, fmt=EXPORT_FORMAT, columns=None):
+    """Write a report (and, for a time range, the raw history) in a background worker.
+
+    Only references to the current snapshots are taken on the calling (Tk)
+    thread; returns a ``Future`` resolving to the list of written files.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    global _export_pool
+    if _export_pool is None:
+        _export_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export')
+    return _export_pool.submit(
+        _write_export, gui.monitor, gui.latest_snapshot, gui.process_sampler.snapshot(), gui.process_sampler.net_snapshot(),
+        gui.alerts.state()[2], list(gui.reboot_history), time_range_minutes, fmt, columns
+    )
 
-    return filename
\ No newline at end of file
+def _write_export(monitor, snapshot, processes, net_processes, alerts, reboot_history, time_range_minutes, fmt, columns):
+    from export import write_history, write_report
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    filename = f"system_report_{timestamp}.txt"
+    write_report(filename, monitor, snapshot, processes, net_processes, alerts, reboot_history, time_range_minutes)
+    filenames = [filename]
+    if time_range_minutes:
+        end = time.time()
+        history_filename = f"system_history_{timestamp}.{fmt}"
+        write_history(history_filename, fmt, monitor, end - time_range_minutes * 60, end, columns)
+        filenames.append(history_filename)
+    return filenames